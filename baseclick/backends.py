@@ -0,0 +1,303 @@
+import os
+import struct
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from pynput.mouse import Button
+
+BackendName = str  # "pynput", "uinput" or "recording"
+
+
+class InjectionBackend:
+    name: BackendName = ""
+    # Seconds per injection, measured by calibrate()
+    click_cost: float = 0.0
+    # False if move_to/click_at can't place the cursor
+    can_move: bool = True
+
+    def calibrate(self, samples: int = 64) -> float:
+        # Time a side-effect-free round trip through the same path clicks
+        # take; clickers seed their rate controller with the median.
+        timings = []
+        for _ in range(samples):
+            t = time.perf_counter()
+            self.probe()
+            timings.append(time.perf_counter() - t)
+        timings.sort()
+        self.click_cost = timings[len(timings) // 2]
+        return self.click_cost
+
+    def probe(self) -> None:
+        pass
+
+    def click(self, button: Button) -> None:
+        raise NotImplementedError
+
+    def press(self, button: Button) -> None:
+        raise NotImplementedError
+
+    def release(self, button: Button) -> None:
+        raise NotImplementedError
+
+    def move_to(self, x: int, y: int) -> None:
+        raise NotImplementedError
+
+    def click_at(self, x: int, y: int, button: Button) -> None:
+        # Backends override this to send the move and the click as one batch
+        self.move_to(x, y)
+        self.click(button)
+
+    def close(self) -> None:
+        pass
+
+
+class PynputBackend(InjectionBackend):
+    name = "pynput"
+
+    def __init__(self) -> None:
+        from pynput.mouse import Controller
+        self._controller = Controller()
+        self._batch = _Win32ClickAt() if sys.platform == "win32" else None
+
+    def click(self, button: Button) -> None:
+        self._controller.click(button)
+
+    def probe(self) -> None:
+        # Cursor query: one round trip to the display server, no input
+        self._controller.position
+
+    def press(self, button: Button) -> None:
+        self._controller.press(button)
+
+    def release(self, button: Button) -> None:
+        self._controller.release(button)
+
+    def move_to(self, x: int, y: int) -> None:
+        self._controller.position = (x, y)
+
+    def click_at(self, x: int, y: int, button: Button) -> None:
+        if self._batch is not None:
+            self._batch.click_at(x, y, button.name)
+        else:
+            self._controller.position = (x, y)
+            self._controller.click(button)
+
+
+# SendInput flags (winuser.h): button -> (down, up, mouseData)
+_WIN32_BUTTONS: Dict[str, Tuple[int, int, int]] = {
+    "left": (0x0002, 0x0004, 0),
+    "right": (0x0008, 0x0010, 0),
+    "middle": (0x0020, 0x0040, 0),
+    "x1": (0x0080, 0x0100, 0x0001),
+    "x2": (0x0080, 0x0100, 0x0002),
+}
+MOUSEEVENTF_MOVE = 0x0001
+MOUSEEVENTF_VIRTUALDESK = 0x4000
+MOUSEEVENTF_ABSOLUTE = 0x8000
+SM_XVIRTUALSCREEN = 76
+SM_YVIRTUALSCREEN = 77
+SM_CXVIRTUALSCREEN = 78
+SM_CYVIRTUALSCREEN = 79
+
+
+class _Win32ClickAt:
+    # Absolute move, press and release in a single SendInput call, reusing
+    # pynput's INPUT structures and one preallocated array of three.
+    def __init__(self) -> None:
+        import ctypes
+        from pynput._util.win32 import INPUT, SendInput
+        self._ctypes = ctypes
+        self._send = SendInput
+        self._metrics = ctypes.windll.user32.GetSystemMetrics
+        self._items = (INPUT * 3)()
+        for item in self._items:
+            item.type = INPUT.MOUSE
+        self._size = ctypes.sizeof(INPUT)
+
+    def click_at(self, x: int, y: int, button: str) -> None:
+        metrics = self._metrics
+        # Virtual desktop origin and size; read per click so monitor changes apply
+        vx, vy = metrics(SM_XVIRTUALSCREEN), metrics(SM_YVIRTUALSCREEN)
+        vw, vh = metrics(SM_CXVIRTUALSCREEN), metrics(SM_CYVIRTUALSCREEN)
+        down, up, data = _WIN32_BUTTONS[button]
+        move, press, release = (item.value.mi for item in self._items)
+        move.dx = ((x - vx) * 65535 + (vw - 1) // 2) // max(1, vw - 1)
+        move.dy = ((y - vy) * 65535 + (vh - 1) // 2) // max(1, vh - 1)
+        move.dwFlags = MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE | MOUSEEVENTF_VIRTUALDESK
+        press.dwFlags, press.mouseData = down, data
+        release.dwFlags, release.mouseData = up, data
+        self._send(3, self._ctypes.byref(self._items), self._size)
+
+
+class RecordingBackend(InjectionBackend):
+    name = "recording"
+
+    def __init__(self) -> None:
+        self.events: List[Tuple[float, Button]] = []
+        # Everything other than click(): (time, "press"/"release"/"move", arg)
+        self.inputs: List[Tuple[float, str, object]] = []
+
+    def click(self, button: Button) -> None:
+        self.events.append((time.perf_counter(), button))
+
+    def press(self, button: Button) -> None:
+        self.inputs.append((time.perf_counter(), "press", button))
+
+    def release(self, button: Button) -> None:
+        self.inputs.append((time.perf_counter(), "release", button))
+
+    def move_to(self, x: int, y: int) -> None:
+        self.inputs.append((time.perf_counter(), "move", (x, y)))
+
+    def click_at(self, x: int, y: int, button: Button) -> None:
+        # One batch: the move and the click share a timestamp
+        now = time.perf_counter()
+        self.inputs.append((now, "move", (x, y)))
+        self.events.append((now, button))
+
+
+# linux/input-event-codes.h
+EV_SYN = 0x00
+EV_KEY = 0x01
+EV_REL = 0x02
+EV_ABS = 0x03
+SYN_REPORT = 0
+REL_X = 0x00
+REL_Y = 0x01
+ABS_X = 0x00
+ABS_Y = 0x01
+BTN_CODES: Dict[str, int] = {
+    "left": 0x110,
+    "right": 0x111,
+    "middle": 0x112,
+    "x1": 0x113,  # BTN_SIDE
+    "x2": 0x114,  # BTN_EXTRA
+}
+
+# struct input_event { struct timeval time; __u16 type; __u16 code; __s32 value; }
+INPUT_EVENT = struct.Struct("llHHi")
+# struct uinput_user_dev { char name[80]; struct input_id id; __u32 ff_effects_max;
+#                          __s32 absmax[64], absmin[64], absfuzz[64], absflat[64]; }
+UINPUT_USER_DEV = struct.Struct("80sHHHHI256i")
+
+# ioctl numbers from linux/uinput.h
+UI_DEV_CREATE = 0x5501
+UI_DEV_DESTROY = 0x5502
+UI_SET_EVBIT = 0x40045564
+UI_SET_KEYBIT = 0x40045565
+UI_SET_RELBIT = 0x40045566
+UI_SET_ABSBIT = 0x40045567
+
+
+def pack_events(*events: Tuple[int, int, int]) -> bytes:
+    return b"".join(INPUT_EVENT.pack(0, 0, t, c, v) for t, c, v in events)
+
+
+class UinputBackend(InjectionBackend):
+    # Each click is press, SYN, release, SYN packed once per button and sent
+    # with a single os.write, instead of two round trips through the X server.
+    # Passing fd skips device creation (e.g. a pipe or temp file in tests).
+    # With screen=(width, height) the device is an absolute pointer instead,
+    # so move_to/click_at work and a move+click is still a single write.
+    name = "uinput"
+
+    def __init__(
+        self, fd: Optional[int] = None, path: str = "/dev/uinput", screen: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        self._owns_fd = fd is None
+        self._screen = screen
+        self.can_move = screen is not None
+        if fd is None:
+            fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+            try:
+                self._create_device(fd, screen)
+            except OSError:
+                os.close(fd)
+                raise
+        self._fd = fd
+        self._packets: Dict[str, bytes] = {
+            name: pack_events(
+                (EV_KEY, code, 1), (EV_SYN, SYN_REPORT, 0),
+                (EV_KEY, code, 0), (EV_SYN, SYN_REPORT, 0),
+            )
+            for name, code in BTN_CODES.items()
+        }
+        self._press: Dict[str, bytes] = {
+            name: pack_events((EV_KEY, code, 1), (EV_SYN, SYN_REPORT, 0)) for name, code in BTN_CODES.items()
+        }
+        self._release: Dict[str, bytes] = {
+            name: pack_events((EV_KEY, code, 0), (EV_SYN, SYN_REPORT, 0)) for name, code in BTN_CODES.items()
+        }
+        self._empty_report = pack_events((EV_SYN, SYN_REPORT, 0))
+
+    @staticmethod
+    def _create_device(fd: int, screen: Optional[Tuple[int, int]] = None) -> None:
+        import fcntl
+        fcntl.ioctl(fd, UI_SET_EVBIT, EV_KEY)
+        for code in BTN_CODES.values():
+            fcntl.ioctl(fd, UI_SET_KEYBIT, code)
+        absmax = [0] * 64
+        if screen is None:
+            # Relative axes make the device register as a mouse
+            fcntl.ioctl(fd, UI_SET_EVBIT, EV_REL)
+            fcntl.ioctl(fd, UI_SET_RELBIT, REL_X)
+            fcntl.ioctl(fd, UI_SET_RELBIT, REL_Y)
+        else:
+            fcntl.ioctl(fd, UI_SET_EVBIT, EV_ABS)
+            fcntl.ioctl(fd, UI_SET_ABSBIT, ABS_X)
+            fcntl.ioctl(fd, UI_SET_ABSBIT, ABS_Y)
+            absmax[ABS_X], absmax[ABS_Y] = screen[0] - 1, screen[1] - 1
+        os.write(fd, UINPUT_USER_DEV.pack(b"BaseClick virtual mouse", 0x03, 0x1, 0x1, 1, 0, *absmax, *([0] * 192)))
+        fcntl.ioctl(fd, UI_DEV_CREATE)
+        # Give udev/the compositor a moment to pick up the new device
+        time.sleep(0.1)
+
+    def click(self, button: Button) -> None:
+        os.write(self._fd, self._packets[button.name])
+
+    def probe(self) -> None:
+        os.write(self._fd, self._empty_report)
+
+    def press(self, button: Button) -> None:
+        os.write(self._fd, self._press[button.name])
+
+    def release(self, button: Button) -> None:
+        os.write(self._fd, self._release[button.name])
+
+    def move_to(self, x: int, y: int) -> None:
+        os.write(self._fd, self._move(x, y) + self._empty_report)
+
+    def click_at(self, x: int, y: int, button: Button) -> None:
+        os.write(self._fd, self._move(x, y) + self._packets[button.name])
+
+    def _move(self, x: int, y: int) -> bytes:
+        # Without screen the device only has relative axes and the cursor
+        # position isn't known from here
+        if self._screen is None:
+            raise NotImplementedError("uinput move_to needs an absolute device (screen=...)")
+        return INPUT_EVENT.pack(0, 0, EV_ABS, ABS_X, x) + INPUT_EVENT.pack(0, 0, EV_ABS, ABS_Y, y)
+
+    def close(self) -> None:
+        if self._fd < 0:
+            return
+        if self._owns_fd:
+            try:
+                import fcntl
+                fcntl.ioctl(self._fd, UI_DEV_DESTROY)
+            except OSError:
+                pass
+            os.close(self._fd)
+        self._fd = -1
+
+
+def create_backend(name: BackendName, screen: Sequence[int] = ()) -> InjectionBackend:
+    # screen (width, height) makes a uinput device an absolute pointer, which
+    # aimed bindings and macros with mouse events need
+    if name == "recording":
+        return RecordingBackend()
+    if name == "uinput":
+        try:
+            return UinputBackend(screen=(int(screen[0]), int(screen[1])) if len(screen) == 2 else None)
+        except (OSError, ImportError):
+            pass  # no /dev/uinput access; fall back to pynput
+    return PynputBackend()
@@ -0,0 +1,297 @@
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+from pynput.mouse import Button
+
+from baseclick.backends import InjectionBackend
+from baseclick.clicker import AutoClicker
+from baseclick.config import AppConfig, Binding
+from baseclick.scheduler import ClickScheduler
+from baseclick.triggers import TriggerCallback, TriggerManager, TriggerTable
+
+
+class Action:
+    # A compiled binding: its clicker plus the activation state machine.
+    # Bounded modes (burst/count/duration) start a run on press; pressing
+    # again while it runs cancels it.
+    __slots__ = ("binding", "clicker", "mode", "toggled", "error")
+
+    def __init__(self, binding: Binding, clicker: AutoClicker) -> None:
+        self.binding = binding
+        self.clicker = clicker
+        self.mode = binding.mode or "hold"
+        self.toggled = False
+        self.error: Optional[ValueError] = None
+        clicker.trigger = binding.trigger
+        self._aim(binding)
+
+    def _aim(self, binding: Binding) -> None:
+        # A position the backend can't reach (e.g. uinput without
+        # screen_size) clicks under the cursor instead; why stays in .error
+        try:
+            self.clicker.set_position(binding.position, binding.points, binding.rect)
+            self.error = None
+        except ValueError as e:
+            self.clicker.set_position("cursor")
+            self.error = e
+
+    def on_trigger(self, pressed: bool) -> None:
+        mode = self.mode
+        if mode == "hold":
+            if pressed:
+                self.clicker.start()
+            else:
+                self.clicker.stop()
+        elif not pressed:
+            return
+        elif mode == "burst":
+            self._run(count=self.binding.count, cps=self.binding.burst_cps)
+        elif mode == "count":
+            self._run(count=self.binding.count)
+        elif mode == "duration":
+            self._run(duration=self.binding.duration)
+        else:
+            self.toggled = not self.toggled
+            if self.toggled:
+                self.clicker.start()
+            else:
+                self.clicker.stop()
+
+    def _run(self, **limits) -> None:
+        if self.clicker.is_active():
+            self.clicker.stop()
+        else:
+            self.clicker.run_bounded(**limits)
+
+    def update(self, binding: Binding) -> None:
+        old, self.binding = self.binding, binding
+        self.clicker.trigger = binding.trigger
+        self.clicker.set_rate(binding.cps or 1)
+        self.clicker.set_jitter(binding.jitter_ratio or 0.0)
+        if (binding.position, binding.points, binding.rect) != (old.position, old.points, old.rect):
+            self._aim(binding)
+        if binding.mode != self.mode:
+            self.mode = binding.mode or "hold"
+            self.toggled = False
+            self.clicker.stop()
+
+    def stop(self) -> None:
+        self.toggled = False
+        self.clicker.stop()
+
+
+class _Fanout:
+    # Several bindings on one token
+    __slots__ = ("actions",)
+
+    def __init__(self, actions: Sequence[Action]) -> None:
+        self.actions = tuple(actions)
+
+    def __call__(self, pressed: bool) -> None:
+        for action in self.actions:
+            action.on_trigger(pressed)
+
+
+class CompiledProfile:
+    # A profile's clickers plus its trigger table, prepared for install()
+    __slots__ = ("name", "actions", "table")
+
+    def __init__(self, name: str, actions: List[Action], table: TriggerTable) -> None:
+        self.name = name
+        self.actions = actions
+        self.table = table
+
+
+def _same_shape(actions: Sequence[Action], bindings: Sequence[Binding]) -> bool:
+    # Same clickers; triggers may differ (a rebind only rebuilds the table)
+    return len(actions) == len(bindings) and all(
+        a.binding.button == b.button for a, b in zip(actions, bindings)
+    )
+
+
+class BindingEngine:
+    # Compiles AppConfig.effective_bindings() into a token -> callback table
+    # that is installed in the TriggerManager in one swap, so each event is a
+    # single dict lookup however many bindings exist. All clickers share one
+    # ClickScheduler, so bindings don't cost a thread each.
+    #
+    # Every profile is compiled up front (clickers and table), so the profile
+    # hotkey only swaps a table reference: no listener or thread restarts and
+    # no config write.
+    def __init__(
+        self,
+        triggers: TriggerManager,
+        scheduler: ClickScheduler,
+        backend: InjectionBackend,
+        distribution: str = "uniform",
+    ) -> None:
+        self._triggers = triggers
+        self._scheduler = scheduler
+        self._backend = backend
+        self._distribution = distribution
+        self._lock = threading.RLock()
+        self.profiles: Dict[str, CompiledProfile] = {}
+        self.order: List[str] = [""]
+        self.active = ""
+        self._hotkey = ""
+        self._policy = "stop"
+        self._feedback = False
+
+    @property
+    def actions(self) -> List[Action]:
+        profile = self.profiles.get(self.active)
+        return profile.actions if profile else []
+
+    @property
+    def errors(self) -> List[Tuple[str, str, ValueError]]:
+        # (profile, trigger, error) for bindings compiled with a fallback
+        return [
+            (name, action.binding.trigger, action.error)
+            for name, profile in self.profiles.items()
+            for action in profile.actions
+            if action.error is not None
+        ]
+
+    @property
+    def table(self) -> TriggerTable:
+        profile = self.profiles.get(self.active)
+        return profile.table if profile else TriggerTable()
+
+    def compile(self, bindings: Sequence[Binding]) -> List[Action]:
+        actions: List[Action] = []
+        for b in bindings:
+            clicker = AutoClicker(
+                getattr(Button, b.button, Button.left),
+                cps=b.cps or 1,
+                jitter_ratio=b.jitter_ratio or 0.0,
+                scheduler=self._scheduler,
+                backend=self._backend,
+                jitter_distribution=self._distribution,
+                feedback=self._feedback,
+            )
+            actions.append(Action(b, clicker))
+        return actions
+
+    def _callbacks(self, actions: Sequence[Action]) -> Dict[str, TriggerCallback]:
+        by_token: Dict[str, List[Action]] = {}
+        for action in actions:
+            by_token.setdefault(action.binding.trigger, []).append(action)
+        table: Dict[str, TriggerCallback] = {
+            token: group[0].on_trigger if len(group) == 1 else _Fanout(group)
+            for token, group in by_token.items()
+        }
+        if self._hotkey:
+            table[self._hotkey] = self.cycle_profile
+        return table
+
+    def apply(self, cfg: AppConfig) -> None:
+        with self._lock:
+            distribution_changed = cfg.jitter_distribution != self._distribution
+            self._distribution = cfg.jitter_distribution
+            hotkey_changed = cfg.profile_hotkey != self._hotkey
+            self._hotkey = cfg.profile_hotkey
+            self._policy = cfg.profile_switch_policy
+            feedback_changed = cfg.rate_feedback != self._feedback
+            self._feedback = cfg.rate_feedback
+            # Profiles updated in place get a new table below
+            installed = self.table
+
+            names = [""] + list(cfg.profiles)
+            compiled: Dict[str, CompiledProfile] = {}
+            for name in names:
+                bindings = cfg.profile_config(name).effective_bindings()
+                old = self.profiles.get(name)
+                if old is not None and _same_shape(old.actions, bindings):
+                    # Rates, jitter, modes and triggers change in place
+                    rebound = False
+                    for action, b in zip(old.actions, bindings):
+                        if action.binding.trigger != b.trigger:
+                            # Its release would come from the old token
+                            action.stop()
+                            rebound = True
+                        action.update(b)
+                        if distribution_changed:
+                            action.clicker.set_distribution(self._distribution)
+                        if feedback_changed:
+                            action.clicker.set_feedback(self._feedback)
+                    if hotkey_changed or rebound:
+                        old.table = self._triggers.prepare(self._callbacks(old.actions))
+                    compiled[name] = old
+                    continue
+                actions = self.compile(bindings)
+                compiled[name] = CompiledProfile(name, actions, self._triggers.prepare(self._callbacks(actions)))
+                if old is not None:
+                    for action in old.actions:
+                        action.stop()
+            for name, old in self.profiles.items():
+                if name not in compiled:
+                    for action in old.actions:
+                        action.stop()
+
+            previous = self.profiles.get(self.active)
+            self.profiles = compiled
+            self.order = names
+            if not self.profiles.get(self.active) or not previous:
+                self.active = cfg.active_profile if cfg.active_profile in compiled else ""
+            current = compiled[self.active]
+            if current.table is not installed:
+                # Listeners a reconfigured table no longer needs keep running
+                self._triggers.install(current.table, keep_listeners=previous is not None)
+
+    def switch(self, name: str) -> bool:
+        with self._lock:
+            new = self.profiles.get(name)
+            old = self.profiles.get(self.active)
+            if new is None or old is None or new is old:
+                return False
+            self._triggers.install(new.table, keep_listeners=True)
+            self.active = name
+            carry = self._policy == "carry"
+            for action in old.actions:
+                if not action.clicker.is_active():
+                    action.stop()
+                    continue
+                action.stop()
+                if carry:
+                    for target in new.actions:
+                        b = target.binding
+                        if b.trigger == action.binding.trigger and b.button == action.binding.button:
+                            target.toggled = target.mode == "toggle"
+                            target.clicker.start()
+                            break
+            return True
+
+    def cycle_profile(self, pressed: bool) -> None:
+        if not pressed:
+            return
+        order = self.order
+        i = order.index(self.active) if self.active in order else -1
+        self.switch(order[(i + 1) % len(order)])
+
+    def action_for(self, token: str) -> Optional[Action]:
+        for action in self.actions:
+            if action.binding.trigger == token:
+                return action
+        return None
+
+    def start(self, token: str) -> bool:
+        # Click until stop(), whatever the binding's mode
+        action = self.action_for(token)
+        if action is None:
+            return False
+        action.clicker.start()
+        return True
+
+    def stop(self, token: str) -> bool:
+        action = self.action_for(token)
+        if action is None:
+            return False
+        action.stop()
+        return True
+
+    def running(self) -> List[str]:
+        return [a.binding.trigger for a in self.actions if a.clicker.is_active()]
+
+    def stop_all(self) -> None:
+        for profile in self.profiles.values():
+            for action in profile.actions:
+                action.stop()
@@ -1,55 +1,272 @@
-import threading
-import time
+import itertools
+import math
 import random
-from typing import Optional
-from pynput.mouse import Button, Controller
+import time
+from array import array
+from typing import Dict, Optional, Sequence, Tuple
+from pynput.mouse import Button
+
+from baseclick import trace
+from baseclick.backends import InjectionBackend, PynputBackend
+from baseclick.scheduler import ClickScheduler, default_scheduler
+from baseclick.telemetry import TRIGGER_WINDOW, Telemetry, telemetry as default_telemetry
+from baseclick.timing import IntervalBuffer, RateController
+
+# Clicks run on absolute perf_counter deadlines driven by a ClickScheduler.
+# Falling behind by less than MAX_LAG_INTERVALS is caught up on the next
+# click; anything more is skipped so a stall never turns into a burst.
+# Achieved CPS stays within ~1% of set_rate(); with feedback enabled a
+# RateController also compensates injection cost and time lost to skips.
+MAX_LAG_INTERVALS = 1.0
+
+# Bounded runs (run_bounded) follow a schedule precomputed when they start
+# and never skip: a count-limited run makes exactly that many clicks, and a
+# duration-limited run makes no click after its duration has elapsed.
+
+# Clicker ids in event traces (baseclick.trace)
+_trace_ids = itertools.count(1)
+
+# Position modes (set_position): "cursor" clicks wherever the cursor is;
+# "fixed" and "cycle" take points flattened once into an array("i") of x, y
+# pairs; "random" picks a uniform point inside rect (x, y, w, h). Aimed
+# clicks go out through backend.click_at() as one batched move+click, and
+# the point advances once per click, so rotation follows the clicking rate.
+
 
 class AutoClicker:
-    def __init__(self, click_button: Button, cps: int = 15, jitter_ratio: float = 0.25) -> None:
-        self._controller = Controller()
+    def __init__(
+        self,
+        click_button: Button,
+        cps: int = 15,
+        jitter_ratio: float = 0.25,
+        scheduler: Optional[ClickScheduler] = None,
+        backend: Optional[InjectionBackend] = None,
+        jitter_distribution: str = "uniform",
+        telemetry: Optional[Telemetry] = None,
+        feedback: bool = False,
+    ) -> None:
+        self._backend = backend or PynputBackend()
         self._button = click_button
-        self._cps = cps
-        self._jitter = jitter_ratio
-        self._running = threading.Event()
-        self._stop = threading.Event()
-        self._thread: Optional[threading.Thread] = None
+        self._cps = max(1, int(cps))
+        self._period = 1.0 / self._cps
+        self._intervals = IntervalBuffer(jitter_distribution, max(0.0, float(jitter_ratio)))
+        self._scheduler = scheduler or default_scheduler()
+        self._telemetry = telemetry or default_telemetry
+        self._started = 0.0
+        self._last_click = 0.0
+        self._target = 0.0
+        self._base = 0.0  # unscaled length of the interval being waited out
+        self._rate = RateController(self._backend.click_cost, enabled=feedback)
+        self._active = False
+        self._generation = 0
+        self._schedule: Optional[array] = None
+        self._schedule_pos = 0
+        self._run_start = 0.0
+        self._run_limit = math.inf
+        self._aim: Optional[Tuple[Optional[array], Optional[Tuple[int, int, int, int]]]] = None
+        self._point_pos = 0
+        self._rng = random.Random()
+        self._trace_id = next(_trace_ids)
+        self._clicks = 0  # in the current run
+        # Token whose press starts this clicker (set by bindings); trigger
+        # latency is measured from its last press
+        self.trigger = ""
 
     def set_rate(self, cps: int) -> None:
-        self._cps = max(1, int(cps))
+        cps = max(1, int(cps))
+        if cps != self._cps:
+            self._rate.reset()
+        self._cps = cps
+        self._period = 1.0 / cps
+
+    def set_feedback(self, enabled: bool) -> None:
+        self._rate.enabled = enabled
+        if not enabled:
+            self._rate.scale = 1.0
+
+    def rate_stats(self) -> Dict[str, float]:
+        return self._rate.stats(self._period)
 
     def set_jitter(self, jitter_ratio: float) -> None:
-        self._jitter = max(0.0, float(jitter_ratio))
+        jitter = max(0.0, float(jitter_ratio))
+        if jitter != self._intervals.jitter:
+            self._intervals = IntervalBuffer(self._intervals.distribution, jitter)
+
+    def set_distribution(self, distribution: str) -> None:
+        if distribution != self._intervals.distribution:
+            self._intervals = IntervalBuffer(distribution, self._intervals.jitter)
+
+    def set_position(self, mode: str = "cursor", points: Sequence[Sequence[int]] = (), rect: Sequence[int] = ()) -> None:
+        if mode == "cursor":
+            self._aim = None
+            return
+        if not self._backend.can_move:
+            raise ValueError(
+                f"position mode {mode!r} needs a backend that can move the cursor; "
+                f"the {self._backend.name} backend can't (uinput needs screen_size)"
+            )
+        if mode in ("fixed", "cycle"):
+            if not points:
+                raise ValueError(f"position mode {mode!r} needs points")
+            flat = array("i")
+            for x, y in (points[:1] if mode == "fixed" else points):
+                flat.append(int(x))
+                flat.append(int(y))
+            self._aim = (flat, None)
+        elif mode == "random":
+            if len(rect) != 4 or rect[2] <= 0 or rect[3] <= 0:
+                raise ValueError("position mode 'random' needs rect (x, y, w, h)")
+            x, y, w, h = (int(v) for v in rect)
+            self._aim = (None, (x, y, w, h))
+        else:
+            raise ValueError(f"unknown position mode {mode!r}")
 
     def start(self) -> None:
-        if self._thread and self._thread.is_alive():
-            self._running.set()
+        if self._active:
             return
-        self._running.set()
-        self._stop.clear()
-        self._thread = threading.Thread(target=self._run, daemon=True)
-        self._thread.start()
+        self._schedule = None
+        self._begin()
+
+    def run_bounded(self, count: Optional[int] = None, duration: Optional[float] = None, cps: Optional[float] = None) -> int:
+        # Start a run limited by click count and/or duration (seconds). cps
+        # defaults to set_rate(); cps=0 is a burst as fast as the backend
+        # accepts clicks. Returns the number of scheduled clicks.
+        schedule = self.build_schedule(count, duration, cps)
+        self.stop()
+        self._schedule = schedule
+        self._schedule_pos = 0
+        self._run_limit = math.inf if duration is None else float(duration)
+        if schedule:
+            self._begin()
+        return len(schedule)
+
+    def build_schedule(self, count: Optional[int] = None, duration: Optional[float] = None, cps: Optional[float] = None) -> array:
+        # Click offsets in seconds from the first click
+        if count is None and duration is None:
+            raise ValueError("a bounded run needs a count or a duration")
+        if cps is None:
+            cps = self._cps
+        if cps <= 0:
+            if count is None:
+                raise ValueError("a full-speed burst needs a click count")
+            return array("d", bytes(8 * max(0, int(count))))
+        period = 1.0 / cps
+        intervals = self._intervals
+        # Tolerate float drift from summing intervals, e.g. 100 x 0.01 < 1.0
+        end = math.inf if duration is None else duration - 1e-9
+        out = array("d")
+        t = 0.0
+        while (count is None or len(out) < count) and t < end:
+            out.append(t)
+            t += period * intervals.next()
+            intervals.refill()
+        return out
+
+    def _begin(self) -> None:
+        now = time.perf_counter()
+        trigger = self._telemetry.pressed_at.get(self.trigger, 0.0)
+        self._started = trigger if 0.0 <= now - trigger <= TRIGGER_WINDOW else now
+        self._last_click = 0.0
+        self._target = 0.0
+        self._rate.restart()
+        self._clicks = 0
+        self._generation += 1
+        self._active = True
+        tracer = trace.current
+        if tracer is not None:
+            tracer.name_clicker(self._trace_id, self._button.name)
+            tracer.start(now, self._trace_id, self._generation)
+        self._scheduler.activate(self, self._generation)
 
     def stop(self) -> None:
-        self._running.clear()
+        if not self._active:
+            return
+        self._active = False
+        self._generation += 1
+        tracer = trace.current
+        if tracer is not None:
+            tracer.stop(time.perf_counter(), self._trace_id, self._generation - 1)
+        self._scheduler.deactivate(self)
 
     def shutdown(self) -> None:
-        self._running.clear()
-        self._stop.set()
+        self.stop()
 
     def is_active(self) -> bool:
-        return self._running.is_set()
-
-    def _run(self) -> None:
-        while not self._stop.is_set():
-            if not self._running.is_set():
-                time.sleep(0.01)
-                continue
-            base = 1.0 / max(1, self._cps)
-            if self._jitter > 0:
-                low = max(0.0, base * (1 - self._jitter))
-                high = base * (1 + self._jitter)
-                delay = random.uniform(low, high)
+        return self._active
+
+    def _is_current(self, generation: int) -> bool:
+        return self._active and generation == self._generation
+
+    def _inject(self, deadline: float) -> float:
+        # Returns when the click was issued; _last_click is when it completed
+        aim = self._aim
+        issued = time.perf_counter()
+        if aim is None:
+            self._backend.click(self._button)
+        else:
+            points, rect = aim
+            if points is not None:
+                pos = self._point_pos
+                if pos >= len(points):
+                    pos = 0
+                x = points[pos]
+                y = points[pos + 1]
+                self._point_pos = pos + 2
             else:
-                delay = base
-            self._controller.click(self._button)
-            time.sleep(delay)
+                rx, ry, rw, rh = rect
+                rand = self._rng.random
+                x = rx + int(rand() * rw)
+                y = ry + int(rand() * rh)
+            self._backend.click_at(x, y, self._button)
+        now = time.perf_counter()
+        telemetry = self._telemetry
+        previous = self._last_click
+        telemetry.click(now, deadline, previous)
+        if not previous:
+            telemetry.first_click(now, self._started)
+        self._last_click = now
+        self._clicks += 1
+        tracer = trace.current
+        if tracer is not None:
+            tracer.click(now, self._trace_id, self._clicks, deadline)
+        return issued
+
+    def _fire(self, deadline: float) -> float:
+        if self._schedule is not None:
+            return self._fire_scheduled(deadline)
+        # The scheduler runs us `lead` early; _target is the real deadline
+        target = self._target or deadline
+        issued = self._inject(target)
+        rate = self._rate
+        rate.observe(issued, self._last_click, self._base)
+        intervals = self._intervals
+        base = self._period * intervals.next()
+        self._base = base
+        interval = base * rate.scale
+        target += interval
+        intervals.refill()
+        now = time.perf_counter()
+        if now - target > interval * MAX_LAG_INTERVALS:
+            target = now
+        self._target = target
+        return target - rate.lead
+
+    def _fire_scheduled(self, deadline: float) -> float:
+        schedule = self._schedule
+        pos = self._schedule_pos
+        if pos == 0:
+            self._run_start = deadline
+        elif time.perf_counter() - self._run_start >= self._run_limit:
+            self._finish()
+            return deadline
+        self._inject(deadline)
+        pos += 1
+        self._schedule_pos = pos
+        if pos >= len(schedule):
+            self._finish()
+            return deadline
+        return self._run_start + schedule[pos]
+
+    def _finish(self) -> None:
+        self._schedule = None
+        self.stop()
@@ -1,23 +1,231 @@
 import json
 import os
-from dataclasses import dataclass, asdict
-from typing import Literal
+import re
+import threading
+import time
+from dataclasses import dataclass, asdict, field, fields, replace
+from typing import Any, Dict, List, Literal, Optional, Set, Tuple
 
-ConfigMode = Literal["hold", "toggle"]
+from baseclick.realtime import THREAD_POLICIES, ThreadPolicy
+
+# hold/toggle run until released/pressed again; burst, count and duration
+# start a bounded run on press (see AutoClicker.run_bounded)
+ConfigMode = Literal["hold", "toggle", "burst", "count", "duration"]
+# What happens to running clickers when the profile hotkey switches profiles:
+# stop them all, or carry each over to the new profile's binding with the
+# same trigger and button (if there is one).
+SwitchPolicy = Literal["stop", "carry"]
+BackendName = Literal["pynput", "uinput", "recording"]
+# Where a binding's clicks land: under the cursor, on one fixed point,
+# round-robin through points, or at a random point inside rect (x, y, w, h)
+PositionMode = Literal["cursor", "fixed", "cycle", "random"]
+# Interval distributions, see baseclick.timing; also "learned:<name>" for a
+# recorded timing profile (baseclick.learned)
+JitterDistribution = str
 # Trigger token format examples:
-#   mouse:x1, mouse:x2, key:f6, key:a, key:esc
+#   mouse:x1, mouse:x2, mouse:middle, key:f6, key:a, key:esc
+# Chords join atoms with "+" and fire while all of them are held; an atom
+# without a kind takes the previous one, so key:ctrl+shift+f6 is ctrl,
+# shift and f6, and mouse:x1+key:shift mixes kinds. key:ctrl (alt, shift,
+# cmd) matches either side; key:ctrl_r only the right one.
 TriggerToken = str
+MODIFIER_KEYS = ("ctrl", "alt", "shift", "cmd")
+MOUSE_BUTTONS = ("left", "middle", "right", "x1", "x2")
 
 CONFIG_DIR = os.path.join(os.getenv("APPDATA", os.getcwd()), "BaseClick")
 CONFIG_PATH = os.path.join(CONFIG_DIR, "config.json")
+CONTROL_SOCKET = os.path.join(CONFIG_DIR, "control.sock")
+
+
+_ATOM = re.compile(r"(?:(mouse|key):)?(\+|[^+]+)(?:\+|$)")
+
+
+def token_atoms(token: str) -> List[str]:
+    # "key:ctrl+f6" -> ["key:ctrl", "key:f6"]; [] if it doesn't parse.
+    # A "+" directly after a separator is the plus key (key:ctrl++).
+    atoms: List[str] = []
+    kind = ""
+    pos = 0
+    while pos < len(token):
+        m = _ATOM.match(token, pos)
+        name = m.group(2).strip() if m else ""
+        kind = (m.group(1) if m else None) or kind
+        if not kind or not name:
+            return []
+        atoms.append(f"{kind}:{name}")
+        pos = m.end()
+    return atoms
+
+
+def join_atoms(atoms: List[str]) -> str:
+    # Inverse of token_atoms, leaving out repeated kinds
+    out = []
+    kind = ""
+    for atom in atoms:
+        k, _, name = atom.partition(":")
+        out.append(name if k == kind else atom)
+        kind = k
+    return "+".join(out)
+
+
+def _atom_order(atom: str):
+    # Modifiers first (either-side before sided), then the rest by name
+    kind, _, name = atom.partition(":")
+    base, _, side = name.partition("_")
+    if kind == "key" and base in MODIFIER_KEYS and side in ("", "l", "r"):
+        return (0, MODIFIER_KEYS.index(base), side)
+    return (1, 0, atom)
+
+
+def normalize_token(tok: str) -> str:
+    # Migrate legacy values like "x1"/"x2" to token format, and put chords
+    # in canonical form (lower case, no duplicates, modifiers first), so
+    # "mouse:x1+key:Shift" and "key:shift+mouse:x1" are the same trigger.
+    tok = tok.strip()
+    if tok in ("x1", "x2"):
+        return f"mouse:{tok}"
+    atoms = token_atoms(tok.lower())
+    if not atoms:
+        return tok  # leave as-is; UI may correct
+    return join_atoms(sorted(dict.fromkeys(atoms), key=_atom_order))
+
+
+@dataclass
+class Binding:
+    # One trigger -> clicker entry. cps/jitter_ratio/mode left as None follow
+    # the global settings (and so the sliders in the window).
+    trigger: TriggerToken
+    button: str = "left"  # left, right, middle, x1, x2
+    cps: Optional[int] = None
+    jitter_ratio: Optional[float] = None
+    mode: Optional[ConfigMode] = None
+    count: int = 10           # clicks per burst/count run
+    duration: float = 1.0     # seconds per duration run
+    burst_cps: float = 0.0    # burst rate; 0 = as fast as the backend accepts
+    position: PositionMode = "cursor"
+    points: List[List[int]] = field(default_factory=list)  # [[x, y], ...] for fixed/cycle
+    rect: List[int] = field(default_factory=list)          # [x, y, w, h] for random
+
+    @staticmethod
+    def from_dict(obj: Dict[str, Any]) -> "Binding":
+        cps = obj.get("cps")
+        jitter = obj.get("jitter_ratio")
+        points = [[int(p[0]), int(p[1])] for p in obj.get("points", []) if len(p) == 2]
+        rect = [int(v) for v in obj.get("rect", [])]
+        position = obj.get("position", "cursor")
+        # A mode without usable coordinates clicks under the cursor
+        if position in ("fixed", "cycle") and not points:
+            position = "cursor"
+        elif position == "random" and (len(rect) != 4 or rect[2] <= 0 or rect[3] <= 0):
+            position = "cursor"
+        elif position not in ("fixed", "cycle", "random"):
+            position = "cursor"
+        return Binding(
+            trigger=normalize_token(str(obj.get("trigger", ""))),
+            button=str(obj.get("button", "left")),
+            cps=None if cps is None else int(cps),
+            jitter_ratio=None if jitter is None else float(jitter),
+            mode=obj.get("mode"),
+            count=int(obj.get("count", 10)),
+            duration=float(obj.get("duration", 1.0)),
+            burst_cps=float(obj.get("burst_cps", 0.0)),
+            position=position,
+            points=points,
+            rect=rect,
+        )
+
+
+@dataclass
+class Profile:
+    # Named overlay of the top-level settings; None keeps the top-level value
+    cps: Optional[int] = None
+    jitter_ratio: Optional[float] = None
+    mode: Optional[ConfigMode] = None
+    left_trigger: Optional[TriggerToken] = None
+    right_trigger: Optional[TriggerToken] = None
+    bindings: Optional[List[Binding]] = None
+
+    @staticmethod
+    def from_dict(obj: Dict[str, Any]) -> "Profile":
+        cps = obj.get("cps")
+        jitter = obj.get("jitter_ratio")
+        left = obj.get("left_trigger")
+        right = obj.get("right_trigger")
+        bindings = obj.get("bindings")
+        return Profile(
+            cps=None if cps is None else int(cps),
+            jitter_ratio=None if jitter is None else float(jitter),
+            mode=obj.get("mode"),
+            left_trigger=None if left is None else normalize_token(left),
+            right_trigger=None if right is None else normalize_token(right),
+            bindings=None if bindings is None else [Binding.from_dict(b) for b in bindings if isinstance(b, dict)],
+        )
+
 
 @dataclass
 class AppConfig:
     cps: int = 15
     jitter_ratio: float = 0.25
+    jitter_distribution: JitterDistribution = "uniform"
     mode: ConfigMode = "hold"
     left_trigger: TriggerToken = "mouse:x2"
     right_trigger: TriggerToken = "mouse:x1"
+    backend: BackendName = "pynput"
+    # [width, height] for the uinput backend's absolute pointer; without it
+    # uinput can only click under the cursor (no aimed bindings or macros)
+    screen_size: List[int] = field(default_factory=list)
+    show_stats: bool = False
+    rate_feedback: bool = False  # closed-loop rate correction in clickers
+    # Click thread scheduling (Linux, see baseclick.realtime). fifo/rr fall
+    # back to nice -priority when not permitted.
+    thread_policy: ThreadPolicy = "normal"
+    thread_priority: int = 10
+    cpu_affinity: List[int] = field(default_factory=list)
+    timer_slack_ns: int = 0  # 0 = kernel default
+    # Hold off the cyclic GC while clicking (ClickScheduler.set_quiet_gc)
+    low_jitter: bool = False
+    durable_writes: bool = False  # fsync config.json before replacing it
+    # Apply edits to config.json while running (AppController.reload_config)
+    hot_reload: bool = True
+    # Run clickers and trigger listeners in a worker process, away from the
+    # GUI's GIL (baseclick.engine_process)
+    engine_process: bool = False
+    # Local control server (baseclick.control); "" uses CONTROL_SOCKET
+    control_server: bool = False
+    control_socket: str = ""
+    # Event trace ring file (baseclick.trace); "" = off
+    trace_path: str = ""
+    trace_capacity: int = 1 << 16  # records, power of two
+    # Extra bindings on top of the left/right triggers edited in the window
+    bindings: List[Binding] = field(default_factory=list)
+    # Named profiles; "" is the top-level settings above
+    profiles: Dict[str, Profile] = field(default_factory=dict)
+    active_profile: str = ""
+    profile_hotkey: TriggerToken = ""  # cycles "" -> each profile -> ""
+    profile_switch_policy: SwitchPolicy = "stop"
+
+    def profile_config(self, name: str) -> "AppConfig":
+        profile = self.profiles.get(name)
+        if profile is None:
+            return self
+        overrides = {f.name: getattr(profile, f.name) for f in fields(profile)}
+        return replace(self, **{k: v for k, v in overrides.items() if v is not None})
+
+    def effective_bindings(self) -> List[Binding]:
+        # Every binding with the global defaults filled in; the window's
+        # left/right triggers come first.
+        out = [
+            Binding(self.left_trigger, "left", self.cps, self.jitter_ratio, self.mode),
+            Binding(self.right_trigger, "right", self.cps, self.jitter_ratio, self.mode),
+        ]
+        for b in self.bindings:
+            out.append(replace(
+                b,
+                cps=self.cps if b.cps is None else b.cps,
+                jitter_ratio=self.jitter_ratio if b.jitter_ratio is None else b.jitter_ratio,
+                mode=self.mode if b.mode is None else b.mode,
+            ))
+        return [b for b in out if b.trigger]
 
     def to_json(self) -> str:
         return json.dumps(asdict(self), indent=2)
@@ -25,36 +233,162 @@ class AppConfig:
     @staticmethod
     def from_json(data: str) -> "AppConfig":
         obj = json.loads(data)
-        # Migrate legacy values like "x1"/"x2" to token format
-        def normalize(tok: str) -> str:
-            if tok in ("x1", "x2"):
-                return f"mouse:{tok}"
-            if tok.startswith("mouse:") or tok.startswith("key:"):
-                return tok
-            return tok  # leave as-is; UI may correct
-
+        policy = obj.get("thread_policy", "normal")
         return AppConfig(
             cps=int(obj.get("cps", 15)),
             jitter_ratio=float(obj.get("jitter_ratio", 0.25)),
+            jitter_distribution=obj.get("jitter_distribution", "uniform"),
             mode=obj.get("mode", "hold"),
-            left_trigger=normalize(obj.get("left_trigger", "mouse:x2")),
-            right_trigger=normalize(obj.get("right_trigger", "mouse:x1")),
+            left_trigger=normalize_token(obj.get("left_trigger", "mouse:x2")),
+            right_trigger=normalize_token(obj.get("right_trigger", "mouse:x1")),
+            backend=obj.get("backend", "pynput"),
+            screen_size=[int(v) for v in obj.get("screen_size", [])],
+            show_stats=bool(obj.get("show_stats", False)),
+            rate_feedback=bool(obj.get("rate_feedback", False)),
+            thread_policy=policy if policy in THREAD_POLICIES else "normal",
+            thread_priority=int(obj.get("thread_priority", 10)),
+            cpu_affinity=[int(c) for c in obj.get("cpu_affinity", [])],
+            timer_slack_ns=int(obj.get("timer_slack_ns", 0)),
+            low_jitter=bool(obj.get("low_jitter", False)),
+            durable_writes=bool(obj.get("durable_writes", False)),
+            hot_reload=bool(obj.get("hot_reload", True)),
+            engine_process=bool(obj.get("engine_process", False)),
+            control_server=bool(obj.get("control_server", False)),
+            control_socket=str(obj.get("control_socket", "")),
+            trace_path=str(obj.get("trace_path", "")),
+            trace_capacity=int(obj.get("trace_capacity", 1 << 16)),
+            bindings=[Binding.from_dict(b) for b in obj.get("bindings", []) if isinstance(b, dict)],
+            profiles={
+                str(name): Profile.from_dict(p)
+                for name, p in obj.get("profiles", {}).items() if isinstance(p, dict)
+            },
+            active_profile=str(obj.get("active_profile", "")),
+            profile_hotkey=normalize_token(obj.get("profile_hotkey", "")),
+            profile_switch_policy=obj.get("profile_switch_policy", "stop"),
         )
 
 
-def load_config() -> AppConfig:
+def diff_config(old: AppConfig, new: AppConfig) -> Set[str]:
+    # Names of the top-level fields that differ
+    return {f.name for f in fields(AppConfig) if getattr(old, f.name) != getattr(new, f.name)}
+
+
+def load_config(path: str = CONFIG_PATH) -> AppConfig:
     try:
-        if os.path.exists(CONFIG_PATH):
-            with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
                 return AppConfig.from_json(f.read())
     except Exception:
         pass
     return AppConfig()
 
 
-def save_config(cfg: AppConfig) -> None:
-    os.makedirs(CONFIG_DIR, exist_ok=True)
-    tmp_path = CONFIG_PATH + ".tmp"
+def save_config(cfg: AppConfig, path: str = CONFIG_PATH, fsync: bool = False, text: Optional[str] = None) -> None:
+    # text: cfg.to_json() if the caller already has it
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
     with open(tmp_path, "w", encoding="utf-8") as f:
-        f.write(cfg.to_json())
-    os.replace(tmp_path, CONFIG_PATH)
+        f.write(cfg.to_json() if text is None else text)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class ConfigStore:
+    # Keeps the live AppConfig in memory and persists it write-behind: a
+    # background writer waits until updates have been quiet for `delay`
+    # seconds (but never longer than `max_delay` after the first one) and
+    # then writes once. flush()/close() write any pending change immediately.
+    # `written` is the last (text, config) this store wrote, so a file watcher
+    # can tell its own writes from external edits.
+    def __init__(
+        self,
+        cfg: AppConfig,
+        path: str = CONFIG_PATH,
+        delay: float = 0.5,
+        max_delay: float = 2.0,
+    ) -> None:
+        self._cfg = cfg
+        self._path = path
+        self._delay = delay
+        self._max_delay = max_delay
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._dirty_since: Optional[float] = None
+        self._due = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.writes = 0
+        self.written: Optional[Tuple[str, AppConfig]] = None
+
+    @property
+    def cfg(self) -> AppConfig:
+        return self._cfg
+
+    def update(self, cfg: AppConfig, dirty: bool = True) -> None:
+        # dirty=False for a config that is already on disk (a reload); a
+        # write still pending from earlier updates goes ahead with it
+        with self._cond:
+            self._cfg = cfg
+            if dirty:
+                self._mark_dirty()
+
+    def mark_dirty(self) -> None:
+        # For in-place edits of the current config
+        with self._cond:
+            self._mark_dirty()
+
+    def _mark_dirty(self) -> None:
+        now = time.monotonic()
+        if self._dirty_since is None:
+            self._dirty_since = now
+        self._due = min(now + self._delay, self._dirty_since + self._max_delay)
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(target=self._run, name="baseclick-config", daemon=True)
+            self._thread.start()
+        self._cond.notify()
+
+    def flush(self) -> None:
+        with self._cond:
+            if self._dirty_since is None:
+                return
+            cfg = self._cfg
+            self._dirty_since = None
+        self._write(cfg)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        self.flush()
+
+    def _write(self, cfg: AppConfig) -> None:
+        with self._write_lock:
+            text = cfg.to_json()
+            # Recorded before the rename so the watcher never sees the file first
+            self.written = (text, cfg)
+            try:
+                save_config(cfg, self._path, fsync=cfg.durable_writes, text=text)
+                self.writes += 1
+            except OSError:
+                pass
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._dirty_since is None:
+                        self._cond.wait()
+                        continue
+                    remaining = self._due - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return
+                cfg = self._cfg
+                self._dirty_since = None
+            self._write(cfg)
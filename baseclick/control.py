@@ -0,0 +1,270 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+import threading
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Set
+
+from baseclick.config import CONTROL_SOCKET, normalize_token
+
+if TYPE_CHECKING:
+    from baseclick.controller import AppController
+
+# Wire format: every frame is a little-endian u32 length followed by that
+# many bytes of UTF-8 JSON. A request is {"cmd": name, ...args} with an
+# optional "id"; each request gets exactly one response, in request order,
+# {"ok": true, ...} or {"ok": false, "error": message}, with "id" echoed.
+# Clients may write any number of requests before reading (pipelining).
+FRAME = struct.Struct("<I")
+MAX_FRAME = 1 << 20
+
+Response = Dict[str, Any]
+
+
+def encode(obj: Dict[str, Any]) -> bytes:
+    data = json.dumps(obj, separators=(",", ":")).encode()
+    return FRAME.pack(len(data)) + data
+
+
+class ControlServer:
+    # asyncio server on its own thread ("baseclick-control"), started by
+    # AppController when control_server is enabled. Commands run on the loop
+    # thread one at a time, so clients never interleave inside a command.
+    def __init__(self, controller: "AppController", path: str = CONTROL_SOCKET) -> None:
+        self.controller = controller
+        self.path = path
+        self.clients = 0
+        self.commands = 0
+        self.error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Response]] = {
+            "ping": self._ping,
+            "start": self._start,
+            "stop": self._stop,
+            "set_rate": self._set_rate,
+            "set_jitter": self._set_jitter,
+            "bind": self._bind,
+            "stats": self._stats,
+        }
+
+    def start(self) -> bool:
+        # False (with .error set) if the socket couldn't be opened
+        if not hasattr(asyncio, "start_unix_server"):
+            self.error = OSError("Unix sockets are not available on this platform")
+            return False
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="baseclick-control", daemon=True)
+        self._thread.start()
+        ready.wait(5.0)
+        return self.error is None
+
+    def stop(self) -> None:
+        loop, stopped = self._loop, self._stopped
+        if loop is not None and stopped is not None:
+            try:
+                loop.call_soon_threadsafe(stopped.set)
+            except RuntimeError:
+                pass  # loop already closed
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+
+    def _run(self, ready: threading.Event) -> None:
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._main(ready))
+        except OSError as e:
+            self.error = e
+        finally:
+            ready.set()
+            loop.close()
+
+    async def _main(self, ready: threading.Event) -> None:
+        self._stopped = asyncio.Event()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # A socket left behind by a crashed run; never unlink anything else
+        if os.path.exists(self.path) and stat.S_ISSOCK(os.stat(self.path).st_mode):
+            os.unlink(self.path)
+        server = await asyncio.start_unix_server(self._serve, path=self.path)
+        os.chmod(self.path, 0o600)
+        ready.set()
+        try:
+            await self._stopped.wait()
+        finally:
+            server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await server.wait_closed()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.clients += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                (size,) = FRAME.unpack(await reader.readexactly(FRAME.size))
+                if size > MAX_FRAME:
+                    writer.write(encode({"ok": False, "error": "frame too large"}))
+                    break
+                writer.write(encode(self.handle(await reader.readexactly(size))))
+                # Only waits when the client stops reading
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def handle(self, payload: bytes) -> Response:
+        self.commands += 1
+        try:
+            request = json.loads(payload)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except ValueError as e:
+            return {"ok": False, "error": f"bad request: {e}"}
+        handler = self._handlers.get(request.get("cmd"))
+        if handler is None:
+            response: Response = {"ok": False, "error": f"unknown command {request.get('cmd')!r}"}
+        else:
+            try:
+                response = {"ok": True, **handler(request)}
+            # Any failure is this request's reply, e.g. OverflowError from
+            # cps=1e999 or TimeoutError from a RemoteEngine whose worker
+            # stopped answering; raising would drop the connection and the
+            # responses pipelined behind it
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    def _ping(self, request: Dict[str, Any]) -> Response:
+        return {}
+
+    def _start(self, request: Dict[str, Any]) -> Response:
+        # Clicks until stop, whatever the binding's mode
+        token = normalize_token(str(request.get("trigger") or self.controller.cfg.left_trigger))
+        if not self.controller.engine.start(token):
+            raise KeyError(f"no binding for {token!r}")
+        return {}
+
+    def _stop(self, request: Dict[str, Any]) -> Response:
+        if "trigger" in request:
+            if not self.controller.engine.stop(normalize_token(str(request["trigger"]))):
+                raise KeyError(f"no binding for {request['trigger']!r}")
+        else:
+            self.controller.engine.stop_all()
+        return {}
+
+    def _set_rate(self, request: Dict[str, Any]) -> Response:
+        controller = self.controller
+        controller.apply_settings(replace(controller.cfg, cps=max(1, int(request["cps"]))))
+        return {"cps": controller.cfg.cps}
+
+    def _set_jitter(self, request: Dict[str, Any]) -> Response:
+        controller = self.controller
+        controller.apply_settings(replace(controller.cfg, jitter_ratio=max(0.0, float(request["jitter_ratio"]))))
+        return {"jitter_ratio": controller.cfg.jitter_ratio}
+
+    def _bind(self, request: Dict[str, Any]) -> Response:
+        side = request["side"]
+        if side not in ("left", "right"):
+            raise ValueError("side must be 'left' or 'right'")
+        self.controller.bind(side, normalize_token(str(request["token"])))
+        return {}
+
+    def _stats(self, request: Dict[str, Any]) -> Response:
+        engine = self.controller.engine
+        # stats() first: with an engine process it wakes the worker, which
+        # publishes its active profile as it answers
+        telemetry = self.controller.stats()
+        return {
+            "profile": engine.active,
+            "active": engine.running(),
+            "cps_setting": self.controller.cfg.cps,
+            "telemetry": telemetry,
+            "control": {"clients": self.clients, "commands": self.commands},
+        }
+
+
+class ControlClient:
+    # Blocking client for scripts and the CLI below
+    def __init__(self, path: str = CONTROL_SOCKET, timeout: Optional[float] = 5.0) -> None:
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(path)
+        self._file = self._sock.makefile("rb")
+
+    def call(self, cmd: str, **args: Any) -> Response:
+        self._sock.sendall(encode({"cmd": cmd, **args}))
+        return self._read()
+
+    def pipeline(self, requests: Sequence[Dict[str, Any]]) -> List[Response]:
+        # Send every request, then read the responses in order
+        self._sock.sendall(b"".join(encode(r) for r in requests))
+        return [self._read() for _ in requests]
+
+    def _read(self) -> Response:
+        header = self._file.read(FRAME.size)
+        if len(header) < FRAME.size:
+            raise ConnectionError("control server closed the connection")
+        (size,) = FRAME.unpack(header)
+        return json.loads(self._file.read(size))
+
+    def close(self) -> None:
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self) -> "ControlClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _parse_arg(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m baseclick.control", description="Send one command to a running BaseClick")
+    parser.add_argument("--socket", default=CONTROL_SOCKET, help=f"control socket (default {CONTROL_SOCKET})")
+    parser.add_argument("cmd", help="ping, start, stop, set_rate, set_jitter, bind or stats")
+    parser.add_argument("args", nargs="*", metavar="key=value", help="e.g. cps=20, trigger=key:f6, side=left token=mouse:x1")
+    args = parser.parse_args(argv)
+
+    request = {}
+    for item in args.args:
+        key, sep, value = item.partition("=")
+        if not sep:
+            parser.error(f"expected key=value, got {item!r}")
+        request[key] = _parse_arg(value)
+    try:
+        with ControlClient(args.socket) as client:
+            response = client.call(args.cmd, **request)
+    except OSError as e:
+        print(f"cannot reach {args.socket}: {e}", file=sys.stderr)
+        return 2
+    print(json.dumps(response, indent=2))
+    return 0 if response.get("ok") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+import threading
+from dataclasses import replace
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Union
+
+from baseclick import trace
+from baseclick.config import CONFIG_PATH, CONTROL_SOCKET, AppConfig, ConfigStore, diff_config, load_config
+from baseclick.backends import InjectionBackend, create_backend
+from baseclick.bindings import BindingEngine
+from baseclick.learned import IntervalRecorder, TimingProfile
+from baseclick.macro import MacroPlayer, MacroRecorder
+from baseclick.realtime import TuningReport, tune_current_thread
+from baseclick.scheduler import ClickScheduler
+from baseclick.telemetry import telemetry
+from baseclick.triggers import TriggerManager
+from baseclick.watch import FileWatcher
+
+if TYPE_CHECKING:
+    from baseclick.control import ControlServer
+    from baseclick.engine_process import RemoteEngine
+
+# Fields only the controller itself acts on; everything else goes to the engine
+_CONTROLLER_FIELDS = frozenset({"show_stats", "durable_writes", "control_server", "control_socket", "hot_reload"})
+_TUNING_FIELDS = frozenset({"thread_policy", "thread_priority", "cpu_affinity", "timer_slack_ns"})
+# Clickers hold their backend, so changing these rebuilds the engine
+_BACKEND_FIELDS = frozenset({"backend", "screen_size"})
+
+
+class AppController:
+    def __init__(self, config_path: str = CONFIG_PATH) -> None:
+        self.cfg = load_config(config_path)
+        self.config_path = config_path
+        self.store = ConfigStore(self.cfg, config_path)
+        # What config.json held when last read or written, the base that
+        # reload_config() diffs external edits against
+        self._disk_cfg = self.cfg
+        # Settings change from the UI thread and the control server
+        self._lock = threading.RLock()
+        self.scheduler = ClickScheduler()
+        # Made on first use (see _local_backend): a worker process clicks
+        # through its own
+        self.backend: Optional[InjectionBackend] = None
+        # With engine_process the local TriggerManager only serves capture_once
+        # and macro recording; bindings live in the worker
+        self.triggers = TriggerManager()
+        self.engine: Union[BindingEngine, "RemoteEngine"] = self._create_engine(self.cfg)
+        self._sync_scheduler(self.cfg)
+        self._sync_trace(self.cfg)
+        self.recorder: Optional[MacroRecorder] = None
+        self.timing_recorder: Optional[IntervalRecorder] = None
+        self.player: Optional[MacroPlayer] = None
+        self.control: Optional["ControlServer"] = None
+        self.watcher: Optional[FileWatcher] = None
+        # Called with the new config after reload_config() applied an edit
+        self.reload_listeners: List[Callable[[AppConfig], None]] = []
+
+        self.engine.apply(self.cfg)
+        self.triggers.start()
+        self._sync_control(self.cfg)
+        self._sync_watcher(self.cfg)
+
+    def bind(self, side: str, token: str) -> None:
+        # Rebind the window's left or right trigger
+        with self._lock:
+            if side == "left":
+                cfg = replace(self.cfg, left_trigger=token)
+            else:
+                cfg = replace(self.cfg, right_trigger=token)
+            self.apply_settings(cfg)
+
+    def _create_engine(self, cfg: AppConfig) -> Union[BindingEngine, "RemoteEngine"]:
+        if cfg.engine_process:
+            from baseclick.engine_process import RemoteEngine
+            try:
+                return RemoteEngine(cfg)
+            except (OSError, RuntimeError):
+                pass  # worker couldn't start; click in-process instead
+        return BindingEngine(self.triggers, self.scheduler, self._local_backend(cfg), cfg.jitter_distribution)
+
+    def _local_backend(self, cfg: AppConfig) -> InjectionBackend:
+        # For in-process clickers and macro playback
+        if self.backend is None:
+            self.backend = create_backend(cfg.backend, cfg.screen_size)
+            self.backend.calibrate()
+        return self.backend
+
+    def _switch_backend(self, cfg: AppConfig) -> None:
+        # A worker process makes its own backend from cfg
+        if self.player:
+            self.player.stop()
+        old, self.backend = self.backend, None
+        self._switch_engine(cfg)
+        if old is not None:
+            old.close()
+
+    def _switch_engine(self, cfg: AppConfig) -> None:
+        old = self.engine
+        old.stop_all()
+        if isinstance(old, BindingEngine):
+            self.triggers.replace_triggers({})
+        else:
+            old.close()
+        # Whichever process clicks owns the trace file
+        trace.stop()
+        self.engine = self._create_engine(cfg)
+        self._sync_scheduler(cfg)
+        self._sync_trace(cfg)
+
+    def stats(self) -> Dict[str, object]:
+        # Telemetry.summary() of whichever process does the clicking
+        if isinstance(self.engine, BindingEngine):
+            return telemetry.summary()
+        return self.engine.summary()
+
+    def _sync_control(self, cfg: AppConfig) -> None:
+        path = cfg.control_socket or CONTROL_SOCKET
+        control = self.control
+        if control is not None and (not cfg.control_server or control.path != path):
+            control.stop()
+            self.control = control = None
+        if control is None and cfg.control_server:
+            # Imported here so asyncio is only loaded when the server is on
+            from baseclick.control import ControlServer
+            # A failed start stays visible as self.control.error
+            self.control = ControlServer(self, path)
+            self.control.start()
+
+    def _sync_scheduler(self, cfg: AppConfig) -> None:
+        # Thread tuning and quiet GC are for whichever scheduler clicks; an
+        # engine process applies them to its own, so the idle local one is
+        # left alone
+        if isinstance(self.engine, BindingEngine):
+            self._tune_scheduler(cfg)
+            self.scheduler.set_quiet_gc(cfg.low_jitter)
+        elif self.scheduler.quiet_gc:
+            self.scheduler.set_quiet_gc(False)
+
+    def _sync_trace(self, cfg: AppConfig) -> None:
+        # An engine process traces in the worker; a second tracer here on the
+        # same file would clobber its header and a slot when it closes
+        if not cfg.trace_path or not isinstance(self.engine, BindingEngine):
+            trace.stop()
+            return
+        try:
+            trace.start(cfg.trace_path, cfg.trace_capacity)
+        except (OSError, ValueError):
+            trace.stop()  # tracing is best effort; clicking goes on
+
+    def _sync_watcher(self, cfg: AppConfig) -> None:
+        if cfg.hot_reload and self.watcher is None:
+            self.watcher = FileWatcher(self.config_path, self.reload_config)
+            self.watcher.start()
+        elif not cfg.hot_reload and self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
+    def reload_config(self) -> Set[str]:
+        # Applies the fields of config.json that changed since it was last
+        # read or written on top of the live config, so edits made in the
+        # window but not yet saved survive, and doesn't write it back. Our
+        # own writes and half-saved files are ignored. Returns what changed.
+        try:
+            with open(self.config_path, "r", encoding="utf-8") as f:
+                text = f.read()
+            disk = AppConfig.from_json(text)
+        except (OSError, ValueError, TypeError, AttributeError):
+            return set()
+        with self._lock:
+            written = self.store.written
+            if written is not None and written[0] == text:
+                self._disk_cfg = written[1]
+                return set()
+            changed = diff_config(self._disk_cfg, disk)
+            self._disk_cfg = disk
+            if not changed:
+                return set()
+            cfg = replace(self.cfg, **{name: getattr(disk, name) for name in changed})
+            self.apply_settings(cfg, persist=False)
+        for listener in list(self.reload_listeners):
+            listener(cfg)
+        return changed
+
+    def _tune_scheduler(self, cfg: AppConfig) -> None:
+        self.scheduler.set_thread_setup(partial(
+            tune_current_thread, cfg.thread_policy, cfg.thread_priority, cfg.cpu_affinity, cfg.timer_slack_ns,
+        ))
+
+    @property
+    def thread_tuning(self) -> Optional[TuningReport]:
+        # Per setting: (took effect, detail); None until the thread has run it
+        result = self.scheduler.setup_result
+        return result if isinstance(result, dict) else None
+
+    def apply_settings(self, new_cfg: AppConfig, persist: bool = True):
+        # Only what differs from the live config is applied; clickers,
+        # listeners and threads are updated in place. persist=False when
+        # new_cfg came from the file.
+        with self._lock:
+            changed = diff_config(self.cfg, new_cfg)
+            if not changed:
+                return
+            if changed & _BACKEND_FIELDS:
+                self._switch_backend(new_cfg)
+            elif "engine_process" in changed:
+                self._switch_engine(new_cfg)
+            elif isinstance(self.engine, BindingEngine):
+                if changed & _TUNING_FIELDS:
+                    self._tune_scheduler(new_cfg)
+                if "low_jitter" in changed:
+                    self.scheduler.set_quiet_gc(new_cfg.low_jitter)
+            if changed - _CONTROLLER_FIELDS:
+                self.engine.apply(new_cfg)
+            self.cfg = new_cfg
+            self.store.update(new_cfg, dirty=persist)
+            if changed & {"control_server", "control_socket"}:
+                self._sync_control(new_cfg)
+            if changed & {"trace_path", "trace_capacity"} and not changed & (_BACKEND_FIELDS | {"engine_process"}):
+                self._sync_trace(new_cfg)
+            if "hot_reload" in changed:
+                self._sync_watcher(new_cfg)
+
+    def save_settings(self, cfg: AppConfig) -> None:
+        # An explicit save: apply, then write through the store right away
+        # rather than write-behind, so the watcher still knows it's ours
+        with self._lock:
+            self.apply_settings(cfg)
+            self.store.mark_dirty()
+        self.store.flush()
+
+    def start_recording(self, path: str) -> None:
+        self.stop_recording()
+        self.cancel_timing_recording()
+        self.recorder = MacroRecorder(path)
+        self.triggers.set_recorder(self.recorder)
+
+    def stop_recording(self) -> int:
+        recorder, self.recorder = self.recorder, None
+        if recorder is None:
+            return 0
+        self.triggers.set_recorder(None)
+        recorder.close()
+        return recorder.count
+
+    def start_timing_recording(self, button: str = "left") -> None:
+        # Learns click intervals from the real mouse; shares the recorder
+        # hook with macro recording, so it ends one in progress
+        self.stop_recording()
+        self.cancel_timing_recording()
+        self.timing_recorder = IntervalRecorder(button)
+        self.triggers.set_recorder(self.timing_recorder)
+
+    def cancel_timing_recording(self) -> Optional[IntervalRecorder]:
+        recorder, self.timing_recorder = self.timing_recorder, None
+        if recorder is not None:
+            self.triggers.set_recorder(None)
+        return recorder
+
+    def stop_timing_recording(self, name: str, bins: int = 64) -> TimingProfile:
+        # Saves the profile; select it with jitter_distribution "learned:<name>".
+        # ValueError if too few clicks were recorded.
+        recorder = self.cancel_timing_recording()
+        if recorder is None:
+            raise ValueError("no timing recording in progress")
+        profile = recorder.profile(bins)
+        profile.save(name)
+        return profile
+
+    def play_macro(self, path: str, speed: float = 1.0) -> MacroPlayer:
+        if self.player:
+            self.player.stop()
+        self.player = MacroPlayer(self._local_backend(self.cfg), speed=speed)
+        self.player.start(path)
+        return self.player
+
+    def shutdown(self):
+        if self.watcher:
+            self.watcher.stop()
+        if self.control:
+            self.control.stop()
+        self.stop_recording()
+        self.cancel_timing_recording()
+        if self.player:
+            self.player.stop()
+        self.engine.stop_all()
+        if not isinstance(self.engine, BindingEngine):
+            self.engine.close()
+        self.scheduler.shutdown()
+        if self.backend is not None:
+            self.backend.close()
+        self.triggers.stop()
+        self.store.close()
+        trace.stop()
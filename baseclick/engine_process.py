@@ -0,0 +1,419 @@
+import json
+import multiprocessing
+import struct
+import threading
+import time
+from dataclasses import replace
+from functools import partial
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from baseclick.config import AppConfig
+
+# Optional out-of-process click engine (AppConfig.engine_process). The
+# clickers, ClickScheduler and TriggerManager run in a spawned worker with
+# its own interpreter and GIL, so GUI repaints and GC pauses never delay a
+# click. The GUI side (RemoteEngine) and the worker share one control block
+# in shared memory; a multiprocessing.Event is only used as a doorbell.
+#
+# Control block layout (little-endian). Each field has a single writer:
+#   GUI:    settings_seq/config (full config JSON), rate_seq/cps/jitter
+#           (slider fast path), command_seq/command/arg, stats_request
+#   worker: status, command_ack/command_result/arg (reply),
+#           heartbeat, clicks, edges, profile (active profile's index in
+#           [""] + cfg.profiles), stats_seq and the stats fields
+# settings_seq, rate_seq and stats_seq are seqlocks: odd while the writer
+# is mid-update, and readers retry when the value changed under them.
+MAGIC = b"BCENGINE"
+_FIELDS: Dict[str, Tuple[int, str]] = {
+    "status": (8, "I"),
+    "settings_seq": (12, "I"),
+    "config_len": (16, "I"),
+    "rate_seq": (20, "I"),
+    "cps": (24, "I"),
+    "jitter": (32, "d"),
+    "command_seq": (40, "I"),
+    "command": (44, "I"),
+    "command_ack": (48, "I"),
+    "command_result": (52, "I"),
+    "heartbeat": (56, "d"),
+    "clicks": (64, "Q"),
+    "edges": (72, "Q"),
+    "cps_achieved": (80, "d"),
+    "err_p50": (88, "d"),
+    "err_p99": (96, "d"),
+    "err_max": (104, "d"),
+    "lat_p99": (112, "d"),
+    "stats_seq": (120, "I"),
+    "stats_request": (124, "I"),
+    "profile": (128, "I"),
+}
+_STRUCTS = {name: (offset, struct.Struct("<" + fmt)) for name, (offset, fmt) in _FIELDS.items()}
+ARG_OFFSET = 136
+ARG_SIZE = 1024      # command token in, JSON reply out
+CONFIG_OFFSET = ARG_OFFSET + ARG_SIZE
+CONFIG_SIZE = 1 << 16
+BLOCK_SIZE = CONFIG_OFFSET + CONFIG_SIZE
+
+# status
+STARTING = 0
+READY = 1
+FAILED = 2
+STOPPED = 3
+
+# commands
+CMD_START = 1       # arg: trigger token
+CMD_STOP = 2        # arg: trigger token, or "" for every clicker
+CMD_RUNNING = 3     # reply: JSON list of active trigger tokens
+CMD_SHUTDOWN = 4
+CMD_RESET_STATS = 5
+
+HEARTBEAT = 0.5     # worker wakes at least this often without a doorbell
+READY_TIMEOUT = 10.0
+COMMAND_TIMEOUT = 1.0
+STATS_TIMEOUT = 0.05  # summary() falls back to the last consistent read
+
+
+class ControlBlock:
+    def __init__(self, buf: memoryview) -> None:
+        self.buf = buf
+
+    def get(self, name: str) -> Any:
+        offset, st = _STRUCTS[name]
+        return st.unpack_from(self.buf, offset)[0]
+
+    def set(self, name: str, value: Any) -> None:
+        offset, st = _STRUCTS[name]
+        st.pack_into(self.buf, offset, value)
+
+    def bump(self, name: str) -> int:
+        value = (self.get(name) + 1) & 0xFFFFFFFF
+        self.set(name, value)
+        return value
+
+    def write_arg(self, data: bytes) -> None:
+        if len(data) > ARG_SIZE:
+            raise ValueError("control block argument too long")
+        self.buf[ARG_OFFSET:ARG_OFFSET + ARG_SIZE] = data.ljust(ARG_SIZE, b"\0")
+
+    def read_arg(self) -> bytes:
+        return bytes(self.buf[ARG_OFFSET:ARG_OFFSET + ARG_SIZE]).rstrip(b"\0")
+
+    def write_config(self, cfg: AppConfig) -> None:
+        data = cfg.to_json().encode()
+        if len(data) > CONFIG_SIZE:
+            raise ValueError("config too large for the engine control block")
+        self.bump("settings_seq")
+        self.buf[CONFIG_OFFSET:CONFIG_OFFSET + len(data)] = data
+        self.set("config_len", len(data))
+        self.bump("settings_seq")
+
+    def read_config(self) -> Tuple[int, AppConfig]:
+        while True:
+            seq = self.get("settings_seq")
+            if seq & 1:
+                time.sleep(0)
+                continue
+            length = self.get("config_len")
+            data = bytes(self.buf[CONFIG_OFFSET:CONFIG_OFFSET + length])
+            if self.get("settings_seq") == seq:
+                return seq, AppConfig.from_json(data.decode())
+
+    def write_rate(self, cps: int, jitter: float) -> None:
+        self.bump("rate_seq")
+        self.set("cps", cps)
+        self.set("jitter", jitter)
+        self.bump("rate_seq")
+
+    def read_rate(self) -> Tuple[int, int, float]:
+        while True:
+            seq = self.get("rate_seq")
+            if seq & 1:
+                time.sleep(0)
+                continue
+            cps, jitter = self.get("cps"), self.get("jitter")
+            if self.get("rate_seq") == seq:
+                return seq, cps, jitter
+
+
+class RemoteEngine:
+    # Stands in for BindingEngine in AppController when engine_process is on.
+    # `target` is the worker entry point (benchmarks wrap it to stub pynput).
+    def __init__(self, cfg: AppConfig, target: Optional[Callable[..., None]] = None) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        self._shm = SharedMemory(create=True, size=BLOCK_SIZE)
+        self.block = ControlBlock(self._shm.buf)
+        self.block.buf[:8] = MAGIC
+        self._doorbell = ctx.Event()
+        self._lock = threading.Lock()
+        self._cfg = cfg
+        self.block.write_config(cfg)
+        self.block.write_rate(cfg.cps, cfg.jitter_ratio)
+        self.actions: List[Any] = []  # clickers live in the worker
+        self._stats: Dict[str, object] = {
+            "clicks": 0,
+            "cps": 0.0,
+            "interval_error": {"p50": 0.0, "p99": 0.0, "max": 0.0},
+            "trigger_latency": {"p99": 0.0},
+        }
+        self.process = ctx.Process(
+            target=target or worker_main, args=(self._shm.name, self._doorbell), name="baseclick-engine", daemon=True,
+        )
+        self.process.start()
+        deadline = time.monotonic() + READY_TIMEOUT
+        while self.block.get("status") == STARTING and self.process.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        if self.block.get("status") != READY:
+            self.close()
+            raise RuntimeError("click engine process failed to start")
+
+    @property
+    def active(self) -> str:
+        # As of the worker's last poll; the profile hotkey switches there
+        order = [""] + list(self._cfg.profiles)
+        index = self.block.get("profile")
+        return order[index] if index < len(order) else ""
+
+    def apply(self, cfg: AppConfig) -> None:
+        with self._lock:
+            old, self._cfg = self._cfg, cfg
+            if replace(cfg, cps=old.cps, jitter_ratio=old.jitter_ratio) == old:
+                # Slider drags: two fields, no JSON round trip in the worker
+                self.block.write_rate(cfg.cps, cfg.jitter_ratio)
+            else:
+                self.block.write_config(cfg)
+                self.block.write_rate(cfg.cps, cfg.jitter_ratio)
+        self._doorbell.set()
+
+    def _command(self, command: int, arg: str = "") -> Tuple[int, bytes]:
+        with self._lock:
+            block = self.block
+            block.write_arg(arg.encode())
+            block.set("command", command)
+            seq = block.bump("command_seq")
+            self._doorbell.set()
+            deadline = time.monotonic() + COMMAND_TIMEOUT
+            while block.get("command_ack") != seq:
+                if time.monotonic() > deadline or not self.process.is_alive():
+                    raise TimeoutError("click engine process is not responding")
+                time.sleep(0.0005)
+            return block.get("command_result"), block.read_arg()
+
+    def start(self, token: str) -> bool:
+        return bool(self._command(CMD_START, token)[0])
+
+    def stop(self, token: str) -> bool:
+        return bool(self._command(CMD_STOP, token)[0])
+
+    def stop_all(self) -> None:
+        if self.process.is_alive():
+            self._command(CMD_STOP)
+
+    def running(self) -> List[str]:
+        return json.loads(self._command(CMD_RUNNING)[1] or b"[]")
+
+    def reset_stats(self) -> None:
+        self._command(CMD_RESET_STATS)
+
+    def alive(self) -> bool:
+        return self.process.is_alive() and time.monotonic() - self.block.get("heartbeat") < 4 * HEARTBEAT
+
+    def summary(self) -> Dict[str, object]:
+        # Same keys as Telemetry.summary(), from the worker's last publish;
+        # each call asks for a fresh one, so stats cost nothing unless shown.
+        # A worker that died mid-publish leaves stats_seq odd; after
+        # STATS_TIMEOUT the previous summary is returned instead.
+        block = self.block
+        with self._lock:
+            block.bump("stats_request")
+        self._doorbell.set()
+        deadline = time.monotonic() + STATS_TIMEOUT
+        while True:
+            seq = block.get("stats_seq")
+            if not seq & 1:
+                stats = {name: block.get(name) for name in ("clicks", "cps_achieved", "err_p50", "err_p99", "err_max", "lat_p99")}
+                if block.get("stats_seq") == seq:
+                    break
+            if time.monotonic() > deadline:
+                return self._stats
+            time.sleep(0)
+        self._stats = {
+            "clicks": stats["clicks"],
+            "cps": stats["cps_achieved"],
+            "interval_error": {"p50": stats["err_p50"], "p99": stats["err_p99"], "max": stats["err_max"]},
+            "trigger_latency": {"p99": stats["lat_p99"]},
+        }
+        return self._stats
+
+    def close(self) -> None:
+        if self.process.is_alive():
+            try:
+                self._command(CMD_SHUTDOWN)
+            except TimeoutError:
+                pass
+            self.process.join(timeout=2.0)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(timeout=1.0)
+        self.block.buf = None
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _attach(name: str) -> SharedMemory:
+    # The GUI owns and unlinks the block. Before 3.13 a spawned worker shares
+    # the GUI's resource tracker, so registering it again is harmless.
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        return SharedMemory(name=name)
+
+
+class _Worker:
+    def __init__(self, block: ControlBlock) -> None:
+        from baseclick import trace
+        from baseclick.backends import create_backend
+        from baseclick.bindings import BindingEngine
+        from baseclick.realtime import tune_current_thread
+        from baseclick.scheduler import ClickScheduler
+        from baseclick.telemetry import telemetry
+        from baseclick.triggers import TriggerManager
+
+        self.block = block
+        self.telemetry = telemetry
+        self.settings_seq, cfg = block.read_config()
+        self.rate_seq, cps, jitter = block.read_rate()
+        self.cfg = replace(cfg, cps=cps, jitter_ratio=jitter)
+        self.stats_request = block.get("stats_request")
+        self.command_seq = block.get("command_seq")
+        self._trace = trace
+        self._tune = tune_current_thread
+        self.scheduler = ClickScheduler()
+        self._sync_process_settings(None, cfg)
+        self.backend = create_backend(cfg.backend, cfg.screen_size)
+        self.backend.calibrate()
+        self.triggers = TriggerManager()
+        self.engine = BindingEngine(self.triggers, self.scheduler, self.backend, cfg.jitter_distribution)
+        self.engine.apply(self.cfg)
+        self.publish_profile()
+        self.triggers.start()
+
+    def _sync_process_settings(self, old: Optional[AppConfig], cfg: AppConfig) -> None:
+        # What AppController does in-process for tracing and thread tuning
+        tuning = (cfg.thread_policy, cfg.thread_priority, cfg.cpu_affinity, cfg.timer_slack_ns)
+        if old is None or tuning != (old.thread_policy, old.thread_priority, old.cpu_affinity, old.timer_slack_ns):
+            self.scheduler.set_thread_setup(partial(self._tune, *tuning))
+        if old is None or cfg.low_jitter != old.low_jitter:
+            self.scheduler.set_quiet_gc(cfg.low_jitter)
+        if old is None or (cfg.trace_path, cfg.trace_capacity) != (old.trace_path, old.trace_capacity):
+            self._trace.stop()
+            if cfg.trace_path:
+                try:
+                    self._trace.start(cfg.trace_path, cfg.trace_capacity)
+                except (OSError, ValueError):
+                    self._trace.stop()
+
+    def poll(self) -> bool:
+        # Applies whatever changed in the block; False once told to shut down
+        block = self.block
+        if block.get("settings_seq") != self.settings_seq:
+            self.settings_seq, cfg = block.read_config()
+            self.rate_seq, cps, jitter = block.read_rate()
+            old, self.cfg = self.cfg, replace(cfg, cps=cps, jitter_ratio=jitter)
+            self._sync_process_settings(old, self.cfg)
+            self.engine.apply(self.cfg)
+        elif block.get("rate_seq") != self.rate_seq:
+            self.rate_seq, cps, jitter = block.read_rate()
+            self.cfg = replace(self.cfg, cps=cps, jitter_ratio=jitter)
+            self.engine.apply(self.cfg)
+
+        seq = block.get("command_seq")
+        if seq != self.command_seq:
+            self.command_seq = seq
+            command = block.get("command")
+            if command == CMD_SHUTDOWN:
+                block.set("command_ack", seq)
+                return False
+            token = block.read_arg().decode()
+            result = 1
+            if command == CMD_START:
+                result = int(self.engine.start(token))
+            elif command == CMD_STOP:
+                if token:
+                    result = int(self.engine.stop(token))
+                else:
+                    self.engine.stop_all()
+            elif command == CMD_RUNNING:
+                block.write_arg(json.dumps(self.engine.running()).encode())
+            elif command == CMD_RESET_STATS:
+                self.telemetry.reset()
+            block.set("command_result", result)
+            block.set("command_ack", seq)
+
+        telemetry = self.telemetry
+        self.publish_profile()
+        block.set("clicks", telemetry.clicks)
+        block.set("edges", self.triggers.edges)
+        block.set("heartbeat", time.monotonic())
+        request = block.get("stats_request")
+        if request != self.stats_request:
+            self.stats_request = request
+            self.publish_stats()
+        return True
+
+    def publish_profile(self) -> None:
+        # The profile hotkey switches profiles here, without the GUI
+        engine = self.engine
+        self.block.set("profile", engine.order.index(engine.active) if engine.active in engine.order else 0)
+
+    def publish_stats(self) -> None:
+        from baseclick.telemetry import percentiles
+        telemetry = self.telemetry
+        errors = percentiles([abs(v) for v in telemetry.interval_errors.snapshot()])
+        latency = percentiles(telemetry.trigger_latency.snapshot())
+        block = self.block
+        block.bump("stats_seq")
+        block.set("cps_achieved", telemetry.achieved_cps())
+        block.set("err_p50", errors["p50"])
+        block.set("err_p99", errors["p99"])
+        block.set("err_max", errors["max"])
+        block.set("lat_p99", latency["p99"])
+        block.bump("stats_seq")
+
+    def close(self) -> None:
+        self.engine.stop_all()
+        self.scheduler.shutdown()
+        self.backend.close()
+        self.triggers.stop()
+        self._trace.stop()
+
+
+def worker_main(shm_name: str, doorbell) -> None:
+    shm = _attach(shm_name)
+    block = ControlBlock(shm.buf)
+    worker: Optional[_Worker] = None
+    try:
+        worker = _Worker(block)
+        block.set("heartbeat", time.monotonic())
+        block.set("status", READY)
+        parent = multiprocessing.parent_process()
+        while True:
+            if doorbell.wait(HEARTBEAT):
+                doorbell.clear()
+            if not worker.poll():
+                break
+            # A GUI that stalls is fine; one that is gone takes us with it
+            if parent is not None and not parent.is_alive():
+                break
+        block.set("status", STOPPED)
+    except Exception:
+        block.set("status", FAILED)
+        raise
+    finally:
+        if worker is not None:
+            worker.close()
+        block.buf = None
+        shm.close()
@@ -0,0 +1,270 @@
+import argparse
+import math
+import os
+import random
+import re
+import struct
+import sys
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from baseclick.config import CONFIG_DIR
+
+# Learned timing profiles: a user's own click intervals, recorded through
+# TriggerManager.set_recorder(), stored as a histogram of interval factors
+# (interval / mean, so any cps can reuse them) and sampled with Vose's alias
+# method, one random number and O(1) work per draw whatever the bin count.
+# Select one with jitter_distribution "learned:<name>"; jitter_ratio does
+# not apply, the recording is the spread.
+#
+# File layout (TIMING_DIR/<name>.bin): HEADER, then bins + 1 float64 bin
+# edges (factors, ascending, normalized to mean 1) and bins uint32 counts.
+#   header: magic, version, bins, samples, recorded mean interval (s)
+MAGIC = b"BCTIMING"
+VERSION = 1
+HEADER = struct.Struct("<8sHHId")
+TIMING_DIR = os.path.join(CONFIG_DIR, "timing")
+LEARNED_PREFIX = "learned:"
+
+MIN_SAMPLES = 20
+MAX_BINS = 4096
+# Intervals longer than this many medians are pauses between bursts, not
+# part of the clicking rhythm
+BREAK_FACTOR = 4.0
+
+_NAME = re.compile(r"[\w.-]+")
+
+
+def profile_path(name: str) -> str:
+    if not _NAME.fullmatch(name):
+        raise ValueError(f"bad timing profile name {name!r}")
+    return os.path.join(TIMING_DIR, f"{name}.bin")
+
+
+def _alias_table(weights: Sequence[float]) -> Tuple[array, array]:
+    # Vose: bin k is kept with probability prob[k], else it hands over to
+    # alias[k]; every column holds exactly 1/n of the mass
+    n = len(weights)
+    total = float(sum(weights))
+    scaled = [w * n / total for w in weights]
+    prob = array("d", bytes(8 * n))
+    alias = array("i", range(n))
+    small = [k for k, p in enumerate(scaled) if p < 1.0]
+    large = [k for k, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s, g = small.pop(), large.pop()
+        prob[s] = scaled[s]
+        alias[s] = g
+        scaled[g] -= 1.0 - scaled[s]
+        (small if scaled[g] < 1.0 else large).append(g)
+    for k in small + large:
+        prob[k] = 1.0  # leftovers are 1 up to rounding
+    return prob, alias
+
+
+class TimingProfile:
+    def __init__(self, edges: Sequence[float], counts: Sequence[int], mean_interval: float) -> None:
+        if len(edges) != len(counts) + 1 or not counts or not 0 < len(counts) <= MAX_BINS:
+            raise ValueError("timing profile needs bins + 1 edges and 1..MAX_BINS bins")
+        if any(b <= a for a, b in zip(edges, edges[1:])) or edges[0] < 0 or sum(counts) <= 0:
+            raise ValueError("timing profile edges must ascend from >= 0 with some counts")
+        self.edges = array("d", edges)
+        self.counts = array("I", counts)
+        self.mean_interval = mean_interval
+        self.samples = sum(counts)
+        self.bins = len(counts)
+        self._low = array("d", edges[:-1])
+        self._width = array("d", (b - a for a, b in zip(edges, edges[1:])))
+        self._prob, self._alias = _alias_table(counts)
+
+    @classmethod
+    def from_intervals(cls, intervals: Sequence[float], bins: int = 64) -> "TimingProfile":
+        # Equal-width histogram of interval / mean, pauses dropped, scaled so
+        # the binned distribution has mean exactly 1
+        values = sorted(v for v in intervals if v > 0)
+        if values:
+            median = values[len(values) // 2]
+            values = [v for v in values if v <= BREAK_FACTOR * median]
+        if len(values) < MIN_SAMPLES:
+            raise ValueError(f"need at least {MIN_SAMPLES} click intervals, got {len(values)}")
+        mean = sum(values) / len(values)
+        low, high = values[0] / mean, values[-1] / mean
+        bins = max(1, min(bins, MAX_BINS, 2 * math.isqrt(len(values))))
+        width = (high - low) / bins or 1e-3
+        counts = [0] * bins
+        for v in values:
+            counts[min(bins - 1, int((v / mean - low) / width))] += 1
+        edges = [low + k * width for k in range(bins + 1)]
+        binned_mean = sum(c * (edges[k] + width / 2) for k, c in enumerate(counts)) / len(values)
+        return cls([e / binned_mean for e in edges], counts, mean)
+
+    def fill(self, out: array, rng: random.Random = random) -> array:
+        # One random number per draw: its integer part picks the column, the
+        # fraction decides bin vs alias and is rescaled to place the factor
+        # uniformly inside the chosen bin
+        bins = self.bins
+        prob, alias, low, width = self._prob, self._alias, self._low, self._width
+        rand = rng.random
+        for i in range(len(out)):
+            u = rand() * bins
+            k = int(u)
+            if k == bins:
+                k -= 1  # rand() * bins can round up to bins
+            f = u - k
+            p = prob[k]
+            if f < p:
+                out[i] = low[k] + width[k] * (f / p)
+            else:
+                k = alias[k]
+                out[i] = low[k] + width[k] * ((f - p) / (1.0 - p))
+        return out
+
+    def summary(self) -> Dict[str, float]:
+        mids = [(a + b) / 2 for a, b in zip(self.edges, self.edges[1:])]
+        n = self.samples
+        mean = sum(c * m for c, m in zip(self.counts, mids)) / n
+        var = sum(c * (m - mean) ** 2 for c, m in zip(self.counts, mids)) / n
+        return {
+            "samples": float(n),
+            "bins": float(self.bins),
+            "recorded_cps": 1.0 / self.mean_interval,
+            "cv": math.sqrt(var) / mean,
+            "min_factor": self.edges[0],
+            "max_factor": self.edges[-1],
+        }
+
+    def to_bytes(self) -> bytes:
+        # Always little-endian
+        edges, counts = self.edges, self.counts
+        if sys.byteorder != "little":
+            edges, counts = array("d", edges), array("I", counts)
+            edges.byteswap()
+            counts.byteswap()
+        return HEADER.pack(MAGIC, VERSION, self.bins, self.samples, self.mean_interval) + edges.tobytes() + counts.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TimingProfile":
+        if len(data) < HEADER.size:
+            raise ValueError("not a BaseClick timing profile")
+        magic, version, bins, _, mean = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION or len(data) != HEADER.size + bins * 12 + 8:
+            raise ValueError(f"not a BaseClick timing profile (v{VERSION})")
+        split = HEADER.size + (bins + 1) * 8
+        edges = array("d")
+        edges.frombytes(data[HEADER.size:split])
+        counts = array("I")
+        counts.frombytes(data[split:])
+        if sys.byteorder != "little":
+            edges.byteswap()
+            counts.byteswap()
+        return cls(edges, counts, mean)
+
+    def save(self, name: str) -> str:
+        path = profile_path(name)
+        os.makedirs(TIMING_DIR, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.to_bytes())
+        os.replace(tmp_path, path)
+        return path
+
+
+_cache: Dict[str, Tuple[float, TimingProfile]] = {}
+_cache_lock = threading.Lock()
+
+
+def load_profile(name: str) -> Optional[TimingProfile]:
+    # Cached per file mtime; None if the profile is missing or unreadable
+    try:
+        path = profile_path(name)
+        mtime = os.stat(path).st_mtime
+        with _cache_lock:
+            hit = _cache.get(path)
+            if hit is not None and hit[0] == mtime:
+                return hit[1]
+        with open(path, "rb") as f:
+            profile = TimingProfile.from_bytes(f.read())
+    except (OSError, ValueError):
+        return None
+    with _cache_lock:
+        _cache[path] = (mtime, profile)
+    return profile
+
+
+class IntervalRecorder:
+    # Recorder for TriggerManager.set_recorder(): keeps the time between
+    # successive presses of one mouse button, ignoring everything else
+    def __init__(self, button: str = "left") -> None:
+        self.button = button
+        self.intervals: List[float] = []
+        self._last = 0.0
+
+    @property
+    def count(self) -> int:
+        return len(self.intervals)
+
+    def move(self, x: int, y: int) -> None:
+        pass
+
+    def key(self, key, pressed: bool) -> None:
+        pass
+
+    def mouse(self, x: int, y: int, button, pressed: bool) -> None:
+        if not pressed or getattr(button, "name", None) != self.button:
+            return
+        now = time.perf_counter()
+        if self._last:
+            self.intervals.append(now - self._last)
+        self._last = now
+
+    def close(self) -> None:
+        pass
+
+    def profile(self, bins: int = 64) -> TimingProfile:
+        return TimingProfile.from_intervals(self.intervals, bins)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m baseclick.learned", description="Record or inspect learned timing profiles")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    rec = sub.add_parser("record", help="record your own clicking, then save it as NAME")
+    rec.add_argument("name")
+    rec.add_argument("--seconds", type=float, default=15.0)
+    rec.add_argument("--button", default="left", choices=("left", "right", "middle", "x1", "x2"))
+    rec.add_argument("--bins", type=int, default=64)
+    show = sub.add_parser("show", help="print a saved profile's summary")
+    show.add_argument("name")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "show":
+        profile = load_profile(args.name)
+        if profile is None:
+            print(f"no readable profile at {profile_path(args.name)}", file=sys.stderr)
+            return 1
+    else:
+        from baseclick.triggers import TriggerManager
+        recorder = IntervalRecorder(args.button)
+        triggers = TriggerManager()
+        triggers.set_recorder(recorder)
+        triggers.start()
+        print(f"click {args.button} at your usual pace for {args.seconds:g}s...")
+        try:
+            time.sleep(args.seconds)
+        finally:
+            triggers.set_recorder(None)
+            triggers.stop()
+        try:
+            profile = recorder.profile(args.bins)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+        print(f"saved {profile.save(args.name)}")
+    for key, value in profile.summary().items():
+        print(f"  {key:<13} {value:g}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+import queue
+import struct
+import threading
+import time
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple, Union
+from pynput.mouse import Button
+from pynput import keyboard
+
+from baseclick.backends import InjectionBackend
+from baseclick.scheduler import SPIN_WINDOW, spin_until
+from baseclick.telemetry import RingBuffer, percentiles
+
+# File layout: HEADER, then fixed-size little-endian records
+#   t: float64 seconds since the first event
+#   kind: u8, pressed: u8, code: u16, x: i32, y: i32
+MAGIC = b"BCMACRO\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sHH")
+RECORD = struct.Struct("<dBBHii")
+
+MOVE = 0
+MOUSE = 1       # code: index into MOUSE_BUTTONS
+KEY_NAMED = 2   # code: index into KEY_NAMES
+KEY_CHAR = 3    # code: ord(char)
+KEY_VK = 4      # code: platform virtual-key code
+
+MOUSE_BUTTONS = ("left", "right", "middle", "x1", "x2")
+# Fixed table so files stay portable across platforms/pynput versions.
+# Append only; indices are stored in recordings.
+KEY_NAMES = (
+    "alt", "alt_l", "alt_r", "alt_gr", "backspace", "caps_lock", "cmd", "cmd_l", "cmd_r",
+    "ctrl", "ctrl_l", "ctrl_r", "delete", "down", "end", "enter", "esc",
+    "f1", "f2", "f3", "f4", "f5", "f6", "f7", "f8", "f9", "f10",
+    "f11", "f12", "f13", "f14", "f15", "f16", "f17", "f18", "f19", "f20",
+    "home", "left", "page_down", "page_up", "right", "shift", "shift_l", "shift_r",
+    "space", "tab", "up", "insert", "menu", "num_lock", "pause", "print_screen", "scroll_lock",
+    "media_play_pause", "media_volume_mute", "media_volume_down", "media_volume_up",
+    "media_previous", "media_next",
+)
+_KEY_INDEX = {name: i for i, name in enumerate(KEY_NAMES)}
+_BUTTON_INDEX = {name: i for i, name in enumerate(MOUSE_BUTTONS)}
+
+READ_CHUNK = 4096  # records per read while streaming
+
+
+class MacroRecorder:
+    # Receives raw events from TriggerManager.set_recorder() and appends them
+    # as packed records. Every `flush_every` records the full buffer is handed
+    # to a writer thread, so the hook threads never wait on the disk.
+    def __init__(self, path: str, flush_every: int = 256) -> None:
+        self._file: BinaryIO = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+        self._buf = bytearray()
+        self._flush_bytes = flush_every * RECORD.size
+        self._lock = threading.Lock()
+        self._t0: Optional[float] = None
+        self._closed = False
+        self.count = 0
+        self._blocks: "queue.SimpleQueue[Optional[bytearray]]" = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_loop, name="baseclick-macro-writer", daemon=True)
+        self._writer.start()
+
+    def _write_loop(self) -> None:
+        while True:
+            block = self._blocks.get()
+            if block is None:
+                return
+            self._file.write(block)
+
+    def _append(self, kind: int, pressed: int, code: int, x: int, y: int) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            if self._t0 is None:
+                self._t0 = now
+            self._buf += RECORD.pack(now - self._t0, kind, pressed, code, x, y)
+            self.count += 1
+            if len(self._buf) >= self._flush_bytes and not self._closed:
+                self._blocks.put(self._buf)
+                self._buf = bytearray()
+
+    def move(self, x: int, y: int) -> None:
+        self._append(MOVE, 0, 0, int(x), int(y))
+
+    def mouse(self, x: int, y: int, button: Button, pressed: bool) -> None:
+        code = _BUTTON_INDEX.get(getattr(button, "name", ""))
+        if code is not None:
+            self._append(MOUSE, pressed, code, int(x), int(y))
+
+    def key(self, key: keyboard.Key | keyboard.KeyCode, pressed: bool) -> None:
+        if isinstance(key, keyboard.Key):
+            code = _KEY_INDEX.get(key.name)
+            if code is not None:
+                self._append(KEY_NAMED, pressed, code, 0, 0)
+        elif getattr(key, "char", None) and len(key.char) == 1 and ord(key.char) < 0x10000:
+            self._append(KEY_CHAR, pressed, ord(key.char), 0, 0)
+        elif getattr(key, "vk", None) is not None and 0 <= key.vk < 0x10000:
+            self._append(KEY_VK, pressed, key.vk, 0, 0)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._blocks.put(self._buf)
+            self._buf = bytearray()
+            self._blocks.put(None)
+        self._writer.join()
+        self._file.close()
+
+
+def has_pointer_records(path: str) -> bool:
+    # True if the recording moves the cursor or clicks at a position
+    return any(kind in (MOVE, MOUSE) for _, kind, *_ in read_records(path))
+
+
+def read_records(path: str) -> Iterator[Tuple[float, int, int, int, int, int]]:
+    # Streams records in fixed-size chunks; the whole file is never loaded.
+    with open(path, "rb") as f:
+        magic, version, size = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION or size != RECORD.size:
+            raise ValueError(f"{path}: not a BaseClick macro (v{VERSION})")
+        chunk = bytearray(READ_CHUNK * RECORD.size)
+        view = memoryview(chunk)
+        while True:
+            n = f.readinto(chunk)
+            if not n:
+                return
+            n -= n % RECORD.size
+            yield from RECORD.iter_unpack(view[:n])
+
+
+class MacroPlayer:
+    # Replays a recording on absolute deadlines (start + t / speed) through an
+    # InjectionBackend; keys go through a pynput keyboard controller.
+    # timing_error holds how late each event was issued, in seconds.
+    # Recordings with mouse events need a backend that can_move; play() and
+    # start() raise ValueError up front rather than failing mid-macro.
+    # stop() interrupts the wait for the next event; buttons and keys the
+    # macro left down are released however playback ends.
+    def __init__(
+        self,
+        backend: InjectionBackend,
+        keyboard_controller: Optional[keyboard.Controller] = None,
+        speed: float = 1.0,
+    ) -> None:
+        self._backend = backend
+        self._keyboard = keyboard_controller
+        self._speed = max(1e-3, float(speed))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.timing_error = RingBuffer(1 << 16)
+        self.events = 0
+
+    def check(self, path: str) -> None:
+        if not self._backend.can_move and has_pointer_records(path):
+            raise ValueError(
+                f"{self._backend.name} backend can't position the cursor; "
+                "macros with mouse events need pynput, or uinput with screen_size set"
+            )
+
+    def play(self, path: str) -> None:
+        self.check(path)
+        self._play(path)
+
+    def _play(self, path: str) -> None:
+        self._stop.clear()
+        self.events = 0
+        self.timing_error.clear()
+        backend = self._backend
+        buttons: List[Button] = [getattr(Button, name) for name in MOUSE_BUTTONS]
+        start = time.perf_counter()
+        speed = self._speed
+        record_error = self.timing_error.append
+        stop = self._stop
+        held_buttons: Set[Button] = set()
+        held_keys: Set[Union[keyboard.Key, keyboard.KeyCode]] = set()
+        try:
+            for t, kind, pressed, code, x, y in read_records(path):
+                deadline = start + t / speed
+                remaining = deadline - time.perf_counter() - SPIN_WINDOW
+                if (remaining > 0 and stop.wait(remaining)) or stop.is_set():
+                    return
+                spin_until(deadline)
+                record_error(time.perf_counter() - deadline)
+                if kind == MOVE:
+                    backend.move_to(x, y)
+                elif kind == MOUSE:
+                    backend.move_to(x, y)
+                    button = buttons[code]
+                    if pressed:
+                        backend.press(button)
+                        held_buttons.add(button)
+                    else:
+                        backend.release(button)
+                        held_buttons.discard(button)
+                else:
+                    key = self._key(kind, code)
+                    if key is None:
+                        continue
+                    if pressed:
+                        self._keyboard.press(key)
+                        held_keys.add(key)
+                    else:
+                        self._keyboard.release(key)
+                        held_keys.discard(key)
+                self.events += 1
+        finally:
+            for button in held_buttons:
+                backend.release(button)
+            for key in held_keys:
+                self._keyboard.release(key)
+
+    def _key(self, kind: int, code: int) -> Optional[Union[keyboard.Key, keyboard.KeyCode]]:
+        if self._keyboard is None:
+            self._keyboard = keyboard.Controller()
+        if kind == KEY_NAMED:
+            return getattr(keyboard.Key, KEY_NAMES[code], None)
+        if kind == KEY_CHAR:
+            return keyboard.KeyCode.from_char(chr(code))
+        return keyboard.KeyCode.from_vk(code)
+
+    def start(self, path: str) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self.check(path)
+        self._thread = threading.Thread(target=self._play, args=(path,), name="baseclick-macro", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict[str, float]:
+        return percentiles([abs(v) for v in self.timing_error.snapshot()])
@@ -0,0 +1,99 @@
+import ctypes
+import ctypes.util
+import os
+import sys
+import threading
+from typing import Dict, List, Literal, Optional, Tuple
+
+# Opt-in scheduling tweaks for the click thread (Linux). Each call reports,
+# per setting, whether it actually took effect (read back from the kernel)
+# and what was done, since RT policies and negative nice usually need
+# CAP_SYS_NICE or an rtprio rlimit.
+ThreadPolicy = Literal["normal", "fifo", "rr"]
+THREAD_POLICIES = ("normal", "fifo", "rr")
+TuningReport = Dict[str, Tuple[bool, str]]
+
+PR_SET_TIMERSLACK = 29
+PR_GET_TIMERSLACK = 30
+
+_POLICIES = {
+    "fifo": getattr(os, "SCHED_FIFO", None),
+    "rr": getattr(os, "SCHED_RR", None),
+}
+
+_libc: Optional[ctypes.CDLL] = None
+
+
+def _prctl(option: int, arg: int = 0) -> int:
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    result = _libc.prctl(option, ctypes.c_ulong(arg), 0, 0, 0)
+    if result < 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+    return result
+
+
+def _set_policy(policy: ThreadPolicy, priority: int) -> Tuple[bool, str]:
+    if not hasattr(os, "sched_setscheduler"):
+        return policy == "normal", "unsupported"
+    if policy == "normal":
+        if os.sched_getscheduler(0) != os.SCHED_OTHER:
+            os.sched_setscheduler(0, os.SCHED_OTHER, os.sched_param(0))
+        return True, "SCHED_OTHER"
+    native = _POLICIES.get(policy)
+    if native is None:
+        return False, f"unknown policy {policy!r}"
+    priority = min(os.sched_get_priority_max(native), max(os.sched_get_priority_min(native), priority))
+    try:
+        os.sched_setscheduler(0, native, os.sched_param(priority))
+    except OSError as e:
+        # Not permitted: settle for the best nice level we are allowed
+        nice = -min(20, priority)
+        tid = threading.get_native_id()
+        try:
+            os.setpriority(os.PRIO_PROCESS, tid, nice)
+        except OSError:
+            return False, f"{policy} denied ({e.strerror}); nice {nice} denied"
+        return False, f"{policy} denied ({e.strerror}); nice {os.getpriority(os.PRIO_PROCESS, tid)}"
+    applied = os.sched_getscheduler(0) == native and os.sched_getparam(0).sched_priority == priority
+    return applied, f"{policy} {priority}"
+
+
+def _set_affinity(cpus: List[int]) -> Tuple[bool, str]:
+    if not hasattr(os, "sched_setaffinity"):
+        return not cpus, "unsupported"
+    # Empty means "like the rest of the process"
+    wanted = set(cpus) if cpus else os.sched_getaffinity(os.getpid())
+    try:
+        os.sched_setaffinity(0, wanted)
+    except OSError as e:
+        return False, f"cpus {sorted(wanted)} denied ({e.strerror})"
+    actual = os.sched_getaffinity(0)
+    return actual == wanted, f"cpus {sorted(actual)}"
+
+
+def _set_timer_slack(slack_ns: int) -> Tuple[bool, str]:
+    # 0 restores the default (usually 50us); RT threads always get 0
+    if not sys.platform.startswith("linux"):
+        return slack_ns <= 0, "unsupported"
+    try:
+        _prctl(PR_SET_TIMERSLACK, max(0, slack_ns))
+        actual = _prctl(PR_GET_TIMERSLACK)
+    except (OSError, AttributeError) as e:
+        return False, f"prctl failed ({e})"
+    return (slack_ns <= 0 or actual <= slack_ns), f"{actual}ns"
+
+
+def tune_current_thread(
+    policy: ThreadPolicy = "normal",
+    priority: int = 10,
+    cpus: Optional[List[int]] = None,
+    timer_slack_ns: int = 0,
+) -> TuningReport:
+    return {
+        "policy": _set_policy(policy, priority),
+        "affinity": _set_affinity(cpus or []),
+        "timer_slack": _set_timer_slack(timer_slack_ns),
+    }
@@ -0,0 +1,167 @@
+import gc
+import heapq
+import itertools
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, List, Optional
+
+if TYPE_CHECKING:
+    from baseclick.clicker import AutoClicker
+
+# Coarse-sleep until SPIN_WINDOW before a deadline, then spin on perf_counter.
+SPIN_WINDOW = 0.002
+
+
+def spin_until(deadline: float) -> None:
+    while time.perf_counter() < deadline:
+        pass
+
+
+def sleep_until(deadline: float) -> None:
+    remaining = deadline - time.perf_counter()
+    if remaining > SPIN_WINDOW:
+        time.sleep(remaining - SPIN_WINDOW)
+    spin_until(deadline)
+
+
+# [deadline, seq, generation, clicker]; a list so the entry popped for a click
+# is updated and pushed back instead of allocating a new one per click
+_Entry = List[Any]
+
+
+# One thread serves every AutoClicker from a deadline heap. While nothing is
+# active it blocks on the condition with no timeout (zero wakeups), and
+# start()/stop() notify it directly. Injections run serially on this thread,
+# so left and right clicks never collide.
+#
+# quiet_gc (low-jitter mode) disables the cyclic GC from the moment a clicker
+# is queued until the queue drains again, so collections triggered by other
+# threads' garbage can't land between two clicks; garbage cycles are then
+# collected once clicking stops.
+class ClickScheduler:
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._queue: List[_Entry] = []
+        self._seq = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._setup: Optional[Callable[[], Any]] = None
+        # Return value of the last setup callable, run on the scheduler thread
+        self.setup_result: Any = None
+        self.quiet_gc = False
+        self._gc_paused = False
+        self.wakeups = 0
+
+    def set_thread_setup(self, setup: Callable[[], Any]) -> None:
+        # Runs `setup` on the scheduler thread before its next wait, e.g. to
+        # change its priority; it is not re-run unless set again.
+        with self._cond:
+            self._setup = setup
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="baseclick-scheduler", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def activate(self, clicker: "AutoClicker", generation: int) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            heapq.heappush(self._queue, [time.perf_counter(), next(self._seq), generation, clicker])
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="baseclick-scheduler", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def deactivate(self, clicker: "AutoClicker") -> None:
+        with self._cond:
+            self._cond.notify()
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._queue.clear()
+            self._cond.notify()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+
+    def set_quiet_gc(self, enabled: bool) -> None:
+        # The first enable collects and freezes what's alive so far (config,
+        # Qt wrappers, listeners), so the collection after each run only has
+        # to scan objects made since
+        if enabled and not self.quiet_gc:
+            gc.collect()
+            gc.freeze()
+        with self._cond:
+            self.quiet_gc = enabled
+            self._cond.notify()
+
+    def _pause_gc(self, paused: bool) -> None:
+        # Only re-enables what we disabled ourselves
+        if paused:
+            if gc.isenabled():
+                gc.disable()
+                self._gc_paused = True
+        elif self._gc_paused:
+            gc.enable()
+            self._gc_paused = False
+
+    def _run(self) -> None:
+        cond = self._cond
+        queue = self._queue
+        while True:
+            with cond:
+                while True:
+                    if self._closed:
+                        self._pause_gc(False)
+                        return
+                    if self._setup is not None:
+                        setup, self._setup = self._setup, None
+                        try:
+                            self.setup_result = setup()
+                        except Exception as e:
+                            self.setup_result = e
+                    while queue and not queue[0][3]._is_current(queue[0][2]):
+                        heapq.heappop(queue)
+                    if not queue:
+                        if self._gc_paused:
+                            self._pause_gc(False)
+                        cond.wait()
+                        self.wakeups += 1
+                        continue
+                    if self.quiet_gc != self._gc_paused:
+                        self._pause_gc(self.quiet_gc)
+                    remaining = queue[0][0] - time.perf_counter()
+                    if remaining > SPIN_WINDOW:
+                        cond.wait(remaining - SPIN_WINDOW)
+                        self.wakeups += 1
+                        continue
+                    entry = heapq.heappop(queue)
+                    deadline, _, generation, clicker = entry
+                    break
+
+            spin_until(deadline)
+            if not clicker._is_current(generation):
+                continue
+            try:
+                next_deadline = clicker._fire(deadline)
+            except Exception:
+                clicker.stop()
+                continue
+
+            with cond:
+                if clicker._is_current(generation):
+                    entry[0] = next_deadline
+                    entry[1] = next(self._seq)
+                    heapq.heappush(queue, entry)
+
+
+_default_scheduler: Optional[ClickScheduler] = None
+_default_lock = threading.Lock()
+
+
+def default_scheduler() -> ClickScheduler:
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = ClickScheduler()
+        return _default_scheduler
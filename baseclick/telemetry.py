@@ -0,0 +1,115 @@
+import threading
+import time
+from array import array
+from typing import Dict, List, Sequence
+
+# Trigger events older than this when a clicker starts are not counted as
+# the cause of its first click.
+TRIGGER_WINDOW = 0.5
+
+
+class RingBuffer:
+    # Preallocated single-writer ring. append() is two stores and an
+    # increment with no lock; readers take a snapshot copy.
+    __slots__ = ("_data", "_mask", "count")
+
+    def __init__(self, capacity: int = 4096) -> None:
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self._data = array("d", bytes(8 * size))
+        self._mask = size - 1
+        self.count = 0
+
+    def append(self, value: float) -> None:
+        n = self.count
+        self._data[n & self._mask] = value
+        self.count = n + 1
+
+    def snapshot(self) -> List[float]:
+        n = self.count
+        size = self._mask + 1
+        if n <= size:
+            return self._data[:n].tolist()
+        start = n & self._mask
+        return (self._data[start:] + self._data[:start]).tolist()
+
+    def clear(self) -> None:
+        self.count = 0
+
+
+def percentiles(values: Sequence[float], qs: Sequence[float] = (50, 90, 99)) -> Dict[str, float]:
+    out: Dict[str, float] = {"count": float(len(values))}
+    if not values:
+        for q in qs:
+            out[f"p{q:g}"] = 0.0
+        out["max"] = 0.0
+        return out
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    for q in qs:
+        out[f"p{q:g}"] = ordered[min(last, int(round(q / 100.0 * last)))]
+    out["max"] = ordered[-1]
+    return out
+
+
+class Telemetry:
+    # Always-on counters written from the AutoClicker and TriggerManager hot
+    # paths. Values are seconds. Rings are single-writer except
+    # trigger_events, which both hook threads append to under _trigger_lock.
+
+    def __init__(self, capacity: int = 4096) -> None:
+        self.intervals = RingBuffer(capacity)          # time between consecutive clicks
+        self.interval_errors = RingBuffer(capacity)    # click time minus its deadline
+        self.click_times = RingBuffer(capacity)        # click timestamps, all clickers
+        self.trigger_latency = RingBuffer(capacity)    # trigger event to first click
+        self.trigger_events = RingBuffer(capacity)     # trigger event timestamps
+        self.clicks = 0
+        # token -> time of its last press edge; clickers started by that
+        # token measure trigger latency from it
+        self.pressed_at: Dict[str, float] = {}
+        self._trigger_lock = threading.Lock()
+
+    def trigger(self, token: str, pressed: bool) -> float:
+        # Called from the mouse and key hook threads for every edge; only
+        # presses start clickers, so releases aren't recorded. Returns the
+        # edge's timestamp.
+        now = time.perf_counter()
+        if pressed:
+            self.pressed_at[token] = now
+            with self._trigger_lock:
+                self.trigger_events.append(now)
+        return now
+
+    def click(self, now: float, deadline: float, previous: float) -> None:
+        self.clicks += 1
+        self.click_times.append(now)
+        self.interval_errors.append(now - deadline)
+        if previous:
+            self.intervals.append(now - previous)
+
+    def first_click(self, now: float, started: float) -> None:
+        self.trigger_latency.append(now - started)
+
+    def achieved_cps(self, window: float = 1.0) -> float:
+        # Clicks per second over the last `window` seconds, all clickers combined
+        since = time.perf_counter() - window
+        return sum(1 for t in self.click_times.snapshot() if t >= since) / window
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "clicks": self.clicks,
+            "cps": self.achieved_cps(),
+            "interval": percentiles(self.intervals.snapshot()),
+            "interval_error": percentiles([abs(v) for v in self.interval_errors.snapshot()]),
+            "trigger_latency": percentiles(self.trigger_latency.snapshot()),
+        }
+
+    def reset(self) -> None:
+        for ring in (self.intervals, self.interval_errors, self.click_times, self.trigger_latency, self.trigger_events):
+            ring.clear()
+        self.clicks = 0
+        self.pressed_at.clear()
+
+
+telemetry = Telemetry()
@@ -0,0 +1,228 @@
+import functools
+import math
+import random
+from array import array
+from typing import Dict, Literal, Tuple
+
+from baseclick.learned import LEARNED_PREFIX, load_profile
+
+Distribution = Literal["uniform", "gaussian", "lognormal", "gamma"]
+DISTRIBUTIONS = ("uniform", "gaussian", "lognormal", "gamma")
+BLOCK_SIZE = 1024
+
+
+def interval_factors(distribution: str, jitter: float, n: int, rng: random.Random = random) -> array:
+    return fill_factors(array("d", bytes(8 * n)), distribution, jitter, rng)
+
+
+@functools.lru_cache(maxsize=32)
+def _gauss_params(jitter: float) -> Tuple[float, float]:
+    # (sigma, half width) of a normal truncated symmetrically around 1 with
+    # the uniform's std. Tails sit at 3 sigma, pulled in to keep factors
+    # above 0.05; truncation narrows the spread, so sigma is solved for.
+    cv = jitter / math.sqrt(3)
+    half = min(3 * cv, 0.95)
+
+    def std(sigma: float) -> float:
+        a = half / sigma
+        cut = 2 * a * math.exp(-0.5 * a * a) / math.sqrt(2 * math.pi) / math.erf(a / math.sqrt(2))
+        return sigma * math.sqrt(1 - cut)
+
+    lo, hi = cv, 100 * cv
+    if std(hi) < cv:
+        return hi, half  # jitter >= 0.95: as wide as the bounds allow
+    for _ in range(60):
+        mid = (lo + hi) / 2
+        if std(mid) < cv:
+            lo = mid
+        else:
+            hi = mid
+    return hi, half
+
+
+def fill_factors(out: array, distribution: str, jitter: float, rng: random.Random = random) -> array:
+    # Multipliers of the base interval, all with mean ~1. jitter_ratio keeps
+    # its meaning of "uniform +/- jitter"; the other distributions match the
+    # uniform's coefficient of variation (jitter / sqrt(3)). Writes in place,
+    # so refilling a block allocates nothing but transient floats.
+    n = len(out)
+    if jitter <= 0:
+        for i in range(n):
+            out[i] = 1.0
+        return out
+    if distribution == "gaussian":
+        sigma, half = _gauss_params(jitter)
+        low, high = 1 - half, 1 + half
+        gauss = rng.gauss
+        i = 0
+        while i < n:
+            v = gauss(1.0, sigma)
+            if low <= v <= high:
+                out[i] = v
+                i += 1
+        return out
+    cv = jitter / math.sqrt(3)
+    if distribution == "lognormal":
+        sigma = math.sqrt(math.log1p(cv * cv))
+        mu = -0.5 * sigma * sigma
+        lognorm = rng.lognormvariate
+        for i in range(n):
+            out[i] = lognorm(mu, sigma)
+        return out
+    if distribution == "gamma":
+        shape = 1.0 / (cv * cv)
+        gamma = rng.gammavariate
+        scale = 1.0 / shape
+        for i in range(n):
+            out[i] = gamma(shape, scale)
+        return out
+    low = max(0.0, 1 - jitter)
+    span = 1 + jitter - low
+    rand = rng.random
+    for i in range(n):
+        out[i] = low + span * rand()
+    return out
+
+
+class IntervalBuffer:
+    # Double-buffered blocks of precomputed factors. next() is an array index;
+    # when the front block runs out it swaps in the back block and refill()
+    # regenerates the spent one after the click, off the injection path.
+    # Reconfiguring means building a new buffer and swapping the reference.
+    # "learned:<name>" draws from a recorded profile (baseclick.learned),
+    # falling back to uniform while that profile can't be loaded.
+
+    def __init__(self, distribution: str = "uniform", jitter: float = 0.25, block_size: int = BLOCK_SIZE) -> None:
+        self._profile = None
+        if distribution.startswith(LEARNED_PREFIX):
+            self._profile = load_profile(distribution[len(LEARNED_PREFIX):])
+        elif distribution not in DISTRIBUTIONS:
+            distribution = "uniform"
+        self.distribution = distribution
+        self.jitter = jitter
+        self._block_size = block_size
+        self._front = array("d", bytes(8 * block_size))
+        self._back = array("d", bytes(8 * block_size))
+        self._fill(self._front)
+        self._fill(self._back)
+        self._pos = 0
+        self._stale = False
+
+    def next(self) -> float:
+        pos = self._pos
+        if pos >= self._block_size:
+            self._front, self._back = self._back, self._front
+            self._stale = True
+            pos = 0
+        self._pos = pos + 1
+        return self._front[pos]
+
+    def _fill(self, block: array) -> None:
+        if self._profile is not None:
+            self._profile.fill(block)
+        else:
+            fill_factors(block, self.distribution, self.jitter)
+
+    def refill(self) -> None:
+        if self._stale:
+            self._fill(self._back)
+            self._stale = False
+
+
+class RateController:
+    # Closed loop for open-ended clicking. `cost` tracks how long an injection
+    # takes (seeded from the backend's calibration) and clicks are issued that
+    # much early so they land on their deadline. The rate is judged over a
+    # window of WINDOW clicks: the time they actually took against the sum of
+    # their planned (unscaled) intervals. Deadlines are absolute, so per-click
+    # timing noise cancels out and only time really lost (skips under load,
+    # late clicks) shows up; planned intervals include jitter, so it cancels
+    # too. Each window's error is integrated into `scale`, which shortens
+    # upcoming intervals until the achieved rate matches set_rate().
+    __slots__ = (
+        "enabled", "cost", "scale", "interval", "error", "samples", "converged",
+        "_stable", "_last", "_actual", "_planned", "_count",
+    )
+
+    ALPHA = 0.05        # EWMA weight for cost
+    WINDOW = 32         # clicks per rate measurement
+    GAIN = 0.5          # integral gain on each window's relative rate error
+    MIN_SCALE = 0.5
+    MAX_SCALE = 1.5
+    TOLERANCE = 0.01    # converged once |error| stays below 1% ...
+    SETTLE = 3          # ... for this many consecutive windows
+
+    def __init__(self, cost: float = 0.0, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.cost = cost
+        self.scale = 1.0
+        self.interval = 0.0  # mean achieved interval over the last window
+        self.error = 0.0
+        self.samples = 0
+        self.converged = False
+        self._stable = 0
+        self._last = 0.0
+        self._actual = 0.0
+        self._planned = 0.0
+        self._count = 0
+
+    @property
+    def lead(self) -> float:
+        return self.cost if self.enabled else 0.0
+
+    def restart(self) -> None:
+        # Clicking resumed; the gap since the last click is not an interval
+        self._last = 0.0
+
+    def reset(self) -> None:
+        # Target changed; keep the learned cost and scale
+        self.interval = 0.0
+        self.error = 0.0
+        self.samples = 0
+        self.converged = False
+        self._stable = 0
+        self._last = 0.0
+        self._actual = 0.0
+        self._planned = 0.0
+        self._count = 0
+
+    def observe(self, issued: float, done: float, planned: float) -> None:
+        # planned: the unscaled interval (period * jitter factor) that ended
+        # with this click
+        self.cost += self.ALPHA * ((done - issued) - self.cost)
+        last = self._last
+        self._last = done
+        if not last:
+            return
+        self._actual += done - last
+        self._planned += planned
+        self._count += 1
+        self.samples += 1
+        if self._count < self.WINDOW:
+            return
+        error = self._actual / self._planned - 1.0
+        self.interval = self._actual / self._count
+        self.error = error
+        self._actual = self._planned = 0.0
+        self._count = 0
+        if self.enabled:
+            scale = self.scale - self.GAIN * error
+            self.scale = min(self.MAX_SCALE, max(self.MIN_SCALE, scale))
+        if -self.TOLERANCE < error < self.TOLERANCE:
+            self._stable += 1
+            if self._stable >= self.SETTLE:
+                self.converged = True
+        else:
+            self._stable = 0
+            self.converged = False
+
+    def stats(self, period: float) -> Dict[str, float]:
+        return {
+            "target_cps": 1.0 / period,
+            "achieved_cps": 1.0 / self.interval if self.interval > 0 else 0.0,
+            "error_pct": self.error * 100.0,
+            "scale": self.scale,
+            "cost_us": self.cost * 1e6,
+            "samples": float(self.samples),
+            "converged": float(self.converged),
+        }
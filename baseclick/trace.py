@@ -0,0 +1,289 @@
+import argparse
+import itertools
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from baseclick.telemetry import TRIGGER_WINDOW, percentiles
+
+# Optional per-event trace: fixed-size records in a memory-mapped ring file,
+# for post-hoc timing analysis (python -m baseclick.trace FILE).
+#
+# File layout: one HEADER_SIZE page, then `capacity` records.
+#   header: magic, version, record size, capacity (power of two), slots
+#           used (u64, updated on flush/close), then a u32 length and a
+#           JSON names table {"tokens": [...], "clickers": {id: label}}
+#   record: t f64 (perf_counter), kind u8, flag u8, ident u16, aux u32,
+#           scheduled f64
+# Slots are claimed with a shared counter, so writers on different threads
+# never share one; a wrapped ring keeps the newest `capacity` records.
+MAGIC = b"BCTRACE\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIQ")
+NAMES_LEN = struct.Struct("<I")
+HEADER_SIZE = 4096
+RECORD = struct.Struct("<dBBHId")
+
+EDGE = 1    # flag: pressed, ident: token id
+START = 2   # ident: clicker id, aux: generation
+STOP = 3    # ident: clicker id, aux: generation
+CLICK = 4   # ident: clicker id, aux: click number in the run, t: completed, scheduled: deadline
+KIND_NAMES = {EDGE: "edge", START: "start", STOP: "stop", CLICK: "click"}
+
+
+class Tracer:
+    def __init__(self, path: str, capacity: int = 1 << 16) -> None:
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError("trace capacity must be a power of two")
+        self.path = path
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self._pack = RECORD.pack_into
+        size = HEADER_SIZE + capacity * RECORD.size
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self._slots = itertools.count()
+        self._tokens: Dict[str, int] = {}
+        self._clickers: Dict[int, str] = {}
+        self._names_lock = threading.Lock()
+        self._write_header(0)
+        self._write_names()
+
+    def _write_header(self, written: int) -> None:
+        HEADER.pack_into(self._map, 0, MAGIC, VERSION, RECORD.size, self.capacity, written)
+
+    def _write_names(self) -> None:
+        data = json.dumps({"tokens": list(self._tokens), "clickers": self._clickers}).encode()
+        limit = HEADER_SIZE - HEADER.size - NAMES_LEN.size
+        if len(data) > limit:
+            return  # keep the last table that fit; ids stay valid
+        NAMES_LEN.pack_into(self._map, HEADER.size, len(data))
+        self._map[HEADER.size + NAMES_LEN.size:HEADER.size + NAMES_LEN.size + len(data)] = data
+
+    def _record(self, t: float, kind: int, flag: int, ident: int, aux: int, scheduled: float) -> None:
+        offset = HEADER_SIZE + (next(self._slots) & self._mask) * RECORD.size
+        try:
+            RECORD.pack_into(self._map, offset, t, kind, flag, ident, aux & 0xFFFFFFFF, scheduled)
+        except ValueError:
+            pass  # closed by stop() while this event was in flight
+
+    def token_id(self, token: str) -> int:
+        ident = self._tokens.get(token)
+        if ident is None:
+            with self._names_lock:
+                ident = self._tokens.setdefault(token, len(self._tokens))
+                self._write_names()
+        return ident
+
+    def name_clicker(self, ident: int, label: str) -> None:
+        if ident not in self._clickers:
+            with self._names_lock:
+                self._clickers[ident] = label
+                self._write_names()
+
+    def edge(self, t: float, token: str, pressed: bool) -> None:
+        self._record(t, EDGE, pressed, self.token_id(token) & 0xFFFF, 0, 0.0)
+
+    def start(self, t: float, clicker: int, generation: int) -> None:
+        self._record(t, START, 0, clicker & 0xFFFF, generation, 0.0)
+
+    def stop(self, t: float, clicker: int, generation: int) -> None:
+        self._record(t, STOP, 0, clicker & 0xFFFF, generation, 0.0)
+
+    def click(self, t: float, clicker: int, number: int, scheduled: float) -> None:
+        # The per-click hook, so _record is inlined
+        try:
+            self._pack(self._map, HEADER_SIZE + (next(self._slots) & self._mask) * RECORD.size,
+                       t, CLICK, 0, clicker, number, scheduled)
+        except (ValueError, struct.error):
+            pass  # closed by stop(), or a run past 2**32 clicks
+
+    def flush(self) -> None:
+        # Takes a slot to learn the count and leaves it empty
+        written = next(self._slots)
+        RECORD.pack_into(self._map, HEADER_SIZE + (written & self._mask) * RECORD.size, 0.0, 0, 0, 0, 0, 0.0)
+        self._write_header(written)
+        self._map.flush()
+
+    def close(self) -> None:
+        if self._map.closed:
+            return
+        self.flush()
+        # stop() has already unpublished the tracer, but a hook that read
+        # trace.current just before may still be in pack_into, which holds
+        # an export of the map; close() raises BufferError until it's done
+        for _ in range(100):
+            try:
+                self._map.close()
+                return
+            except BufferError:
+                time.sleep(0.001)
+        # Still exported: the mapping is closed when it's garbage collected
+
+
+# The active tracer; hooks in TriggerManager and AutoClicker check this once
+# per event, so tracing costs a global lookup while it is off.
+current: Optional[Tracer] = None
+
+
+def start(path: str, capacity: int = 1 << 16) -> Tracer:
+    global current
+    stop()
+    current = Tracer(path, capacity)
+    return current
+
+
+def stop() -> None:
+    global current
+    tracer, current = current, None
+    if tracer is not None:
+        tracer.close()
+
+
+TraceRecord = Tuple[float, int, int, int, int, float]
+
+
+class TraceFile:
+    # Read side: maps the file read-only and unpacks records straight from
+    # the mapping (no copy of the file is made).
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size, capacity, written = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or size != RECORD.size:
+            self._map.close()
+            raise ValueError(f"{path}: not a BaseClick trace (v{VERSION})")
+        self.capacity = capacity
+        self.written = written
+        (length,) = NAMES_LEN.unpack_from(self._map, HEADER.size)
+        start = HEADER.size + NAMES_LEN.size
+        names = json.loads(bytes(self._map[start:start + length]) or b"{}")
+        self.tokens: List[str] = names.get("tokens", [])
+        self.clickers: Dict[int, str] = {int(k): v for k, v in names.get("clickers", {}).items()}
+
+    def records(self) -> List[TraceRecord]:
+        # Filled slots in time order (a wrapped ring is not in slot order)
+        view = memoryview(self._map)[HEADER_SIZE:HEADER_SIZE + self.capacity * RECORD.size]
+        try:
+            out = [r for r in RECORD.iter_unpack(view) if r[1]]
+        finally:
+            view.release()
+        out.sort()
+        return out
+
+    def close(self) -> None:
+        self._map.close()
+
+
+def _runs(records: List[TraceRecord]) -> Iterator[Tuple[int, List[TraceRecord]]]:
+    # Clicks grouped per clicker run: (clicker, clicks between START and STOP)
+    open_runs: Dict[int, List[TraceRecord]] = {}
+    for r in records:
+        kind, ident = r[1], r[3]
+        if kind == START:
+            if ident in open_runs:
+                yield ident, open_runs[ident]
+            open_runs[ident] = []
+        elif kind == CLICK:
+            open_runs.setdefault(ident, []).append(r)
+        elif kind == STOP and ident in open_runs:
+            yield ident, open_runs.pop(ident)
+    yield from open_runs.items()
+
+
+def analyze(trace: TraceFile) -> Dict[str, object]:
+    records = trace.records()
+    counts = {name: 0 for name in KIND_NAMES.values()}
+    for r in records:
+        name = KIND_NAMES.get(r[1])
+        if name:
+            counts[name] += 1
+
+    per_clicker: Dict[int, Dict[str, List[float]]] = {}
+    for ident, clicks in _runs(records):
+        stats = per_clicker.setdefault(ident, {"interval": [], "error": []})
+        for i, c in enumerate(clicks):
+            stats["error"].append(c[0] - c[5])
+            if i:
+                stats["interval"].append(c[0] - clicks[i - 1][0])
+
+    # Trigger latency: each START paired with the newest press edge within
+    # TRIGGER_WINDOW before it, then to that run's first click
+    to_start: List[float] = []
+    to_click: List[float] = []
+    last_press = -1.0
+    pending: Dict[int, float] = {}
+    for r in records:
+        kind = r[1]
+        if kind == EDGE and r[2]:
+            last_press = r[0]
+        elif kind == START and last_press >= 0 and 0.0 <= r[0] - last_press <= TRIGGER_WINDOW:
+            to_start.append(r[0] - last_press)
+            pending[r[3]] = last_press
+        elif kind == CLICK and r[3] in pending:
+            to_click.append(r[0] - pending.pop(r[3]))
+
+    us = 1e6
+    return {
+        "records": len(records),
+        "written": trace.written,
+        "dropped": max(0, trace.written - trace.capacity),
+        "counts": counts,
+        "clickers": {
+            trace.clickers.get(ident, str(ident)): {
+                "clicks": len(s["error"]),
+                "interval_us": percentiles([v * us for v in s["interval"]]),
+                "schedule_error_us": percentiles([v * us for v in s["error"]]),
+            }
+            for ident, s in sorted(per_clicker.items())
+        },
+        "trigger_to_start_us": percentiles([v * us for v in to_start]),
+        "trigger_to_click_us": percentiles([v * us for v in to_click]),
+    }
+
+
+def _print_report(report: Dict[str, object]) -> None:
+    def row(name: str, p: Dict[str, float]) -> str:
+        if not p.get("count"):
+            return f"  {name:<20} -"
+        return f"  {name:<20} n={int(p['count']):<7} p50={p['p50']:9.1f}  p90={p['p90']:9.1f}  p99={p['p99']:9.1f}  max={p['max']:9.1f}"
+
+    print(f"records {report['records']} (written {report['written']}, dropped {report['dropped']})")
+    print("  " + ", ".join(f"{k}={v}" for k, v in report["counts"].items()))
+    print("trigger latency (us)")
+    print(row("edge -> start", report["trigger_to_start_us"]))
+    print(row("edge -> first click", report["trigger_to_click_us"]))
+    for label, s in report["clickers"].items():
+        print(f"clicker {label}: {s['clicks']} clicks (us)")
+        print(row("interval", s["interval_us"]))
+        print(row("actual - scheduled", s["schedule_error_us"]))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m baseclick.trace", description="Summarize a BaseClick event trace")
+    parser.add_argument("path")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+    trace = TraceFile(args.path)
+    try:
+        report = analyze(trace)
+    finally:
+        trace.close()
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
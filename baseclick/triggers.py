@@ -1,134 +1,600 @@
+import queue
+import sys
 import threading
-from typing import Callable, Dict, Optional, Set
-from pynput.mouse import Listener as MouseListener, Button
+import weakref
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Set, Tuple
+from pynput.mouse import Listener as MouseListener
 from pynput import keyboard
 
+from baseclick import trace
+from baseclick.config import MODIFIER_KEYS, MOUSE_BUTTONS, join_atoms, token_atoms
+from baseclick.telemetry import telemetry
+
 TriggerCallback = Callable[[bool], None]
+# A bound token compiled for matching: (atom bit mask, slot, callback, token,
+# masks of the bound chords that strictly contain this one)
+Chord = Tuple[int, int, TriggerCallback, str, Tuple[int, ...]]
+
+# Low-level hook messages (winuser.h) used by the win32 event filters
+WM_KEYDOWN = 0x0100
+WM_KEYUP = 0x0101
+WM_SYSKEYDOWN = 0x0104
+WM_SYSKEYUP = 0x0105
+WM_MOUSE_BUTTONS = {
+    0x0201: "left", 0x0202: "left",      # WM_LBUTTONDOWN/UP
+    0x0204: "right", 0x0205: "right",    # WM_RBUTTONDOWN/UP
+    0x0207: "middle", 0x0208: "middle",  # WM_MBUTTONDOWN/UP
+}
+WM_XBUTTONDOWN = 0x020B
+WM_XBUTTONUP = 0x020C
+LLMHF_INJECTED = 0x01
+# Buttons capture_once takes on their own; left and right only count with a
+# modifier held, so clicking around the window doesn't bind them
+CAPTURE_BUTTONS = frozenset({"middle", "x1", "x2"})
+# Modifier key name as pynput reports it -> (sided atom, either-side atom);
+# the left keys report as plain ctrl/alt/shift/cmd on most platforms
+KEY_MODIFIERS: Dict[str, Tuple[str, str]] = {
+    name: (f"key:{base}_{side}", f"key:{base}")
+    for base in MODIFIER_KEYS
+    for name, side in ((base, "l"), (f"{base}_l", "l"), (f"{base}_r", "r"))
+}
+
+class TriggerTable(dict):
+    # token -> (slot, callback), compiled by TriggerManager.prepare() along
+    # with everything matching needs: the chords containing each atom, the
+    # listener kinds, and what the win32 hook filters let through (key_vks
+    # None = every key). reused counts the atom bits handed out again before
+    # it was compiled. Tables are never modified once built, so install()
+    # only swaps a reference.
+    __slots__ = ("chords", "kinds", "mouse_allow", "key_vks", "reused", "__weakref__")
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.chords: Mapping[str, Tuple[Chord, ...]] = {}
+        self.kinds: FrozenSet[str] = frozenset()
+        self.mouse_allow: FrozenSet[str] = frozenset()
+        self.key_vks: Optional[FrozenSet[int]] = frozenset()
+        self.reused = 0
+
 
 def normalize_key(k: keyboard.Key | keyboard.KeyCode) -> Optional[str]:
     if isinstance(k, keyboard.Key):
         name = str(k).split('.')[-1]
         return name.lower()
-    if isinstance(k, keyboard.KeyCode) and k.char:
-        return k.char.lower()
+    if not isinstance(k, keyboard.KeyCode) or not k.char:
+        return None
+    char = k.char
+    if char.isprintable():
+        return char.lower()
+    # With ctrl held the char is a control character (ctrl+a is '\x01');
+    # name the key from its vk (Windows VK_A is 0x41, X11 XK_a is 0x61)
+    vk = getattr(k, "vk", None)
+    if vk is not None and 0x20 < vk < 0x7f and chr(vk).isalnum():
+        return chr(vk).lower()
+    if "\x01" <= char <= "\x1a":
+        return chr(ord(char) + 0x60)
     return None
 
+
+def _reused_mask(reused: List[int], start: int, stop: int) -> int:
+    mask = 0
+    for bit in reused[start:stop]:
+        mask |= bit
+    return mask
+
+def key_vk(name: str) -> Optional[int]:
+    # Windows virtual-key code for a key token name, if it can be derived
+    key = getattr(keyboard.Key, name, None)
+    if key is not None:
+        return getattr(key.value, "vk", None)
+    if len(name) == 1 and name.isascii() and name.isalnum():
+        return ord(name.upper())
+    return None
+
+def key_vks(name: str) -> Optional[Set[int]]:
+    # Every virtual-key code an atom name can arrive as (both sides for an
+    # either-side modifier); None if it can't be derived
+    if name in MODIFIER_KEYS:
+        vks = {key_vk(n) for n in (name, f"{name}_l", f"{name}_r")}
+        vks.discard(None)
+        return vks or None
+    vk = key_vk(name)
+    return None if vk is None else {vk}
+
+MOUSE_NAMES = {"x1": "Side 1", "x2": "Side 2", "left": "Left Click", "middle": "Middle Click", "right": "Right Click"}
+
 def pretty_token(token: str) -> str:
-    if token.startswith("mouse:"):
-        t = token.split(":", 1)[1]
-        return "Side 1" if t == "x1" else ("Side 2" if t == "x2" else token)
-    if token.startswith("key:"):
-        t = token.split(":", 1)[1]
-        return t.upper()
-    return token
+    atoms = token_atoms(token)
+    if not atoms:
+        return token
+    out = []
+    for atom in atoms:
+        kind, _, t = atom.partition(":")
+        out.append(MOUSE_NAMES.get(t, atom) if kind == "mouse" else t.upper())
+    return "+".join(out)
 
 class TriggerManager:
+    # The trigger table is an immutable TriggerTable: set_trigger/clear_trigger
+    # compile a new one and swap the reference, so the listener hooks look
+    # tokens up without taking a lock. Callbacks run on a dispatch thread,
+    # so a slow callback never stalls the OS hook threads.
+    #
+    # Tokens are chords of atoms (key:ctrl, mouse:x1, ...). Every atom that
+    # matters has a bit; the hook threads keep what is held in one int each
+    # (keys and mouse, so neither needs a lock), and the table maps each
+    # atom to the chords containing it, so an event tests only those chords,
+    # each with one mask compare. A chord presses when its last atom goes
+    # down, unless a bound chord containing it is also held (ctrl+f6 beats
+    # f6), and releases when any atom comes up.
+    #
+    # Each bound token owns a slot in a pressed-state bytearray and only real
+    # press/release edges are delivered; OS autorepeat presses are counted
+    # in suppressed_repeats and dropped. Slots and atom bits are counted per
+    # live table; once every table using one is dropped it is reused. A bit
+    # freed while its atom was held is still set in the held state; only the
+    # hook threads write that, so each clears reused bits itself the first
+    # time it handles an event under a table compiled after the reuse.
+    #
+    # Listeners run only for the token kinds that are bound (or being
+    # captured). On Windows the hooks also filter natively, so moves, scrolls,
+    # unbound buttons and unbound keys never reach Python; those are counted
+    # in filtered_events.
     def __init__(self) -> None:
         self._lock = threading.Lock()
-        self._callbacks: Dict[str, TriggerCallback] = {}
+        self._callbacks = TriggerTable()
+        self._slots: Dict[str, int] = {}
+        self._pressed = bytearray(32)
+        self._bits: Dict[str, int] = {}
+        self._bit_count = 0
+        # Live tables using each token's slot / each atom's bit, and what
+        # dropped tables gave back (appended by their finalizers, reclaimed
+        # under the lock by the next compile)
+        self._slot_refs: Dict[str, int] = {}
+        self._bit_refs: Dict[str, int] = {}
+        self._free_slots: List[int] = []
+        self._free_bits: List[int] = []
+        self._released: List[Tuple[Tuple[str, ...], Tuple[str, ...]]] = []
+        self._key_held = 0
+        self._mouse_held = 0
+        # Every bit handed out again, in order (append only), and how many
+        # of them each hook thread has cleared from its held state
+        self._reused_bits: List[int] = []
+        self._key_reused = 0
+        self._mouse_reused = 0
+        # name -> (sided atom, its bit, either-side atom, its bit, both sides' bits)
+        self._modifiers: Dict[str, Tuple[str, int, str, int, int]] = {}
+        for name, (sided, either) in KEY_MODIFIERS.items():
+            base = either.partition(":")[2]
+            sides = self._bit(f"key:{base}_l") | self._bit(f"key:{base}_r")
+            self._modifiers[name] = (sided, self._bit(sided), either, self._bit(either), sides)
+        self._permanent_atoms = frozenset(self._bits)
+        self._capture_lone: Optional[str] = None
+        self.edges = 0
+        self.suppressed_repeats = 0
+        self.filtered_events = 0
+        self._listening = False
+        self._listener_lock = threading.Lock()
         self._mouse_listener: Optional[MouseListener] = None
         self._key_listener: Optional[keyboard.Listener] = None
         self._capture_cb: Optional[Callable[[str], None]] = None
         self._capture_allow: Set[str] = {"mouse", "key"}
+        self._recorder: Optional[Any] = None
+        self._mouse_moves = False
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._start_dispatcher()
 
     def set_trigger(self, token: str, callback: TriggerCallback) -> None:
         # Remove any previous token that mapped to this callback
         with self._lock:
-            for t, cb in list(self._callbacks.items()):
-                if cb is callback:
-                    self._callbacks.pop(t, None)
-            self._callbacks[token] = callback
+            triggers = {t: cb for t, (_, cb) in self._callbacks.items() if cb != callback}
+            triggers[token] = callback
+            self._callbacks = self._compile(triggers)
+        self._refresh_listeners()
+
+    def replace_triggers(self, triggers: Mapping[str, TriggerCallback]) -> None:
+        # Install a whole token -> callback table in one swap
+        self.install(self.prepare(triggers))
+
+    def prepare(self, triggers: Mapping[str, TriggerCallback]) -> TriggerTable:
+        # Compile a table for install(): slots, bits, chords and filters are
+        # all worked out here, off the switch path
+        with self._lock:
+            return self._compile(triggers)
+
+    def install(self, table: TriggerTable, keep_listeners: bool = False) -> None:
+        # keep_listeners leaves running listeners up even if the new table
+        # doesn't need them, so hot swaps never restart OS hooks.
+        with self._lock:
+            self._callbacks = table
+        self._refresh_listeners(stop_unused=not keep_listeners)
+
+    def _slot(self, token: str) -> int:
+        slot = self._slots.get(token)
+        if slot is None:
+            if self._free_slots:
+                # No live table has it, so no hook writes it any more
+                slot = self._free_slots.pop()
+                self._pressed[slot] = 0
+            else:
+                slot = len(self._slots)
+                if slot >= len(self._pressed):
+                    # Grown in place: hooks may be holding this bytearray
+                    self._pressed.extend(bytes(len(self._pressed)))
+            self._slots[token] = slot
+        return slot
+
+    def _bit(self, atom: str) -> int:
+        # An atom keeps its bit while any live table uses it, so held state
+        # survives table swaps
+        bit = self._bits.get(atom)
+        if bit is None:
+            if self._free_bits:
+                bit = self._free_bits.pop()
+                self._reused_bits.append(bit)
+            else:
+                bit = 1 << self._bit_count
+                self._bit_count += 1
+            self._bits[atom] = bit
+        return bit
+
+    def _reclaim(self) -> None:
+        # Called with self._lock held
+        released = self._released
+        while released:
+            tokens, atoms = released.pop()
+            for token in tokens:
+                refs = self._slot_refs[token] - 1
+                if refs:
+                    self._slot_refs[token] = refs
+                else:
+                    del self._slot_refs[token]
+                    self._free_slots.append(self._slots.pop(token))
+            for atom in atoms:
+                refs = self._bit_refs[atom] - 1
+                if refs:
+                    self._bit_refs[atom] = refs
+                else:
+                    del self._bit_refs[atom]
+                    self._free_bits.append(self._bits.pop(atom))
 
     def clear_trigger(self, token: str) -> None:
         with self._lock:
-            self._callbacks.pop(token, None)
+            if token in self._callbacks:
+                triggers = {t: cb for t, (_, cb) in self._callbacks.items() if t != token}
+                self._callbacks = self._compile(triggers)
+        self._refresh_listeners()
+
+    def _compile(self, triggers: Mapping[str, TriggerCallback]) -> TriggerTable:
+        # Called with self._lock held
+        self._reclaim()
+        table = TriggerTable()
+        mouse: Set[str] = set()
+        vks: Optional[Set[int]] = set()
+        masks: Dict[str, int] = {}
+        kinds: Set[str] = set()
+        atoms: Set[str] = set()
+        for token, callback in triggers.items():
+            table[token] = (self._slot(token), callback)
+            mask = 0
+            for atom in token_atoms(token):
+                atoms.add(atom)
+                mask |= self._bit(atom)
+                kind, _, name = atom.partition(":")
+                kinds.add(kind)
+                if kind == "mouse":
+                    mouse.add(name)
+                elif kind == "key" and vks is not None:
+                    atom_vks = key_vks(name)
+                    if atom_vks is None:
+                        vks = None
+                    else:
+                        vks |= atom_vks
+            if mask:
+                masks[token] = mask
+        chords: Dict[str, List[Chord]] = {}
+        for token, mask in masks.items():
+            slot, callback = table[token]
+            supersets = tuple(m for m in masks.values() if m != mask and m & mask == mask)
+            chord = (mask, slot, callback, token, supersets)
+            for atom in token_atoms(token):
+                chords.setdefault(atom, []).append(chord)
+        table.chords = {atom: tuple(group) for atom, group in chords.items()}
+        table.kinds = frozenset(kinds)
+        table.mouse_allow = frozenset(mouse)
+        table.key_vks = None if vks is None else frozenset(vks)
+        for token in table:
+            self._slot_refs[token] = self._slot_refs.get(token, 0) + 1
+        atoms -= self._permanent_atoms
+        for atom in atoms:
+            self._bit_refs[atom] = self._bit_refs.get(atom, 0) + 1
+        table.reused = len(self._reused_bits)
+        weakref.finalize(table, self._released.append, (tuple(table), tuple(atoms)))
+        return table
+
+    def set_recorder(self, recorder: Optional[Any]) -> None:
+        # recorder gets every raw event (see baseclick.macro.MacroRecorder):
+        # move(x, y), mouse(x, y, button, pressed), key(key, pressed).
+        # While one is set both listeners run unfiltered, with move events.
+        self._recorder = recorder
+        self._refresh_listeners()
+
+    def _wanted_listeners(self) -> Tuple[bool, bool]:
+        if self._recorder is not None:
+            return True, True
+        kinds = self._callbacks.kinds
+        capture = self._capture_allow if self._capture_cb else ()
+        return ("mouse" in kinds or "mouse" in capture, "key" in kinds or "key" in capture)
+
+    def _refresh_listeners(self, stop_unused: bool = True) -> None:
+        with self._listener_lock:
+            if not self._listening:
+                return
+            want_mouse, want_key = self._wanted_listeners()
+            want_moves = self._recorder is not None
+            if self._mouse_listener and want_moves != self._mouse_moves:
+                self._mouse_listener.stop()
+                self._mouse_listener = None
+            if want_mouse and not self._mouse_listener:
+                kwargs = {"win32_event_filter": self._mouse_filter} if sys.platform == "win32" else {}
+                if want_moves:
+                    kwargs["on_move"] = self._on_mouse_move
+                self._mouse_listener = MouseListener(on_click=self._on_mouse_click, **kwargs)
+                self._mouse_listener.start()
+                self._mouse_moves = want_moves
+            elif not want_mouse and self._mouse_listener and stop_unused:
+                self._mouse_listener.stop()
+                self._mouse_listener = None
+            if want_key and not self._key_listener:
+                kwargs = {"win32_event_filter": self._key_filter} if sys.platform == "win32" else {}
+                self._key_listener = keyboard.Listener(
+                    on_press=self._on_key_press, on_release=self._on_key_release, **kwargs
+                )
+                self._key_listener.start()
+            elif not want_key and self._key_listener and stop_unused:
+                self._key_listener.stop()
+                self._key_listener = None
+
+    def _mouse_filter(self, msg, data) -> bool:
+        # Runs inside the low-level mouse hook; returning False keeps the event
+        # away from pynput's callbacks (it still reaches other applications).
+        if msg == WM_XBUTTONDOWN or msg == WM_XBUTTONUP:
+            name = "x1" if (data.mouseData >> 16) == 1 else "x2"
+        else:
+            name = WM_MOUSE_BUTTONS.get(msg)
+            # Our own clicks would otherwise press and release
+            # mouse:left/right/middle chords
+            if name is not None and data.flags & LLMHF_INJECTED and self._recorder is None:
+                name = None
+        if self._recorder is not None or (name is not None and (
+            name in self._callbacks.mouse_allow or (self._capture_cb and "mouse" in self._capture_allow)
+        )):
+            return True
+        self.filtered_events += 1
+        return False
+
+    def _key_filter(self, msg, data) -> bool:
+        vks = self._callbacks.key_vks
+        if (vks is None or self._recorder is not None or data.vkCode in vks
+                or (self._capture_cb and "key" in self._capture_allow)):
+            return True
+        self.filtered_events += 1
+        return False
 
     def start(self) -> None:
-        if self._mouse_listener or self._key_listener:
+        self._start_dispatcher()
+        self._listening = True
+        self._refresh_listeners()
+
+    def _start_dispatcher(self) -> None:
+        if self._dispatcher and self._dispatcher.is_alive():
             return
-        self._mouse_listener = MouseListener(on_click=self._on_mouse_click)
-        self._mouse_listener.start()
-        self._key_listener = keyboard.Listener(on_press=self._on_key_press, on_release=self._on_key_release)
-        self._key_listener.start()
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="baseclick-triggers", daemon=True)
+        self._dispatcher.start()
+
+    def _dispatch_loop(self) -> None:
+        get = self._queue.get
+        while True:
+            item = get()
+            if item is None:
+                return
+            fn, arg = item
+            try:
+                fn(arg)
+            except Exception:
+                pass
+
+    def drain(self, timeout: float = 1.0) -> bool:
+        # Wait until every callback queued so far has run
+        done = threading.Event()
+        self._queue.put((lambda _: done.set(), None))
+        return done.wait(timeout)
 
     def _maybe_capture(self, token: str) -> bool:
         cb = None
         with self._lock:
             cb = self._capture_cb
-            if cb:
-                self._capture_cb = None
+            self._capture_cb = None
         if cb:
-            try:
-                cb(token)
-            except Exception:
-                pass
+            self._queue.put((cb, token))
+            # Listeners can't be stopped from their own hook thread
+            self._queue.put((lambda _: self._refresh_listeners(), None))
             return True
         return False
 
-    def _on_mouse_click(self, x, y, button, pressed):
-        if button not in (Button.x1, Button.x2):
+    def _held_modifiers(self) -> List[str]:
+        held = self._key_held
+        return [f"key:{base}" for base in MODIFIER_KEYS if held & self._bits[f"key:{base}"]]
+
+    def _held(self, table: TriggerTable) -> int:
+        # Both held states, less reused bits a hook thread hasn't cleared
+        # yet for this table. Each cursor is read before its state: a hook
+        # writes the state first.
+        reused = table.reused
+        key_from = self._key_reused
+        key = self._key_held
+        mouse_from = self._mouse_reused
+        mouse = self._mouse_held
+        if key_from < reused:
+            key &= ~_reused_mask(self._reused_bits, key_from, reused)
+        if mouse_from < reused:
+            mouse &= ~_reused_mask(self._reused_bits, mouse_from, reused)
+        return key | mouse
+
+    def _match(self, table: TriggerTable, atom: str, pressed: bool) -> None:
+        # Edges for the chords containing an atom that just changed
+        chords = table.chords.get(atom)
+        if not chords:
             return
-        token = f"mouse:{'x1' if button == Button.x1 else 'x2'}"
+        held = self._held(table)
+        state = self._pressed
+        for mask, slot, callback, token, supersets in chords:
+            if pressed:
+                if held & mask != mask or state[slot]:
+                    continue
+                shadowed = False
+                for m in supersets:
+                    if held & m == m:
+                        shadowed = True
+                        break
+                if shadowed:
+                    continue
+            elif not state[slot]:
+                continue
+            state[slot] = pressed
+            self.edges += 1
+            now = telemetry.trigger(token, pressed)
+            tracer = trace.current
+            if tracer is not None:
+                tracer.edge(now, token, pressed)
+            self._queue.put((callback, pressed))
+
+    def _on_mouse_move(self, x, y):
+        recorder = self._recorder
+        if recorder is not None:
+            recorder.move(x, y)
+
+    def _on_mouse_click(self, x, y, button, pressed):
+        recorder = self._recorder
+        if recorder is not None:
+            recorder.mouse(x, y, button, pressed)
+        table = self._callbacks
+        atom = f"mouse:{button.name}"
+        bit = self._bits.get(atom, 0)
+        held = self._mouse_held
+        reused = self._mouse_reused
+        if reused < table.reused:
+            held &= ~_reused_mask(self._reused_bits, reused, table.reused)
+        repeat = bool(held & bit) == pressed
+        if bit and not repeat:
+            held ^= bit
+        if held != self._mouse_held:
+            self._mouse_held = held
+        if reused < table.reused:
+            self._mouse_reused = table.reused
 
         # Capture mode takes precedence
-        with self._lock:
-            if self._capture_cb and 'mouse' in self._capture_allow and pressed:
-                pass
-            else:
-                callback = self._callbacks.get(token)
-                if callback is None:
-                    return
-                try:
-                    callback(pressed)
-                except Exception:
-                    return
+        if self._capture_cb and 'mouse' in self._capture_allow and pressed:
+            modifiers = self._held_modifiers()
+            if button.name in CAPTURE_BUTTONS or (modifiers and button.name in MOUSE_BUTTONS):
+                self._maybe_capture(join_atoms(modifiers + [atom]))
+            return
+        if atom not in table.chords:
+            self.filtered_events += 1
+            return
+        if repeat:
+            self.suppressed_repeats += 1
+            return
+        self._match(table, atom, pressed)
 
-        if pressed and 'mouse' in self._capture_allow:
-            self._maybe_capture(token)
+    def _on_key(self, code: str, pressed: bool) -> None:
+        table = self._callbacks
+        modifier = self._modifiers.get(code)
+        if modifier is None:
+            atom = f"key:{code}"
+            bit = self._bits.get(atom, 0)
+            either = None
+        else:
+            atom, bit, either, either_bit, sides = modifier
+        held = before = self._key_held
+        reused = self._key_reused
+        if reused < table.reused:
+            held &= ~_reused_mask(self._reused_bits, reused, table.reused)
+        repeat = bool(held & bit) == pressed
+        if bit and not repeat:
+            held ^= bit
+            if either is not None:
+                # Either-side atom: held while any side is
+                if held & sides:
+                    held |= either_bit
+                else:
+                    held &= ~either_bit
+                if held & either_bit == before & either_bit:
+                    either = None  # other side still down (or already was)
+        if held != before:
+            self._key_held = held
+        if reused < table.reused:
+            self._key_reused = table.reused
+
+        if self._capture_cb and 'key' in self._capture_allow:
+            # A modifier captures alone only if released with nothing else
+            # pressed; any other key captures with the modifiers held.
+            # Releases still go on to matching, so a chord held when the
+            # capture began is released.
+            if modifier is None:
+                if pressed:
+                    self._capture_lone = None
+                    self._maybe_capture(join_atoms(self._held_modifiers() + [atom]))
+            elif pressed:
+                self._capture_lone = modifier[2]
+            elif self._capture_lone == modifier[2]:
+                self._capture_lone = None
+                self._maybe_capture(modifier[2])
+            if pressed:
+                return
+        if repeat:
+            if atom in table.chords:
+                self.suppressed_repeats += 1
+            return
+        self._match(table, atom, pressed)
+        if either is not None:
+            self._match(table, either, pressed)
 
     def _on_key_press(self, key):
+        recorder = self._recorder
+        if recorder is not None:
+            recorder.key(key, True)
         code = normalize_key(key)
-        if not code:
-            return
-        token = f"key:{code}"
-        with self._lock:
-            if self._capture_cb and 'key' in self._capture_allow:
-                pass
-            else:
-                callback = self._callbacks.get(token)
-                if callback is None:
-                    return
-                try:
-                    callback(True)
-                except Exception:
-                    return
-        if 'key' in self._capture_allow:
-            self._maybe_capture(token)
+        if code:
+            self._on_key(code, True)
 
     def _on_key_release(self, key):
+        recorder = self._recorder
+        if recorder is not None:
+            recorder.key(key, False)
         code = normalize_key(key)
-        if not code:
-            return
-        token = f"key:{code}"
-        with self._lock:
-            callback = self._callbacks.get(token)
-        if callback is None:
-            return
-        try:
-            callback(False)
-        except Exception:
-            return
+        if code:
+            self._on_key(code, False)
 
     def capture_once(self, on_captured: Callable[[str], None], allow: Set[str] | None = None) -> None:
         # allow: {"mouse", "key"}
         with self._lock:
-            self._capture_cb = on_captured
             self._capture_allow = allow or {"mouse", "key"}
+            self._capture_cb = on_captured
+            self._capture_lone = None
+        self._refresh_listeners()
 
     def stop(self) -> None:
-        if self._mouse_listener:
-            self._mouse_listener.stop()
-            self._mouse_listener = None
-        if self._key_listener:
-            self._key_listener.stop()
-            self._key_listener = None
+        with self._listener_lock:
+            self._listening = False
+            if self._mouse_listener:
+                self._mouse_listener.stop()
+                self._mouse_listener = None
+            if self._key_listener:
+                self._key_listener.stop()
+                self._key_listener = None
+        if self._dispatcher and self._dispatcher.is_alive():
+            self._queue.put(None)
+            if self._dispatcher is not threading.current_thread():
+                self._dispatcher.join(timeout=1.0)
+        self._dispatcher = None
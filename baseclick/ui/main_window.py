@@ -1,22 +1,32 @@
-from PySide6.QtCore import Qt, Signal
+from dataclasses import replace
+from typing import Callable, Dict, Optional
+from PySide6.QtCore import Qt, QTimer, Signal
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QLabel, QVBoxLayout, QHBoxLayout, QGroupBox,
     QComboBox, QSlider, QPushButton, QCheckBox
 )
-from baseclick.config import AppConfig, save_config
+from baseclick.config import AppConfig
 from baseclick.triggers import pretty_token
 
+STATS_REFRESH_MS = 500
+
+# Bounded modes use the window bindings' count/duration/burst_cps defaults
 MODE_OPTIONS = [
     ("Hold", "hold"),
     ("Toggle", "toggle"),
+    ("Burst", "burst"),
+    ("Count", "count"),
+    ("Duration", "duration"),
 ]
 
 class MainWindow(QMainWindow):
     settings_changed = Signal(AppConfig)
     request_bind = Signal(str)  # "left" or "right"
     bound_token_captured = Signal(str, str)  # side, token
+    config_reloaded = Signal(AppConfig)  # config.json edited on disk
+    save_requested = Signal(AppConfig)  # Save Settings; the controller writes it
 
-    def __init__(self, cfg: AppConfig):
+    def __init__(self, cfg: AppConfig, stats: Optional[Callable[[], Dict]] = None):
         super().__init__()
         self.setWindowTitle("BaseClick")
         self.setMinimumSize(520, 380)
@@ -41,6 +51,16 @@ class MainWindow(QMainWindow):
 
         layout.addStretch(1)
 
+        self._stats = stats
+        if stats is not None:
+            self.stats_label = QLabel("")
+            self.stats_label.setObjectName("statsLabel")
+            layout.addWidget(self.stats_label)
+            self._stats_timer = QTimer(self)
+            self._stats_timer.setInterval(STATS_REFRESH_MS)
+            self._stats_timer.timeout.connect(self._refresh_stats)
+            self._stats_timer.start()
+
         save_btn = QPushButton("Save Settings")
         save_btn.setObjectName("primaryButton")
         save_btn.clicked.connect(self._on_save)
@@ -49,6 +69,7 @@ class MainWindow(QMainWindow):
         self._apply_cfg(self._cfg)
         # Route cross-thread capture updates to UI thread
         self.bound_token_captured.connect(self.set_bound_token)
+        self.config_reloaded.connect(self.reload_cfg)
 
     def _style(self) -> str:
         accent = "#3DAEE9"
@@ -96,6 +117,9 @@ class MainWindow(QMainWindow):
             QSlider::handle:horizontal {{ background: {accent}; width: 14px; height: 14px; border-radius: 7px; margin: -6px 0; }}
             QSlider::handle:horizontal:hover {{ background: {hover}; }}
 
+            /* Stats readout */
+            QLabel#statsLabel {{ color: #7f8a94; font-family: Consolas, monospace; font-size: 11px; }}
+
             /* Checkboxes */
             QCheckBox {{ color: #bfbfbf; }}
             QCheckBox::indicator {{ width: 18px; height: 18px; border: 1px solid #2f2f2f; background: #141619; border-radius: 3px; }}
@@ -191,6 +215,27 @@ class MainWindow(QMainWindow):
         return g
 
     def _apply_cfg(self, cfg: AppConfig) -> None:
+        self._show_cfg(cfg)
+
+        # Wire value changes
+        self.mode_combo.currentIndexChanged.connect(self._emit_settings)
+        self.cps_slider.valueChanged.connect(self._on_cps_changed)
+        self.jitter_slider.valueChanged.connect(self._on_jitter_changed)
+        self.master_enable.stateChanged.connect(self._emit_settings)
+
+    def reload_cfg(self, cfg: AppConfig) -> None:
+        # Show an already-applied config without emitting it back
+        self._cfg = cfg
+        widgets = (self.mode_combo, self.cps_slider, self.jitter_slider)
+        for w in widgets:
+            w.blockSignals(True)
+        try:
+            self._show_cfg(cfg)
+        finally:
+            for w in widgets:
+                w.blockSignals(False)
+
+    def _show_cfg(self, cfg: AppConfig) -> None:
         # Mode
         idx = self.mode_combo.findData(cfg.mode)
         if idx >= 0:
@@ -204,17 +249,13 @@ class MainWindow(QMainWindow):
         self._set_left_token(cfg.left_trigger)
         self._set_right_token(cfg.right_trigger)
 
-        # Wire value changes
-        self.mode_combo.currentIndexChanged.connect(self._emit_settings)
-        self.cps_slider.valueChanged.connect(self._on_cps_changed)
-        self.jitter_slider.valueChanged.connect(self._on_jitter_changed)
-        self.master_enable.stateChanged.connect(self._emit_settings)
-
     def _collect_cfg(self) -> AppConfig:
-        return AppConfig(
+        # Keep fields the window doesn't edit (backend, distribution, ...)
+        return replace(
+            self._cfg,
             cps=self.cps_slider.value(),
             jitter_ratio=self.jitter_slider.value() / 100.0,
-            mode=self.mode_combo.currentData(),
+            mode=self.mode_combo.currentData() or self._cfg.mode,
             left_trigger=self.left_token,
             right_trigger=self.right_token,
         )
@@ -235,21 +276,32 @@ class MainWindow(QMainWindow):
         self._emit_settings()
     def _emit_settings(self):
         cfg = self._collect_cfg()
+        self._cfg = cfg
         self.settings_changed.emit(cfg)
 
     def _on_save(self):
         cfg = self._collect_cfg()
-        save_config(cfg)
+        self._cfg = cfg
+        self.save_requested.emit(cfg)
+
+    def _refresh_stats(self):
+        s = self._stats()
+        err = s["interval_error"]
+        lat = s["trigger_latency"]
+        self.stats_label.setText(
+            f"{s['cps']:.1f} cps  |  error p50 {err['p50'] * 1e3:.2f} / p99 {err['p99'] * 1e3:.2f}"
+            f" / max {err['max'] * 1e3:.2f} ms  |  trigger p99 {lat['p99'] * 1e3:.2f} ms"
+        )
 
     # Binding utilities
     def _on_bind(self, side: str):
         # Let controller start capture via signal
         # Update button text to guide user
         if side == "left":
-            self.left_bind_btn.setText("Press side button or key…")
+            self.left_bind_btn.setText("Press a button, key or combo…")
             self.left_bind_btn.setEnabled(False)
         else:
-            self.right_bind_btn.setText("Press side button or key…")
+            self.right_bind_btn.setText("Press a button, key or combo…")
             self.right_bind_btn.setEnabled(False)
         self.request_bind.emit(side)
 
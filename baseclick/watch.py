@@ -0,0 +1,136 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from typing import Callable, Optional, Tuple
+
+# Watches one file for writes. With inotify (Linux) the parent directory is
+# watched, so both in-place saves (close after write) and atomic replaces
+# (rename into place, as save_config does) are seen without polling; other
+# platforms, or a failing inotify, fall back to polling mtime and size.
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+EVENT = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+POLL_INTERVAL = 0.25
+
+_libc: Optional[ctypes.CDLL] = None
+
+
+def _inotify(directory: str) -> int:
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    if fd < 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+    if _libc.inotify_add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+        err = ctypes.get_errno()
+        os.close(fd)
+        raise OSError(err, os.strerror(err))
+    return fd
+
+
+class FileWatcher:
+    # on_change() runs on the "baseclick-watch" thread, once per batch of
+    # events touching the file; it should tolerate spurious calls.
+    def __init__(
+        self,
+        path: str,
+        on_change: Callable[[], None],
+        poll_interval: float = POLL_INTERVAL,
+        inotify: bool = True,
+    ) -> None:
+        self.path = os.path.abspath(path)
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.inotify = inotify
+        self.mode = ""  # "inotify" or "poll" once started
+        self.events = 0
+        self._fd = -1
+        self._wake_r = self._wake_w = -1
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        if self.inotify and sys.platform.startswith("linux"):
+            try:
+                self._fd = _inotify(directory)
+                self._wake_r, self._wake_w = os.pipe()
+                self.mode = "inotify"
+            except (OSError, AttributeError):
+                self._fd = -1
+        if self._fd < 0:
+            self.mode = "poll"
+        self._thread = threading.Thread(target=self._run, name="baseclick-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._wake_w >= 0:
+            os.write(self._wake_w, b"\0")
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            if fd >= 0:
+                os.close(fd)
+        self._fd = self._wake_r = self._wake_w = -1
+
+    def _notify(self) -> None:
+        self.events += 1
+        try:
+            self.on_change()
+        except Exception:
+            pass  # a bad reload must not end the watcher
+
+    def _run(self) -> None:
+        if self.mode == "inotify":
+            self._run_inotify()
+        else:
+            self._run_poll()
+
+    def _run_inotify(self) -> None:
+        name = os.fsencode(os.path.basename(self.path))
+        fd, wake = self._fd, self._wake_r
+        while not self._stop.is_set():
+            ready, _, _ = select.select([fd, wake], [], [])
+            if wake in ready:
+                return
+            try:
+                data = os.read(fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            hit = False
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = EVENT.unpack_from(data, offset)
+                start = offset + EVENT.size
+                offset = start + length
+                if data[start:offset].rstrip(b"\0") == name and mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                    hit = True
+            if hit:
+                self._notify()
+
+    def _signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _run_poll(self) -> None:
+        last = self._signature()
+        while not self._stop.wait(self.poll_interval):
+            current = self._signature()
+            if current != last:
+                last = current
+                if current is not None:
+                    self._notify()
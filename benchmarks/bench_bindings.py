@@ -0,0 +1,73 @@
+import string
+import threading
+import time
+from typing import Dict, List
+
+from benchmarks.headless import install
+
+install()
+
+from pynput import keyboard  # noqa: E402
+
+from baseclick.backends import RecordingBackend  # noqa: E402
+from baseclick.bindings import BindingEngine  # noqa: E402
+from baseclick.config import AppConfig, Binding  # noqa: E402
+from baseclick.scheduler import ClickScheduler  # noqa: E402
+from baseclick.triggers import TriggerManager  # noqa: E402
+
+SIZES = (2, 12, 48)
+KEY_NAMES = [f"f{i}" for i in range(1, 13)] + list(string.ascii_lowercase + string.digits)
+
+
+def _key(name: str):
+    return getattr(keyboard.Key, name) if len(name) > 1 else keyboard.KeyCode.from_char(name)
+
+
+def measure(size: int, events: int, cps: int, duration: float) -> Dict[str, object]:
+    extra = [Binding(f"key:{name}", "left", cps, 0.0, "hold") for name in KEY_NAMES[2:size]]
+    cfg = AppConfig(cps=cps, jitter_ratio=0.0, left_trigger="key:f1", right_trigger="key:f2", bindings=extra)
+    tm = TriggerManager()
+    scheduler = ClickScheduler()
+    backend = RecordingBackend()
+    engine = BindingEngine(tm, scheduler, backend)
+    t0 = time.perf_counter()
+    engine.apply(cfg)
+    compile_us = (time.perf_counter() - t0) * 1e6
+
+    # Per-event cost: press/release cycles spread over every bound key
+    keys = [_key(name) for name in KEY_NAMES[:size]]
+    press, release = tm._on_key_press, tm._on_key_release
+    t0 = time.perf_counter()
+    for i in range(events // 2):
+        k = keys[i % len(keys)]
+        press(k)
+        release(k)
+    tm.drain(timeout=30.0)
+    per_event_ns = (time.perf_counter() - t0) / events * 1e9
+
+    # All clickers active at once on the shared scheduler
+    threads_before = threading.active_count()
+    backend.events.clear()
+    for action in engine.actions:
+        action.clicker.start()
+    time.sleep(duration)
+    engine.stop_all()
+    clicks = len(backend.events)
+    threads_during = threading.active_count()
+    scheduler.shutdown()
+    tm.stop()
+    return {
+        "bindings": size,
+        "compile_us": compile_us,
+        "dispatch_ns_per_event": per_event_ns,
+        "concurrent_clicks": clicks,
+        "expected_clicks": size * (cps * duration + 1),
+        "threads_before": threads_before,
+        "threads_active": threads_during,
+    }
+
+
+def run(quick: bool = False) -> Dict[str, List[Dict[str, object]]]:
+    events = 20_000 if quick else 100_000
+    duration = 0.5 if quick else 2.0
+    return {"scaling": [measure(size, events, cps=20, duration=duration) for size in SIZES]}
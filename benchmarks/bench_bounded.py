@@ -0,0 +1,67 @@
+import time
+from typing import Dict, List
+
+from benchmarks.headless import install
+
+install()
+
+from pynput.mouse import Button  # noqa: E402
+
+from baseclick.backends import RecordingBackend  # noqa: E402
+from baseclick.clicker import AutoClicker  # noqa: E402
+from baseclick.scheduler import ClickScheduler  # noqa: E402
+
+
+def _wait(clicker: AutoClicker, timeout: float) -> None:
+    end = time.perf_counter() + timeout
+    while clicker.is_active() and time.perf_counter() < end:
+        time.sleep(0.005)
+
+
+def count_runs(scheduler: ClickScheduler) -> List[Dict[str, object]]:
+    out = []
+    for count, cps in ((1, 50), (10, 50), (100, 200), (1000, 0), (5000, 0)):
+        backend = RecordingBackend()
+        clicker = AutoClicker(Button.left, cps=max(1, cps), jitter_ratio=0.25, scheduler=scheduler, backend=backend)
+        t0 = time.perf_counter()
+        scheduled = clicker.run_bounded(count=count, cps=cps)
+        _wait(clicker, 30.0)
+        elapsed = time.perf_counter() - t0
+        out.append({
+            "count": count,
+            "cps": cps,
+            "scheduled": scheduled,
+            "clicks": len(backend.events),
+            "exact": len(backend.events) == count,
+            "achieved_cps": count / elapsed if elapsed > 0 else 0.0,
+        })
+    return out
+
+
+def duration_runs(scheduler: ClickScheduler) -> List[Dict[str, object]]:
+    out = []
+    for duration, cps in ((0.25, 100), (1.0, 100), (1.0, 500)):
+        backend = RecordingBackend()
+        clicker = AutoClicker(Button.left, cps=cps, jitter_ratio=0.0, scheduler=scheduler, backend=backend)
+        clicker.run_bounded(duration=duration)
+        _wait(clicker, duration + 5.0)
+        stamps = [t for t, _ in backend.events]
+        # Last click offset vs the last scheduled offset (duration - 1/cps)
+        span = stamps[-1] - stamps[0]
+        out.append({
+            "duration": duration,
+            "cps": cps,
+            "clicks": len(stamps),
+            "expected_clicks": round(duration * cps),
+            "last_click_s": span,
+            "end_error_ms": (span - (duration - 1.0 / cps)) * 1e3,
+        })
+    return out
+
+
+def run(quick: bool = False) -> Dict[str, object]:
+    scheduler = ClickScheduler()
+    try:
+        return {"count": count_runs(scheduler), "duration": duration_runs(scheduler)}
+    finally:
+        scheduler.shutdown()
@@ -0,0 +1,54 @@
+import time
+from typing import Dict, List
+
+from benchmarks.headless import install
+
+install()
+
+from pynput.mouse import Button  # noqa: E402
+
+from baseclick.backends import RecordingBackend  # noqa: E402
+from baseclick.clicker import AutoClicker  # noqa: E402
+from baseclick.scheduler import ClickScheduler  # noqa: E402
+from baseclick.telemetry import Telemetry, percentiles  # noqa: E402
+
+CPS_SWEEP = (1, 10, 50, 100, 250, 500, 1000)
+JITTER_SWEEP = (0.0, 0.25)
+MIN_CLICKS = 5
+
+
+def measure(cps: int, jitter: float, duration: float) -> Dict[str, object]:
+    scheduler = ClickScheduler()
+    backend = RecordingBackend()
+    telemetry = Telemetry(capacity=1 << 16)
+    clicker = AutoClicker(
+        Button.left, cps=cps, jitter_ratio=jitter,
+        scheduler=scheduler, backend=backend, telemetry=telemetry,
+    )
+    run_for = max(duration, MIN_CLICKS / cps)
+    cpu0 = time.process_time()
+    clicker.start()
+    time.sleep(run_for)
+    clicker.stop()
+    cpu = time.process_time() - cpu0
+    scheduler.shutdown()
+
+    stamps = [t for t, _ in backend.events]
+    clicks = len(stamps)
+    span = stamps[-1] - stamps[0] if clicks > 1 else 0.0
+    errors = [abs(v) * 1e6 for v in telemetry.interval_errors.snapshot()]
+    return {
+        "cps": cps,
+        "jitter": jitter,
+        "clicks": clicks,
+        "achieved_cps": (clicks - 1) / span if span > 0 else 0.0,
+        "rate_error_pct": ((clicks - 1) / span - cps) / cps * 100 if span > 0 else 0.0,
+        "interval_error_us": percentiles(errors),
+        "cpu_us_per_click": cpu / clicks * 1e6 if clicks else 0.0,
+    }
+
+
+def run(quick: bool = False) -> Dict[str, List[Dict[str, object]]]:
+    duration = 0.5 if quick else 2.0
+    results = [measure(cps, jitter, duration) for cps in CPS_SWEEP for jitter in JITTER_SWEEP]
+    return {"sweep": results}
@@ -0,0 +1,50 @@
+import os
+import tempfile
+import time
+from dataclasses import replace
+from typing import Dict
+
+from baseclick.config import AppConfig, ConfigStore, load_config, save_config
+
+DRAG_STEPS = 200
+STEP_INTERVAL = 0.005  # ~200 valueChanged signals per second while dragging
+
+
+def drag(durable: bool) -> Dict[str, object]:
+    # Simulate dragging the CPS slider across 200 values and count how many
+    # times config.json actually gets written.
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "config.json")
+        cfg = AppConfig(durable_writes=durable)
+        store = ConfigStore(cfg, path=path)
+        update_max = 0.0
+        t0 = time.perf_counter()
+        for step in range(DRAG_STEPS):
+            cfg = replace(cfg, cps=1 + step % 100)
+            t = time.perf_counter()
+            store.update(cfg)
+            update_max = max(update_max, time.perf_counter() - t)
+            time.sleep(STEP_INTERVAL)
+        drag_time = time.perf_counter() - t0
+        writes_during_drag = store.writes
+        store.close()
+        persisted = load_config(path)
+
+        t = time.perf_counter()
+        for _ in range(DRAG_STEPS):
+            save_config(cfg, path, fsync=durable)
+        direct = (time.perf_counter() - t) / DRAG_STEPS
+
+        return {
+            "steps": DRAG_STEPS,
+            "drag_s": drag_time,
+            "writes_during_drag": writes_during_drag,
+            "writes_total": store.writes,
+            "final_value_persisted": persisted.cps == cfg.cps,
+            "update_max_us": update_max * 1e6,
+            "direct_save_us": direct * 1e6,
+        }
+
+
+def run(quick: bool = False) -> Dict[str, object]:
+    return {"buffered": drag(durable=False), "durable": drag(durable=True)}
@@ -0,0 +1,103 @@
+# Control server load test: round-trip latency, pipelined throughput and
+# many concurrent clients against a real AppController (recording backend).
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+from benchmarks.headless import install
+
+install()
+
+from baseclick.config import AppConfig  # noqa: E402
+from baseclick.control import ControlClient  # noqa: E402
+from baseclick.controller import AppController  # noqa: E402
+from baseclick.telemetry import percentiles  # noqa: E402
+
+
+def _mixed(i: int) -> Dict[str, object]:
+    kind = i % 5
+    if kind == 0:
+        return {"cmd": "set_rate", "cps": 10 + i % 20}
+    if kind == 1:
+        return {"cmd": "set_jitter", "jitter_ratio": (i % 10) / 20}
+    if kind == 2:
+        return {"cmd": "start"}
+    if kind == 3:
+        return {"cmd": "stop"}
+    return {"cmd": "ping", "id": i}
+
+
+def round_trip(path: str, n: int) -> Dict[str, float]:
+    samples: List[float] = []
+    with ControlClient(path) as client:
+        for _ in range(n):
+            t = time.perf_counter()
+            client.call("ping")
+            samples.append((time.perf_counter() - t) * 1e6)
+    return percentiles(samples)
+
+
+def pipelined(path: str, n: int, batch: int) -> Dict[str, object]:
+    with ControlClient(path) as client:
+        t = time.perf_counter()
+        ok = 0
+        for start in range(0, n, batch):
+            responses = client.pipeline([{"cmd": "ping", "id": i} for i in range(start, start + batch)])
+            ok += sum(1 for i, r in enumerate(responses, start) if r.get("ok") and r.get("id") == i)
+        elapsed = time.perf_counter() - t
+    return {"commands": n, "batch": batch, "in_order_ok": ok, "commands_per_s": n / elapsed}
+
+
+def many_clients(path: str, clients: int, per_client: int, batch: int) -> Dict[str, object]:
+    errors: List[str] = []
+    barrier = threading.Barrier(clients + 1)
+
+    def worker() -> None:
+        with ControlClient(path) as client:
+            barrier.wait()
+            for start in range(0, per_client, batch):
+                for r in client.pipeline([_mixed(i) for i in range(start, start + batch)]):
+                    if not r.get("ok"):
+                        errors.append(r.get("error", "?"))
+
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    for th in threads:
+        th.start()
+    barrier.wait()
+    t = time.perf_counter()
+    for th in threads:
+        th.join()
+    elapsed = time.perf_counter() - t
+    total = clients * per_client
+    return {
+        "clients": clients,
+        "commands": total,
+        "errors": len(errors),
+        "commands_per_s": total / elapsed,
+    }
+
+
+def run(quick: bool = False) -> Dict[str, object]:
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = os.path.join(tmp, "config.json")
+        path = os.path.join(tmp, "control.sock")
+        cfg = AppConfig(backend="recording", control_server=True, control_socket=path)
+        with open(config_path, "w", encoding="utf-8") as f:
+            f.write(cfg.to_json())
+        controller = AppController(config_path)
+        try:
+            if controller.control is None or controller.control.error:
+                return {"error": repr(controller.control.error if controller.control else None)}
+            result = {
+                "rtt_us": round_trip(path, 500 if quick else 5000),
+                "pipelined": pipelined(path, 5000 if quick else 50000, 100),
+                "many_clients": many_clients(path, 16, 250 if quick else 2500, 50),
+            }
+            with ControlClient(path) as client:
+                stats = client.call("stats")
+            result["server"] = stats["control"]
+            return result
+        finally:
+            controller.shutdown()
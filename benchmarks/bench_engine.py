@@ -0,0 +1,128 @@
+# Click timing while the "GUI" process is busy: clickers in-process vs in
+# the engine worker process. The stress thread mimics repaint/stylesheet
+# work (pure-Python loops holding the GIL) and GC over a large object graph.
+import gc
+import threading
+import time
+from typing import Dict
+
+from benchmarks.headless import install
+
+install()
+
+from baseclick.bindings import BindingEngine  # noqa: E402
+from baseclick.backends import RecordingBackend  # noqa: E402
+from baseclick.config import AppConfig  # noqa: E402
+from baseclick.engine_process import RemoteEngine, worker_main  # noqa: E402
+from baseclick.scheduler import ClickScheduler  # noqa: E402
+from baseclick.telemetry import telemetry  # noqa: E402
+from baseclick.triggers import TriggerManager  # noqa: E402
+
+TOKEN = "key:f6"
+
+
+def stub_worker(shm_name: str, doorbell) -> None:
+    # Spawned workers start a fresh interpreter, so stub pynput there too
+    install()
+    worker_main(shm_name, doorbell)
+
+
+class GuiStress:
+    def __init__(self) -> None:
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._garbage = [{"i": i, "children": [[i]] * 4} for i in range(200000)]
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            total = 0
+            for i in range(200000):  # ~10-20 ms of "repaint" under the GIL
+                total += i * i
+            gc.collect()
+            time.sleep(0.002)
+
+    def __enter__(self) -> "GuiStress":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def _ms(summary: Dict[str, object]) -> Dict[str, float]:
+    err = summary["interval_error"]
+    return {
+        "cps": summary["cps"],
+        "error_p50_ms": err["p50"] * 1e3,
+        "error_p99_ms": err["p99"] * 1e3,
+        "error_max_ms": err["max"] * 1e3,
+    }
+
+
+def in_process(cfg: AppConfig, seconds: float, stress: bool) -> Dict[str, float]:
+    scheduler = ClickScheduler()
+    triggers = TriggerManager()
+    engine = BindingEngine(triggers, scheduler, RecordingBackend())
+    engine.apply(cfg)
+    telemetry.reset()
+    try:
+        if stress:
+            with GuiStress():
+                engine.start(TOKEN)
+                time.sleep(seconds)
+        else:
+            engine.start(TOKEN)
+            time.sleep(seconds)
+        engine.stop_all()
+        return _ms(telemetry.summary())
+    finally:
+        scheduler.shutdown()
+        triggers.stop()
+
+
+def out_of_process(engine: RemoteEngine, seconds: float, stress: bool) -> Dict[str, float]:
+    engine.stop_all()
+    engine.reset_stats()
+    if stress:
+        with GuiStress():
+            engine.start(TOKEN)
+            time.sleep(seconds)
+            engine.summary()
+    else:
+        engine.start(TOKEN)
+        time.sleep(seconds)
+        engine.summary()
+    # summary() returns the previous publish; ask again for this run's
+    time.sleep(0.05)
+    result = _ms(engine.summary())
+    engine.stop_all()
+    return result
+
+
+def run(quick: bool = False) -> Dict[str, object]:
+    seconds = 1.0 if quick else 5.0
+    cfg = AppConfig(backend="recording", cps=200, jitter_ratio=0.0, left_trigger=TOKEN, right_trigger="")
+    out: Dict[str, object] = {
+        "in_process": {
+            "idle": in_process(cfg, seconds, False),
+            "gui_stressed": in_process(cfg, seconds, True),
+        },
+    }
+    t = time.perf_counter()
+    engine = RemoteEngine(cfg, target=stub_worker)
+    spawn_ms = (time.perf_counter() - t) * 1e3
+    try:
+        t = time.perf_counter()
+        for _ in range(200):
+            engine.running()
+        command_us = (time.perf_counter() - t) / 200 * 1e6
+        out["engine_process"] = {
+            "spawn_ms": spawn_ms,
+            "command_round_trip_us": command_us,
+            "idle": out_of_process(engine, seconds, False),
+            "gui_stressed": out_of_process(engine, seconds, True),
+        }
+    finally:
+        engine.close()
+    return out
@@ -0,0 +1,133 @@
+# Low-jitter mode: allocations on the click path (tracemalloc and the GC's
+# tracked-object count), GC passes while clicking (gc.callbacks) and max
+# interval error with a garbage-heavy neighbour thread, quiet_gc off vs on.
+import gc
+import threading
+import time
+import tracemalloc
+from typing import Dict, List
+
+from benchmarks.headless import install
+
+install()
+
+from pynput.mouse import Button  # noqa: E402
+
+from baseclick.backends import InjectionBackend  # noqa: E402
+from baseclick.clicker import AutoClicker  # noqa: E402
+from baseclick.scheduler import ClickScheduler  # noqa: E402
+from baseclick.telemetry import Telemetry, percentiles  # noqa: E402
+
+
+class NullBackend(InjectionBackend):
+    name = "null"
+
+    def click(self, button: Button) -> None:
+        pass
+
+
+class GcCounter:
+    def __init__(self) -> None:
+        self.passes = 0
+        self.pause_max = 0.0
+        self._t = 0.0
+
+    def __call__(self, phase: str, info: Dict[str, int]) -> None:
+        if phase == "start":
+            self._t = time.perf_counter()
+        else:
+            self.passes += 1
+            self.pause_max = max(self.pause_max, time.perf_counter() - self._t)
+
+    def __enter__(self) -> "GcCounter":
+        gc.callbacks.append(self)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        gc.callbacks.remove(self)
+
+
+def click_path_allocations(n: int) -> Dict[str, object]:
+    # Drive _fire() directly (what the scheduler does per click), after a
+    # warm-up so interval blocks, rings and caches are already in place
+    clicker = AutoClicker(Button.left, cps=1000, backend=NullBackend(), telemetry=Telemetry(), scheduler=ClickScheduler())
+    clicker._active = True
+    deadline = time.perf_counter()
+    for _ in range(4096):
+        deadline = clicker._fire(deadline)
+    gc.disable()
+    try:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        tracked_before = gc.get_count()[0]
+        tracemalloc.reset_peak()
+        base_current, _ = tracemalloc.get_traced_memory()
+        for _ in range(n):
+            deadline = clicker._fire(deadline)
+        current, peak = tracemalloc.get_traced_memory()
+        tracked_after = gc.get_count()[0]
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+    finally:
+        gc.enable()
+    growth = [s for s in after.compare_to(before, "lineno") if s.size_diff > 0 and "tracemalloc" not in str(s.traceback)]
+    return {
+        "clicks": n,
+        "retained_bytes": current - base_current,
+        "peak_bytes_over_base": peak - base_current,
+        "gc_tracked_net": tracked_after - tracked_before,
+        "top_growth": [f"{s.traceback}: +{s.size_diff}B" for s in growth[:3]],
+    }
+
+
+def _garbage(stop: threading.Event) -> None:
+    # Listener/GUI stand-in: keeps making reference cycles
+    keep: List[object] = []
+    while not stop.is_set():
+        for _ in range(2000):
+            a: Dict[str, object] = {}
+            a["self"] = a
+            keep.append([a] * 8)
+        if len(keep) > 50000:
+            keep.clear()
+        time.sleep(0.001)
+
+
+def clicking(seconds: float, quiet: bool, cps: int = 500) -> Dict[str, object]:
+    scheduler = ClickScheduler()
+    scheduler.set_quiet_gc(quiet)
+    telemetry = Telemetry()
+    clicker = AutoClicker(Button.left, cps=cps, jitter_ratio=0.0, backend=NullBackend(), telemetry=telemetry, scheduler=scheduler)
+    stop = threading.Event()
+    noise = threading.Thread(target=_garbage, args=(stop,), daemon=True)
+    noise.start()
+    try:
+        with GcCounter() as counter:
+            clicker.start()
+            time.sleep(seconds)
+            clicker.stop()
+            passes = counter.passes
+            pause_ms = counter.pause_max * 1e3
+    finally:
+        stop.set()
+        noise.join()
+        scheduler.shutdown()
+        if quiet:
+            gc.unfreeze()
+    errors = percentiles([abs(v) * 1e3 for v in telemetry.interval_errors.snapshot()])
+    return {
+        "quiet_gc": quiet,
+        "clicks": telemetry.clicks,
+        "gc_passes_while_clicking": passes,
+        "gc_pause_max_ms": pause_ms,
+        "error_p99_ms": errors["p99"],
+        "error_max_ms": errors["max"],
+    }
+
+
+def run(quick: bool = False) -> Dict[str, object]:
+    seconds = 1.0 if quick else 5.0
+    return {
+        "click_path": click_path_allocations(20000 if quick else 200000),
+        "clicking": [clicking(seconds, False), clicking(seconds, True)],
+    }
@@ -0,0 +1,154 @@
+# Learned timing profiles: sampled statistics against a synthetic bimodal
+# recording, scaling to a configured cps through IntervalBuffer, file round
+# trip, and alias-sampling cost per draw as the bin count grows.
+import math
+import random
+import tempfile
+import time
+from array import array
+from typing import Dict, List, Sequence
+
+from benchmarks.headless import install
+
+install()
+
+from pynput.mouse import Button  # noqa: E402
+
+from baseclick import learned  # noqa: E402
+from baseclick.learned import IntervalRecorder, TimingProfile  # noqa: E402
+from baseclick.telemetry import percentiles  # noqa: E402
+from baseclick.timing import IntervalBuffer  # noqa: E402
+from baseclick.triggers import TriggerManager  # noqa: E402
+
+
+def _recording(n: int, rng: random.Random) -> List[float]:
+    # 70% quick clicks around 80 ms, 30% around 140 ms, and a few pauses
+    # between bursts that the profile should drop
+    out = []
+    for i in range(n):
+        if i % 200 == 199:
+            out.append(2.0)
+        elif rng.random() < 0.7:
+            out.append(max(0.02, rng.gauss(0.080, 0.008)))
+        else:
+            out.append(max(0.02, rng.gauss(0.140, 0.015)))
+    return out
+
+
+def _moments(values: Sequence[float]) -> Dict[str, float]:
+    mean = sum(values) / len(values)
+    std = math.sqrt(sum((v - mean) ** 2 for v in values) / len(values))
+    p = percentiles(values)
+    return {
+        "mean_ms": mean * 1e3,
+        "std_ms": std * 1e3,
+        "p50_ms": p["p50"] * 1e3,
+        "p90_ms": p["p90"] * 1e3,
+        "below_110ms": sum(v < 0.110 for v in values) / len(values),
+    }
+
+
+def _ks(a: Sequence[float], b: Sequence[float]) -> float:
+    # Two-sample Kolmogorov-Smirnov distance
+    a, b = sorted(a), sorted(b)
+    i = j = 0
+    d = 0.0
+    while i < len(a) and j < len(b):
+        if a[i] <= b[j]:
+            i += 1
+        else:
+            j += 1
+        d = max(d, abs(i / len(a) - j / len(b)))
+    return d
+
+
+def statistics(recorded: int, draws: int) -> Dict[str, object]:
+    rng = random.Random(7)
+    intervals = _recording(recorded, rng)
+    kept = [v for v in intervals if v < 1.0]
+    profile = TimingProfile.from_intervals(intervals)
+    factors = profile.fill(array("d", bytes(8 * draws)), random.Random(11))
+    sampled = [f * profile.mean_interval for f in factors]
+    return {
+        "profile": profile.summary(),
+        "recorded": _moments(kept),
+        "sampled": _moments(sampled),
+        "ks_distance": _ks(kept, sampled),
+    }
+
+
+def scaled(cps: int, draws: int) -> Dict[str, object]:
+    # A profile recorded at ~10 cps, replayed through IntervalBuffer at `cps`
+    profile = TimingProfile.from_intervals(_recording(2000, random.Random(3)))
+    profile.save("bench")
+    buffer = IntervalBuffer("learned:bench", 0.25)
+    period = 1.0 / cps
+    values = []
+    for _ in range(draws):
+        values.append(period * buffer.next())
+        buffer.refill()
+    m = _moments(values)
+    return {
+        "cps": cps,
+        "achieved_cps": 1e3 / m["mean_ms"],
+        "cv_sampled": m["std_ms"] / m["mean_ms"],
+        "cv_profile": profile.summary()["cv"],
+        "missing_profile_falls_back": IntervalBuffer("learned:missing", 0.25).next() > 0,
+    }
+
+
+def round_trip() -> Dict[str, object]:
+    profile = TimingProfile.from_intervals(_recording(2000, random.Random(5)))
+    profile.save("trip")
+    loaded = learned.load_profile("trip")
+    return {
+        "file_bytes": len(profile.to_bytes()),
+        "bins": profile.bins,
+        "identical": loaded is not None and loaded.to_bytes() == profile.to_bytes(),
+        "cached": learned.load_profile("trip") is loaded,
+    }
+
+
+def draw_cost(draws: int) -> Dict[str, float]:
+    # ns per sampled factor; alias sampling should not grow with bins
+    rng = random.Random(1)
+    out = {}
+    block = array("d", bytes(8 * draws))
+    for bins in (8, 64, 512, 4096):
+        counts = [rng.randint(0, 1000) for _ in range(bins)]
+        profile = TimingProfile([0.5 + k / bins for k in range(bins + 1)], counts, 0.1)
+        t = time.perf_counter()
+        profile.fill(block)
+        out[f"bins_{bins}_ns"] = (time.perf_counter() - t) / draws * 1e9
+    return out
+
+
+def recorder(presses: int) -> Dict[str, object]:
+    # Intervals captured through TriggerManager's recorder hook
+    tm = TriggerManager()
+    rec = IntervalRecorder("left")
+    tm.set_recorder(rec)
+    for _ in range(presses):
+        tm._on_mouse_click(0, 0, Button.left, True)
+        tm._on_mouse_click(0, 0, Button.left, False)
+        tm._on_mouse_click(0, 0, Button.right, True)
+        time.sleep(0.002)
+    tm.set_recorder(None)
+    tm.stop()
+    return {"presses": presses, "intervals": rec.count, "mean_ms": sum(rec.intervals) / max(1, rec.count) * 1e3}
+
+
+def run(quick: bool = False) -> Dict[str, object]:
+    draws = 50_000 if quick else 500_000
+    with tempfile.TemporaryDirectory() as tmp:
+        saved_dir, learned.TIMING_DIR = learned.TIMING_DIR, tmp
+        try:
+            return {
+                "statistics": statistics(2000 if quick else 10000, draws),
+                "scaled": scaled(25, draws),
+                "round_trip": round_trip(),
+                "draw_cost": draw_cost(draws),
+                "recorder": recorder(30),
+            }
+        finally:
+            learned.TIMING_DIR = saved_dir
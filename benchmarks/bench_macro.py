@@ -0,0 +1,79 @@
+import os
+import random
+import tempfile
+import time
+from typing import Dict
+
+from benchmarks.headless import install
+
+install()
+
+from pynput import keyboard  # noqa: E402
+from pynput.mouse import Button  # noqa: E402
+
+from baseclick.backends import RecordingBackend  # noqa: E402
+from baseclick.macro import RECORD, MacroPlayer, MacroRecorder, read_records  # noqa: E402
+from baseclick.telemetry import percentiles  # noqa: E402
+from baseclick.triggers import TriggerManager  # noqa: E402
+
+
+def record(path: str, events: int, mean_gap: float) -> Dict[str, object]:
+    # Push a synthetic session through the TriggerManager hooks
+    tm = TriggerManager()
+    recorder = MacroRecorder(path)
+    tm.set_recorder(recorder)
+    rng = random.Random(1)
+    hook_ns = 0.0
+    for i in range(events):
+        time.sleep(rng.expovariate(1.0 / mean_gap))
+        t = time.perf_counter()
+        r = i % 4
+        if r == 0:
+            tm._on_mouse_move(rng.randrange(1920), rng.randrange(1080))
+        elif r == 1:
+            tm._on_mouse_click(100, 200, Button.left, True)
+        elif r == 2:
+            tm._on_mouse_click(100, 200, Button.left, False)
+        else:
+            tm._on_key_press(keyboard.KeyCode.from_char("a"))
+        hook_ns += time.perf_counter() - t
+    tm.set_recorder(None)
+    recorder.close()
+    tm.stop()
+    return {
+        "events": recorder.count,
+        "file_bytes": os.path.getsize(path),
+        "bytes_per_event": RECORD.size,
+        "record_hook_us": hook_ns / events * 1e6,
+    }
+
+
+def replay(path: str) -> Dict[str, object]:
+    backend = RecordingBackend()
+    player = MacroPlayer(backend, keyboard_controller=keyboard.Controller())
+    t0 = time.perf_counter()
+    player.play(path)
+    # Compare each injected mouse input's offset with its recorded offset
+    recorded = [t for t, kind, *_ in read_records(path) if kind in (0, 1)]
+    injected = []
+    last = None
+    for t, action, _ in backend.inputs:
+        # a recorded click is injected as move + press/release; keep the first
+        if action == "move" or last != "move":
+            injected.append(t - t0)
+        last = action
+    errors = [abs(a - b) * 1e6 for a, b in zip(injected, recorded)]
+    return {
+        "replayed": player.events,
+        "issue_error_us": percentiles([abs(v) * 1e6 for v in player.timing_error.snapshot()]),
+        "offset_error_us": percentiles(errors),
+    }
+
+
+def run(quick: bool = False) -> Dict[str, object]:
+    events = 200 if quick else 2000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "macro.bcm")
+        result = {"record": record(path, events, mean_gap=0.005)}
+        result["replay"] = replay(path)
+    return result
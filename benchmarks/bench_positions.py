@@ -0,0 +1,97 @@
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.headless import install
+
+install()
+
+from pynput.mouse import Button  # noqa: E402
+
+from baseclick.backends import (  # noqa: E402
+    ABS_X, ABS_Y, EV_ABS, EV_KEY, EV_SYN, INPUT_EVENT, RecordingBackend, UinputBackend,
+)
+from baseclick.clicker import AutoClicker  # noqa: E402
+from baseclick.scheduler import ClickScheduler  # noqa: E402
+
+POINTS = [[100, 200], [300, 400], [500, 600], [700, 800]]
+RECT = [10, 20, 300, 200]
+
+
+def _run(scheduler: ClickScheduler, cps: int, seconds: float, mode: str, **where) -> Dict[str, object]:
+    backend = RecordingBackend()
+    clicker = AutoClicker(Button.left, cps=cps, jitter_ratio=0.0, scheduler=scheduler, backend=backend)
+    clicker.set_position(mode, **where)
+    clicker.start()
+    time.sleep(seconds)
+    clicker.stop()
+    clicks = [t for t, _ in backend.events]
+    moves = [(t, xy) for t, kind, xy in backend.inputs if kind == "move"]
+    # Every click is paired with its own move, stamped in the same batch
+    batched = len(moves) == len(clicks) and all(m[0] == c for m, c in zip(moves, clicks))
+    if mode == "cycle":
+        expected = [tuple(POINTS[i % len(POINTS)]) for i in range(len(moves))]
+        placed = [xy for _, xy in moves] == expected
+    elif mode == "fixed":
+        placed = all(xy == tuple(POINTS[0]) for _, xy in moves)
+    else:
+        x, y, w, h = RECT
+        placed = all(x <= mx < x + w and y <= my < y + h for _, (mx, my) in moves)
+    span = clicks[-1] - clicks[0] if len(clicks) > 1 else 0.0
+    return {
+        "mode": mode,
+        "clicks": len(clicks),
+        "batched": batched,
+        "placed": placed,
+        "achieved_cps": (len(clicks) - 1) / span if span else 0.0,
+    }
+
+
+def uinput_stream(n: int) -> Dict[str, object]:
+    # Decode what an absolute uinput device receives for n aimed clicks and
+    # compare the per-click cost of one batched write against two calls
+    with tempfile.TemporaryFile() as f:
+        backend = UinputBackend(fd=f.fileno(), screen=(1920, 1080))
+        t0 = time.perf_counter()
+        for i in range(n):
+            backend.click_at(i % 1920, i % 1080, Button.left)
+        batched = time.perf_counter() - t0
+        f.seek(0)
+        data = f.read()
+        t0 = time.perf_counter()
+        for i in range(n):
+            backend.move_to(i % 1920, i % 1080)
+            backend.click(Button.left)
+        separate = time.perf_counter() - t0
+    events = [INPUT_EVENT.unpack_from(data, off)[2:] for off in range(0, len(data), INPUT_EVENT.size)]
+    per_click = len(events) // n if n else 0
+    first: List[object] = [list(e) for e in events[:per_click]]
+    ok = per_click == 6 and all(
+        events[i * 6][:2] == (EV_ABS, ABS_X) and events[i * 6 + 1][:2] == (EV_ABS, ABS_Y)
+        and events[i * 6 + 2] == (EV_KEY, 0x110, 1) and events[i * 6 + 4] == (EV_KEY, 0x110, 0)
+        and events[i * 6 + 3][0] == EV_SYN and events[i * 6 + 5][0] == EV_SYN
+        for i in range(n)
+    )
+    return {
+        "clicks": n,
+        "events_per_click": per_click,
+        "stream_ok": ok,
+        "first_click": first,
+        "batched_us": batched / n * 1e6,
+        "separate_us": separate / n * 1e6,
+    }
+
+
+def run(quick: bool = False) -> Dict[str, object]:
+    seconds = 0.5 if quick else 2.0
+    cps = 100
+    scheduler = ClickScheduler()
+    try:
+        runs = [
+            _run(scheduler, cps, seconds, "fixed", points=POINTS),
+            _run(scheduler, cps, seconds, "cycle", points=POINTS),
+            _run(scheduler, cps, seconds, "random", rect=RECT),
+        ]
+    finally:
+        scheduler.shutdown()
+    return {"cps": cps, "runs": runs, "uinput": uinput_stream(2000 if quick else 20000)}
@@ -0,0 +1,63 @@
+import time
+from typing import Dict
+
+from benchmarks.headless import install
+
+install()
+
+from baseclick.backends import RecordingBackend  # noqa: E402
+from baseclick.bindings import BindingEngine  # noqa: E402
+from baseclick.config import AppConfig, Binding, Profile  # noqa: E402
+from baseclick.scheduler import ClickScheduler  # noqa: E402
+from baseclick.triggers import TriggerManager  # noqa: E402
+
+
+def _profile(cps: int, keys: str) -> Profile:
+    return Profile(cps=cps, bindings=[Binding(f"key:{k}", "left", mode="toggle") for k in keys])
+
+
+def measure(switches: int, policy: str) -> Dict[str, object]:
+    cfg = AppConfig(
+        cps=20, mode="toggle", left_trigger="key:f1", right_trigger="key:f2",
+        profiles={"fast": _profile(60, "abcdefghij"), "slow": _profile(5, "klmnopqrst")},
+        profile_hotkey="key:f9", profile_switch_policy=policy,
+    )
+    tm = TriggerManager()
+    scheduler = ClickScheduler()
+    engine = BindingEngine(tm, scheduler, RecordingBackend())
+    t0 = time.perf_counter()
+    engine.apply(cfg)
+    precompile_us = (time.perf_counter() - t0) * 1e6
+    tm.start()
+    listeners = (tm._mouse_listener, tm._key_listener)
+
+    # A running toggle clicker on f1, which every profile binds
+    engine.action_for("key:f1").on_trigger(True)
+    engine.switch("fast")
+    carried = engine.action_for("key:f1").clicker.is_active()
+    engine.stop_all()
+
+    worst = 0.0
+    t0 = time.perf_counter()
+    for _ in range(switches):
+        t = time.perf_counter()
+        engine.cycle_profile(True)
+        worst = max(worst, time.perf_counter() - t)
+    total = time.perf_counter() - t0
+    same_listeners = listeners == (tm._mouse_listener, tm._key_listener)
+    scheduler.shutdown()
+    tm.stop()
+    return {
+        "policy": policy,
+        "profiles": len(engine.profiles),
+        "precompile_us": precompile_us,
+        "switch_us_mean": total / switches * 1e6,
+        "switch_us_max": worst * 1e6,
+        "listeners_restarted": not same_listeners,
+        "active_clicker_carried": carried,
+    }
+
+
+def run(quick: bool = False) -> Dict[str, object]:
+    switches = 2_000 if quick else 20_000
+    return {policy: measure(switches, policy) for policy in ("stop", "carry")}
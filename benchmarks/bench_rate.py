@@ -0,0 +1,72 @@
+import random
+import time
+from typing import Dict, List
+
+from benchmarks.headless import install
+
+install()
+
+from pynput.mouse import Button  # noqa: E402
+
+from baseclick.backends import RecordingBackend  # noqa: E402
+from baseclick.clicker import AutoClicker  # noqa: E402
+from baseclick.scheduler import ClickScheduler, spin_until  # noqa: E402
+
+
+class SlowBackend(RecordingBackend):
+    # Injection that takes `cost` (+-20%) and stalls every `stall_every` clicks;
+    # events are stamped when the click lands, not when it was issued.
+    def __init__(self, cost: float, stall: float = 0.0, stall_every: int = 0) -> None:
+        super().__init__()
+        self.cost = cost
+        self.stall = stall
+        self.stall_every = stall_every
+        self._rng = random.Random(7)
+
+    def probe(self) -> None:
+        spin_until(time.perf_counter() + self.cost)
+
+    def click(self, button: Button) -> None:
+        delay = self.cost * self._rng.uniform(0.8, 1.2)
+        if self.stall_every and len(self.events) % self.stall_every == self.stall_every - 1:
+            delay += self.stall
+        spin_until(time.perf_counter() + delay)
+        self.events.append((time.perf_counter(), button))
+
+
+def _measure(scheduler: ClickScheduler, backend: SlowBackend, cps: int, seconds: float, feedback: bool) -> Dict[str, object]:
+    backend.calibrate(16)
+    clicker = AutoClicker(Button.left, cps=cps, jitter_ratio=0.0, scheduler=scheduler, backend=backend, feedback=feedback)
+    clicker.start()
+    time.sleep(seconds)
+    clicker.stop()
+    stamps = [t for t, _ in backend.events]
+    # Second half only: how close the settled rate is to the target
+    tail = stamps[len(stamps) // 2:]
+    achieved = (len(tail) - 1) / (tail[-1] - tail[0]) if len(tail) > 1 else 0.0
+    stats = clicker.rate_stats()
+    return {
+        "feedback": feedback,
+        "clicks": len(stamps),
+        "achieved_cps": achieved,
+        "error_pct": (achieved - cps) / cps * 100.0,
+        "converged": bool(stats["converged"]),
+        "scale": stats["scale"],
+        "cost_us": stats["cost_us"],
+    }
+
+
+def run(quick: bool = False) -> Dict[str, object]:
+    seconds = 1.5 if quick else 5.0
+    scheduler = ClickScheduler()
+    out: List[Dict[str, object]] = []
+    try:
+        for cps, cost, stall, every in ((100, 0.003, 0.0, 0), (100, 0.001, 0.03, 25), (250, 0.002, 0.0, 0)):
+            for feedback in (False, True):
+                backend = SlowBackend(cost, stall, every)
+                row = _measure(scheduler, backend, cps, seconds, feedback)
+                row.update({"cps": cps, "cost_ms": cost * 1e3, "stall_ms": stall * 1e3, "stall_every": every})
+                out.append(row)
+    finally:
+        scheduler.shutdown()
+    return {"runs": out}
@@ -0,0 +1,72 @@
+import multiprocessing
+import os
+import time
+from typing import Dict, List
+
+from benchmarks.headless import install
+
+install()
+
+from pynput.mouse import Button  # noqa: E402
+
+from baseclick.backends import RecordingBackend  # noqa: E402
+from baseclick.clicker import AutoClicker  # noqa: E402
+from baseclick.realtime import tune_current_thread  # noqa: E402
+from baseclick.scheduler import ClickScheduler  # noqa: E402
+from baseclick.telemetry import Telemetry, percentiles  # noqa: E402
+
+
+def _burn(stop) -> None:
+    while not stop.is_set():
+        pass
+
+
+def _run_clicker(seconds: float, cps: int, **tuning) -> Dict[str, object]:
+    scheduler = ClickScheduler()
+    scheduler.set_thread_setup(lambda: tune_current_thread(**tuning))
+    while scheduler.setup_result is None:
+        time.sleep(0.001)
+    telemetry = Telemetry()
+    clicker = AutoClicker(
+        Button.left, cps=cps, jitter_ratio=0.0, scheduler=scheduler, backend=RecordingBackend(), telemetry=telemetry,
+    )
+    try:
+        clicker.start()
+        time.sleep(seconds)
+        clicker.stop()
+    finally:
+        scheduler.shutdown()
+    errors = percentiles([abs(v) * 1e6 for v in telemetry.interval_errors.snapshot()])
+    report = scheduler.setup_result
+    return {
+        "tuning": {k: {"applied": ok, "detail": detail} for k, (ok, detail) in report.items()}
+        if isinstance(report, dict) else repr(report),
+        "clicks": telemetry.clicks,
+        "error_us": errors,
+    }
+
+
+def run(quick: bool = False) -> Dict[str, object]:
+    seconds = 1.0 if quick else 5.0
+    cps = 200
+    configs: List[Dict[str, object]] = [
+        {"name": "default"},
+        {"name": "fifo", "policy": "fifo", "priority": 50},
+        {"name": "fifo+pin+slack", "policy": "fifo", "priority": 50, "cpus": [0], "timer_slack_ns": 1},
+        {"name": "slack-only", "policy": "normal", "timer_slack_ns": 1},
+    ]
+    # Two busy processes per CPU keep every run queue contended
+    stop = multiprocessing.Event()
+    burners = [multiprocessing.Process(target=_burn, args=(stop,), daemon=True) for _ in range(2 * (os.cpu_count() or 1))]
+    for p in burners:
+        p.start()
+    out = []
+    try:
+        for config in configs:
+            tuning = {k: v for k, v in config.items() if k != "name"}
+            out.append({"name": config["name"], **_run_clicker(seconds, cps, **tuning)})
+    finally:
+        stop.set()
+        for p in burners:
+            p.join(timeout=2.0)
+    return {"cps": cps, "burners": len(burners), "runs": out}
@@ -0,0 +1,122 @@
+# Hot reload of config.json: edit-to-applied latency (inotify and the poll
+# fallback), that only changed fields are applied with no clicker, listener
+# or thread restarts, and that the controller's own writes are not echoed.
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.headless import install
+
+install()
+
+from baseclick.config import AppConfig  # noqa: E402
+from baseclick.controller import AppController  # noqa: E402
+from baseclick.telemetry import percentiles  # noqa: E402
+from baseclick.watch import FileWatcher  # noqa: E402
+
+
+def _edit(path: str, **changes) -> float:
+    # An external editor: rewrite the file in place, return when it's done
+    with open(path, "r", encoding="utf-8") as f:
+        obj = json.load(f)
+    obj.update(changes)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2)
+    return time.perf_counter()
+
+
+def _wait(cond, timeout: float = 5.0) -> float:
+    deadline = time.perf_counter() + timeout
+    while not cond():
+        if time.perf_counter() > deadline:
+            return float("nan")
+        time.sleep(0.0002)
+    return time.perf_counter()
+
+
+def latency(tmp: str, edits: int, inotify: bool) -> Dict[str, object]:
+    path = os.path.join(tmp, f"latency-{int(inotify)}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(AppConfig(backend="recording", hot_reload=False).to_json())
+    controller = AppController(path)
+    controller.watcher = FileWatcher(path, controller.reload_config, inotify=inotify)
+    controller.watcher.start()
+    clicker = controller.engine.actions[0].clicker
+    samples: List[float] = []
+    try:
+        for i in range(edits):
+            cps = 20 + i % 50
+            t0 = _edit(path, cps=cps)
+            t1 = _wait(lambda: clicker._cps == cps)
+            samples.append((t1 - t0) * 1e3)
+    finally:
+        controller.shutdown()
+    return {"mode": controller.watcher.mode, "edits": edits, "latency_ms": percentiles(samples)}
+
+
+def behaviour(tmp: str) -> Dict[str, object]:
+    path = os.path.join(tmp, "behaviour.json")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(AppConfig(backend="recording").to_json())
+    controller = AppController(path)
+    engine = controller.engine
+    applies = [0]
+    real_apply = engine.apply
+
+    def counting_apply(cfg):
+        applies[0] += 1
+        real_apply(cfg)
+
+    engine.apply = counting_apply
+    action = engine.actions[0]
+    clicker = action.clicker
+    listener = controller.triggers._mouse_listener
+    scheduler_thread = controller.scheduler._thread
+    out: Dict[str, object] = {"watcher": controller.watcher.mode}
+    try:
+        # External edits: rate, jitter, mode, then a rebind while clicking
+        _edit(path, cps=33)
+        _wait(lambda: clicker._cps == 33)
+        _edit(path, jitter_ratio=0.05)
+        _wait(lambda: clicker._intervals.jitter == 0.05)
+        _edit(path, mode="toggle")
+        _wait(lambda: action.mode == "toggle")
+        clicker.start()
+        _edit(path, left_trigger="key:ctrl+f6")
+        _wait(lambda: "key:ctrl+f6" in controller.triggers._callbacks)
+        out["external_edits_applied"] = applies[0]
+        out["rebound_clicker_stopped"] = not clicker.is_active()
+        out["same_clicker"] = engine.actions[0].clicker is clicker
+        out["same_mouse_listener"] = controller.triggers._mouse_listener is listener
+        out["same_scheduler_thread"] = controller.scheduler._thread is scheduler_thread
+        out["writes_after_edits"] = controller.store.writes
+
+        # A change from the window is written once and its echo ignored
+        before = applies[0]
+        controller.apply_settings(AppConfig.from_json(json.dumps({**json.loads(controller.cfg.to_json()), "cps": 44})))
+        controller.store.flush()
+        time.sleep(0.2)
+        out["own_write_applies"] = applies[0] - before
+        out["own_write_writes"] = controller.store.writes - out["writes_after_edits"]
+
+        # A half-saved file is ignored until it parses again
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"cps": 9')
+        time.sleep(0.2)
+        out["broken_file_kept_cps"] = clicker._cps == 44
+        out["unchanged_apply_calls"] = applies[0] - before
+    finally:
+        controller.shutdown()
+    return out
+
+
+def run(quick: bool = False) -> Dict[str, object]:
+    edits = 20 if quick else 200
+    with tempfile.TemporaryDirectory() as tmp:
+        return {
+            "inotify": latency(tmp, edits, inotify=True),
+            "poll": latency(tmp, max(5, edits // 4), inotify=False),
+            "behaviour": behaviour(tmp),
+        }
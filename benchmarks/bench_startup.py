@@ -0,0 +1,74 @@
+# Startup time and peak RSS per launch mode, each in a fresh interpreter.
+# "gui" is today's default startup; "tray" builds only the tray icon;
+# "headless" never imports Qt. Qt runs on the offscreen platform.
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ("gui", "tray", "headless")
+
+PROBE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from benchmarks.headless import install
+install()
+import main
+mode = sys.argv[1]
+if mode == "headless":
+    controller = main.AppController()
+else:
+    from PySide6.QtWidgets import QApplication
+    app = QApplication([])
+    controller = main.AppController()
+    if mode == "gui":
+        win = main.create_window(controller)
+        win.show()
+    else:
+        tray = main.create_tray(app, controller)
+    app.processEvents()
+startup = time.perf_counter() - t0
+try:
+    import resource
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        rss_kb //= 1024
+except ImportError:
+    rss_kb = None
+print(json.dumps({"startup_ms": startup * 1e3, "peak_rss_kb": rss_kb, "qt_loaded": "PySide6" in sys.modules}))
+controller.shutdown()
+"""
+
+
+def probe(mode: str, config_dir: str) -> Dict[str, object]:
+    env = dict(os.environ, APPDATA=config_dir, QT_QPA_PLATFORM="offscreen", PYTHONPATH=ROOT)
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", PROBE, mode], cwd=ROOT, env=env,
+        capture_output=True, text=True, timeout=60,
+    )
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0 or not proc.stdout.strip():
+        return {"error": (proc.stderr.strip().splitlines() or ["no output"])[-1]}
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_wall_ms"] = wall * 1e3
+    return result
+
+
+def run(quick: bool = False) -> Dict[str, object]:
+    repeats = 1 if quick else 5
+    results: Dict[str, object] = {}
+    with tempfile.TemporaryDirectory() as config_dir:
+        for mode in MODES:
+            runs = [probe(mode, config_dir) for _ in range(repeats)]
+            ok = [r for r in runs if "error" not in r]
+            if not ok:
+                results[mode] = runs[0]
+                continue
+            best = min(ok, key=lambda r: r["startup_ms"])
+            results[mode] = dict(best, runs=len(ok))
+    return results
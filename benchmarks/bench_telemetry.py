@@ -0,0 +1,45 @@
+# Hot-path cost of the always-on telemetry: ns per trigger edge (press and
+# release, one thread and both hook threads at once) and per click record.
+import threading
+import time
+from typing import Dict
+
+from baseclick.telemetry import Telemetry
+
+
+def _ns_per_call(fn, n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n * 1e9
+
+
+def single_thread(n: int) -> Dict[str, float]:
+    t = Telemetry()
+    now = time.perf_counter()
+    return {
+        "press_ns": _ns_per_call(lambda: t.trigger("key:f6", True), n),
+        "release_ns": _ns_per_call(lambda: t.trigger("key:f6", False), n),
+        "click_ns": _ns_per_call(lambda: t.click(now, now, now), n),
+    }
+
+
+def two_hook_threads(n: int) -> Dict[str, float]:
+    # Mouse and key hooks pressing at once contend for the trigger lock
+    t = Telemetry()
+    results = []
+
+    def hook(token: str) -> None:
+        results.append(_ns_per_call(lambda: t.trigger(token, True), n))
+
+    threads = [threading.Thread(target=hook, args=(token,)) for token in ("mouse:x1", "key:f6")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {"press_ns": max(results), "events": float(t.trigger_events.count)}
+
+
+def run(quick: bool = False) -> Dict[str, object]:
+    n = 20_000 if quick else 200_000
+    return {"single_thread": single_thread(n), "two_hook_threads": two_hook_threads(n)}
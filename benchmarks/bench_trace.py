@@ -0,0 +1,72 @@
+# Event-trace cost on the click path (tracer off vs on) and an end-to-end
+# trace of triggered runs summarized by the analyzer.
+import os
+import tempfile
+import time
+from typing import Dict
+
+from benchmarks.headless import install
+
+install()
+
+from pynput import keyboard  # noqa: E402
+from pynput.mouse import Button  # noqa: E402
+
+from baseclick import trace  # noqa: E402
+from baseclick.backends import RecordingBackend  # noqa: E402
+from baseclick.clicker import AutoClicker  # noqa: E402
+from baseclick.scheduler import ClickScheduler  # noqa: E402
+from baseclick.triggers import TriggerManager  # noqa: E402
+
+
+def inject_cost(n: int) -> Dict[str, float]:
+    # Per-click cost of AutoClicker._inject with the recording backend
+    clicker = AutoClicker(Button.left, backend=RecordingBackend())
+    out = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for label in ("off", "on"):
+            if label == "on":
+                trace.start(os.path.join(tmp, "cost.trace"), 1 << 12)
+            clicker._backend = RecordingBackend()
+            t = time.perf_counter()
+            for _ in range(n):
+                clicker._inject(0.0)
+            out[f"{label}_ns"] = (time.perf_counter() - t) / n * 1e9
+            trace.stop()
+    out["overhead_ns"] = out["on_ns"] - out["off_ns"]
+    return out
+
+
+def triggered_runs(runs: int, hold: float, cps: int) -> Dict[str, object]:
+    # Key presses go through TriggerManager's handlers, as from a listener
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "runs.trace")
+        trace.start(path, 1 << 14)
+        scheduler = ClickScheduler()
+        triggers = TriggerManager()
+        clicker = AutoClicker(Button.left, cps=cps, jitter_ratio=0.0, scheduler=scheduler, backend=RecordingBackend())
+        triggers.set_trigger("key:f6", lambda pressed: clicker.start() if pressed else clicker.stop())
+        try:
+            for _ in range(runs):
+                triggers._on_key_press(keyboard.Key.f6)
+                time.sleep(hold)
+                triggers._on_key_release(keyboard.Key.f6)
+                triggers.drain(1.0)
+                time.sleep(0.02)
+        finally:
+            triggers.stop()
+            scheduler.shutdown()
+            trace.stop()
+        f = trace.TraceFile(path)
+        try:
+            report = trace.analyze(f)
+        finally:
+            f.close()
+    return report
+
+
+def run(quick: bool = False) -> Dict[str, object]:
+    return {
+        "inject": inject_cost(20000 if quick else 200000),
+        "runs": triggered_runs(3 if quick else 10, 0.2, 100),
+    }
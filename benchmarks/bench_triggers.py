@@ -0,0 +1,247 @@
+import threading
+import time
+from typing import Dict
+
+from benchmarks.headless import install
+
+install()
+
+from pynput import keyboard  # noqa: E402
+from pynput.mouse import Button  # noqa: E402
+
+from baseclick.triggers import WM_XBUTTONDOWN, TriggerManager  # noqa: E402
+
+
+def _rate(fn, n: int) -> float:
+    t0 = time.perf_counter()
+    fn(n)
+    return n / (time.perf_counter() - t0)
+
+
+def stress(tm: TriggerManager, events_per_s: int, duration: float) -> Dict[str, float]:
+    # Fire events at a fixed rate while another thread rebinds tokens as fast
+    # as it can; key:f6 stays bound throughout, so every f6 edge must arrive.
+    delivered = [0]
+    stop = threading.Event()
+
+    def on_f6(pressed: bool) -> None:
+        delivered[0] += 1
+
+    def slow(pressed: bool) -> None:
+        time.sleep(0.001)
+
+    tm.set_trigger("key:f6", on_f6)
+    rebinds = [0]
+
+    def rebinder() -> None:
+        keys = ("key:a", "key:b", "key:c", "mouse:x2")
+        while not stop.is_set():
+            for k in keys:
+                tm.set_trigger(k, slow)
+                tm.clear_trigger(k)
+                rebinds[0] += 2
+
+    worker = threading.Thread(target=rebinder, daemon=True)
+    worker.start()
+    f6 = keyboard.Key.f6
+    period = 1.0 / events_per_s
+    sent = 0
+    hook_max = 0.0
+    t0 = time.perf_counter()
+    deadline = t0
+    while deadline - t0 < duration:
+        while time.perf_counter() < deadline:
+            pass
+        t = time.perf_counter()
+        if sent & 1:
+            tm._on_key_release(f6)
+        else:
+            tm._on_key_press(f6)
+        hook_max = max(hook_max, time.perf_counter() - t)
+        sent += 1
+        deadline += period
+    stop.set()
+    worker.join()
+    tm.drain(timeout=5.0)
+    return {
+        "events_sent": sent,
+        "events_delivered": delivered[0],
+        "rebinds": rebinds[0],
+        "hook_max_us": hook_max * 1e6,
+    }
+
+
+def autorepeat(tm: TriggerManager, holds: int, repeats: int) -> Dict[str, int]:
+    # A held key autorepeats presses; only the first press and the release
+    # should reach the callback.
+    delivered = [0]
+
+    def on_f7(pressed: bool) -> None:
+        delivered[0] += 1
+
+    tm.set_trigger("key:f7", on_f7)
+    f7 = keyboard.Key.f7
+    before = tm.suppressed_repeats
+    for _ in range(holds):
+        for _ in range(repeats):
+            tm._on_key_press(f7)
+        tm._on_key_release(f7)
+    tm.drain(timeout=5.0)
+    tm.clear_trigger("key:f7")
+    return {
+        "raw_events": holds * (repeats + 1),
+        "delivered": delivered[0],
+        "suppressed_repeats": tm.suppressed_repeats - before,
+    }
+
+
+def chords(n: int) -> Dict[str, object]:
+    # Chord matching: which tokens fire for a sequence, capture of a combo,
+    # and key event cost with 200 more chords bound that don't share the
+    # event's atoms (an event only tests the chords containing its atom).
+    fired: Dict[str, int] = {}
+
+    def counter(token: str):
+        def cb(pressed: bool) -> None:
+            if pressed:
+                fired[token] = fired.get(token, 0) + 1
+        return cb
+
+    tm = TriggerManager()
+    for token in ("key:f6", "key:ctrl+f6", "key:shift+mouse:x1", "mouse:middle"):
+        tm.set_trigger(token, counter(token))
+    Key = keyboard.Key
+    press, release, click = tm._on_key_press, tm._on_key_release, tm._on_mouse_click
+    press(Key.f6); release(Key.f6)                          # f6
+    press(Key.ctrl_r); press(Key.f6); release(Key.f6)       # ctrl+f6 (right ctrl), f6 shadowed
+    release(Key.ctrl_r)
+    click(0, 0, Button.x1, True); click(0, 0, Button.x1, False)  # nothing: shift not held
+    press(Key.shift_r); click(0, 0, Button.x1, True)        # shift+x1
+    click(0, 0, Button.x1, False); release(Key.shift_r)
+    click(0, 0, Button.middle, True); click(0, 0, Button.middle, False)
+    tm.drain(timeout=5.0)
+
+    captured = []
+    tm.capture_once(captured.append)
+    press(Key.ctrl); press(Key.shift); press(keyboard.KeyCode.from_char("k"))
+    release(keyboard.KeyCode.from_char("k")); release(Key.shift); release(Key.ctrl)
+    tm.capture_once(captured.append)
+    press(Key.alt); release(Key.alt)
+    tm.drain(timeout=5.0)
+
+    def events(count: int) -> None:
+        for _ in range(count // 4):
+            press(Key.ctrl); press(Key.f6); release(Key.f6); release(Key.ctrl)
+
+    one = _rate(events, n)
+    for i in range(200):
+        tm.set_trigger(f"key:alt+{i}", lambda pressed: None)
+    many = _rate(events, n)
+    tm.drain(timeout=30.0)
+    tm.stop()
+    return {
+        "fired": fired,
+        "captured": captured,
+        "events_per_s_4_chords": one,
+        "events_per_s_204_chords": many,
+    }
+
+
+class _HookData:
+    # Stand-in for MSLLHOOKSTRUCT / KBDLLHOOKSTRUCT
+    def __init__(self, mouseData: int = 0, vkCode: int = 0, flags: int = 0) -> None:
+        self.mouseData = mouseData
+        self.vkCode = vkCode
+        self.flags = flags
+
+
+def native_filter(n: int) -> Dict[str, object]:
+    # Feed a realistic mouse mix (mostly moves) through the win32 hook filter
+    # with only mouse:x1 bound, and check which listeners demand-start.
+    tm = TriggerManager()
+    tm.start()
+    idle = {"mouse": tm._mouse_listener is not None, "key": tm._key_listener is not None}
+    tm.set_trigger("mouse:x1", lambda pressed: None)
+    bound = {"mouse": tm._mouse_listener is not None, "key": tm._key_listener is not None}
+    mix = [(0x0200, _HookData())] * 8 + [
+        (0x020A, _HookData()),                   # wheel
+        (0x0201, _HookData()),                   # left down
+        (WM_XBUTTONDOWN, _HookData(1 << 16)),    # x1 down
+        (WM_XBUTTONDOWN, _HookData(2 << 16)),    # x2 down
+    ]
+    passed = 0
+    t0 = time.perf_counter()
+    for i in range(n):
+        msg, data = mix[i % len(mix)]
+        if tm._mouse_filter(msg, data):
+            passed += 1
+    elapsed = time.perf_counter() - t0
+    tm.stop()
+    return {
+        "listeners_idle": idle,
+        "listeners_mouse_bound": bound,
+        "events": n,
+        "passed": passed,
+        "filtered_events": tm.filtered_events,
+        "filter_ns_per_event": elapsed / n * 1e9,
+    }
+
+
+def run(quick: bool = False) -> Dict[str, object]:
+    n = 20_000 if quick else 200_000
+    tm = TriggerManager()
+    calls = [0]
+
+    def on_key(pressed: bool) -> None:
+        calls[0] += 1
+
+    def on_mouse(pressed: bool) -> None:
+        calls[0] += 1
+
+    tm.set_trigger("key:f6", on_key)
+    tm.set_trigger("mouse:x1", on_mouse)
+
+    bound_key = keyboard.Key.f6
+    unbound_key = keyboard.KeyCode.from_char("q")
+
+    def key_bound(count: int) -> None:
+        press, release = tm._on_key_press, tm._on_key_release
+        for _ in range(count // 2):
+            press(bound_key)
+            release(bound_key)
+
+    def key_unbound(count: int) -> None:
+        press = tm._on_key_press
+        for _ in range(count):
+            press(unbound_key)
+
+    def mouse_bound(count: int) -> None:
+        click = tm._on_mouse_click
+        for _ in range(count // 2):
+            click(0, 0, Button.x1, True)
+            click(0, 0, Button.x1, False)
+
+    def mouse_unbound(count: int) -> None:
+        click = tm._on_mouse_click
+        for _ in range(count):
+            click(0, 0, Button.left, True)
+
+    def key_bound_dispatched(count: int) -> None:
+        key_bound(count)
+        tm.drain(timeout=30.0)
+
+    results: Dict[str, object] = {
+        "key_bound_events_per_s": _rate(key_bound, n),
+        "key_unbound_events_per_s": _rate(key_unbound, n),
+        "mouse_bound_events_per_s": _rate(mouse_bound, n),
+        "mouse_unbound_events_per_s": _rate(mouse_unbound, n),
+        "key_bound_dispatched_per_s": _rate(key_bound_dispatched, n),
+    }
+    tm.drain(timeout=30.0)
+    results["callbacks"] = calls[0]
+    results["native_filter"] = native_filter(n)
+    results["autorepeat"] = autorepeat(tm, holds=100, repeats=30)
+    results["chords"] = chords(n)
+    results["stress"] = stress(tm, events_per_s=5000, duration=0.5 if quick else 2.0)
+    tm.stop()
+    return results
@@ -0,0 +1,118 @@
+# Minimal stand-ins for pynput so benchmarks run without a display or input
+# devices. install() must run before anything from baseclick is imported.
+import enum
+import sys
+import types
+
+
+class Button(enum.Enum):
+    unknown = 0
+    left = 1
+    middle = 2
+    right = 3
+    x1 = 4
+    x2 = 5
+
+
+class Key(enum.Enum):
+    alt = 1
+    alt_l = 2
+    alt_r = 3
+    backspace = 4
+    ctrl = 5
+    ctrl_l = 6
+    ctrl_r = 7
+    delete = 8
+    enter = 9
+    esc = 10
+    f1 = 11
+    f2 = 12
+    f3 = 13
+    f4 = 14
+    f5 = 15
+    f6 = 16
+    f7 = 17
+    f8 = 18
+    f9 = 19
+    f10 = 20
+    f11 = 21
+    f12 = 22
+    shift = 23
+    shift_l = 24
+    shift_r = 25
+    space = 26
+    tab = 27
+    cmd = 28
+
+
+class KeyCode:
+    def __init__(self, vk=None, char=None):
+        self.vk = vk
+        self.char = char
+
+    @classmethod
+    def from_char(cls, char):
+        return cls(char=char)
+
+
+class MouseController:
+    def __init__(self):
+        self.position = (0, 0)
+        self.clicks = 0
+
+    def click(self, button, count=1):
+        self.clicks += count
+
+    def press(self, button):
+        pass
+
+    def release(self, button):
+        pass
+
+    def move(self, dx, dy):
+        x, y = self.position
+        self.position = (x + dx, y + dy)
+
+
+class KeyboardController:
+    def press(self, key):
+        pass
+
+    def release(self, key):
+        pass
+
+
+class Listener:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.running = False
+
+    def start(self):
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+    def join(self, timeout=None):
+        pass
+
+
+def install() -> None:
+    if "pynput" in sys.modules and getattr(sys.modules["pynput"], "_baseclick_stub", False):
+        return
+    pynput = types.ModuleType("pynput")
+    pynput._baseclick_stub = True
+    mouse = types.ModuleType("pynput.mouse")
+    mouse.Button = Button
+    mouse.Controller = MouseController
+    mouse.Listener = Listener
+    keyboard = types.ModuleType("pynput.keyboard")
+    keyboard.Key = Key
+    keyboard.KeyCode = KeyCode
+    keyboard.Controller = KeyboardController
+    keyboard.Listener = Listener
+    pynput.mouse = mouse
+    pynput.keyboard = keyboard
+    sys.modules["pynput"] = pynput
+    sys.modules["pynput.mouse"] = mouse
+    sys.modules["pynput.keyboard"] = keyboard
@@ -0,0 +1,69 @@
+# Headless benchmark runner. Prints one JSON document so runs can be diffed
+# between commits:
+#   python -m benchmarks.run [--quick] [--suite clicker] [--out result.json]
+import argparse
+import importlib
+import json
+import platform
+import subprocess
+import sys
+import time
+
+SUITES = {
+    "clicker": "benchmarks.bench_clicker",
+    "triggers": "benchmarks.bench_triggers",
+    "startup": "benchmarks.bench_startup",
+    "config": "benchmarks.bench_config",
+    "bindings": "benchmarks.bench_bindings",
+    "macro": "benchmarks.bench_macro",
+    "profiles": "benchmarks.bench_profiles",
+    "bounded": "benchmarks.bench_bounded",
+    "rate": "benchmarks.bench_rate",
+    "realtime": "benchmarks.bench_realtime",
+    "positions": "benchmarks.bench_positions",
+    "control": "benchmarks.bench_control",
+    "trace": "benchmarks.bench_trace",
+    "engine": "benchmarks.bench_engine",
+    "gc": "benchmarks.bench_gc",
+    "learned": "benchmarks.bench_learned",
+    "reload": "benchmarks.bench_reload",
+    "telemetry": "benchmarks.bench_telemetry",
+}
+
+
+def _commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="BaseClick headless benchmarks")
+    parser.add_argument("--quick", action="store_true", help="shorter runs for a smoke check")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES), help="run only these suites")
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "results": {},
+    }
+    for name in args.suite or SUITES:
+        module = importlib.import_module(SUITES[name])
+        report["results"][name] = module.run(quick=args.quick)
+
+    data = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(data + "\n")
+    else:
+        print(data)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,113 +1,141 @@
+import argparse
+import multiprocessing
 import sys
-from PySide6.QtWidgets import QApplication
-from pynput.mouse import Button
-
-from baseclick.config import load_config, save_config
-from baseclick.clicker import AutoClicker
-from baseclick.triggers import TriggerManager
-from baseclick.ui.main_window import MainWindow
-
-
-class AppController:
-    def __init__(self) -> None:
-        self.cfg = load_config()
-        self.left_clicker = AutoClicker(Button.left, cps=self.cfg.cps, jitter_ratio=self.cfg.jitter_ratio)
-        self.right_clicker = AutoClicker(Button.right, cps=self.cfg.cps, jitter_ratio=self.cfg.jitter_ratio)
-        self.triggers = TriggerManager()
-
-        self._mode = self.cfg.mode  # 'hold' or 'toggle'
-        self._left_toggled = False
-        self._right_toggled = False
-
-        self._wire_triggers()
-        self.triggers.start()
-
-    def _wire_triggers(self):
-        self.triggers.set_trigger(self.cfg.left_trigger, self._on_left_trigger)
-        self.triggers.set_trigger(self.cfg.right_trigger, self._on_right_trigger)
-
-    def _on_left_trigger(self, pressed: bool):
-        if self._mode == "hold":
-            if pressed:
-                self.left_clicker.start()
-            else:
-                self.left_clicker.stop()
-        else:
-            if pressed:
-                self._left_toggled = not self._left_toggled
-                if self._left_toggled:
-                    self.left_clicker.start()
-                else:
-                    self.left_clicker.stop()
-
-    def _on_right_trigger(self, pressed: bool):
-        if self._mode == "hold":
-            if pressed:
-                self.right_clicker.start()
-            else:
-                self.right_clicker.stop()
-        else:
-            if pressed:
-                self._right_toggled = not self._right_toggled
-                if self._right_toggled:
-                    self.right_clicker.start()
-                else:
-                    self.right_clicker.stop()
-
-    def apply_settings(self, new_cfg):
-        self._mode = new_cfg.mode
-        self.left_clicker.set_rate(new_cfg.cps)
-        self.right_clicker.set_rate(new_cfg.cps)
-        self.left_clicker.set_jitter(new_cfg.jitter_ratio)
-        self.right_clicker.set_jitter(new_cfg.jitter_ratio)
-
-        # Rebind triggers if changed
-        if new_cfg.left_trigger != self.cfg.left_trigger:
-            self.triggers.set_trigger(new_cfg.left_trigger, self._on_left_trigger)
-        if new_cfg.right_trigger != self.cfg.right_trigger:
-            self.triggers.set_trigger(new_cfg.right_trigger, self._on_right_trigger)
-
-        self.cfg = new_cfg
-        save_config(self.cfg)
-
-    def shutdown(self):
-        self.left_clicker.shutdown()
-        self.right_clicker.shutdown()
-        self.triggers.stop()
-
-
-def main():
-    app = QApplication(sys.argv)
-    controller = AppController()
-    win = MainWindow(controller.cfg)
+import threading
+
+from baseclick.controller import AppController
+
+# Qt is only imported by the GUI and tray modes, so --headless never loads it.
+
+
+def create_window(controller: AppController):
+    from baseclick.ui.main_window import MainWindow
+
+    win = MainWindow(controller.cfg, stats=controller.stats if controller.cfg.show_stats else None)
 
     def on_settings_changed(cfg):
         controller.apply_settings(cfg)
 
     def on_request_bind(side: str):
-        # Start capture: accept mouse side buttons and any key
+        # Start capture: mouse buttons, keys, or either with modifiers held
         def _captured(token: str):
             # Update config and UI on capture
-            if side == 'left':
-                controller.cfg.left_trigger = token
-                controller.triggers.set_trigger(token, controller._on_left_trigger)
-                win.bound_token_captured.emit('left', token)
-            else:
-                controller.cfg.right_trigger = token
-                controller.triggers.set_trigger(token, controller._on_right_trigger)
-                win.bound_token_captured.emit('right', token)
-            save_config(controller.cfg)
+            controller.bind(side, token)
+            win.bound_token_captured.emit(side, token)
 
         controller.triggers.capture_once(_captured, allow={"mouse", "key"})
 
     win.settings_changed.connect(on_settings_changed)
+    win.save_requested.connect(controller.save_settings)
     win.request_bind.connect(on_request_bind)
+    # Hot reloads arrive on the watcher thread; the signal queues them to Qt
+    listener = win.config_reloaded.emit
+    controller.reload_listeners.append(listener)
+    win.destroyed.connect(lambda: controller.reload_listeners.remove(listener))
+    return win
+
+
+def create_tray(app, controller: AppController):
+    # Tray icon only; the window is built when opened and destroyed when
+    # closed, so nothing but the icon stays resident between uses.
+    from PySide6.QtCore import Qt
+    from PySide6.QtWidgets import QMenu, QStyle, QSystemTrayIcon
+
+    app.setQuitOnLastWindowClosed(False)
+    tray = QSystemTrayIcon(app.style().standardIcon(QStyle.SP_ComputerIcon), app)
+    tray.setToolTip("BaseClick")
+    state = {"win": None}
+
+    def forget_window():
+        state["win"] = None
+
+    def show_window():
+        win = state["win"]
+        if win is None:
+            win = create_window(controller)
+            win.setAttribute(Qt.WA_DeleteOnClose)
+            win.destroyed.connect(forget_window)
+            state["win"] = win
+        win.show()
+        win.raise_()
+        win.activateWindow()
+
+    def on_activated(reason):
+        if reason in (QSystemTrayIcon.Trigger, QSystemTrayIcon.DoubleClick):
+            show_window()
+
+    menu = QMenu()
+    menu.addAction("Settings…", show_window)
+    menu.addSeparator()
+    menu.addAction("Quit", app.quit)
+    tray.setContextMenu(menu)
+    tray.activated.connect(on_activated)
+    tray._menu = menu  # keep a Python reference alive
+    tray.show()
+    return tray
+
+
+def run_gui() -> int:
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication(sys.argv)
+    controller = AppController()
+    win = create_window(controller)
     win.show()
 
     rc = app.exec()
     controller.shutdown()
-    sys.exit(rc)
+    return rc
+
+
+def run_tray() -> int:
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication(sys.argv)
+    controller = AppController()
+    tray = create_tray(app, controller)
+
+    rc = app.exec()
+    tray.hide()
+    controller.shutdown()
+    return rc
+
+
+def run_headless() -> int:
+    # Runs from config.json with no UI until Ctrl+C / SIGTERM
+    import signal
+
+    controller = AppController()
+    stop = threading.Event()
+
+    def on_signal(signum, frame):
+        stop.set()
+
+    signal.signal(signal.SIGINT, on_signal)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, on_signal)
+    # Timed wait so Ctrl+C is noticed on Windows too
+    while not stop.wait(1.0):
+        pass
+    controller.shutdown()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="baseclick")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--headless", action="store_true", help="run from config.json without any UI (Qt is never loaded)")
+    group.add_argument("--tray", action="store_true", help="run from the system tray; the window is created on demand")
+    args = parser.parse_args(argv)
+
+    if args.headless:
+        sys.exit(run_headless())
+    if args.tray:
+        sys.exit(run_tray())
+    sys.exit(run_gui())
 
 
 if __name__ == "__main__":
+    # Frozen builds re-run this script for the engine_process worker
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,55 @@
+import gc
+import os
+import sys
+
+import pytest
+
+# Tests run headless: pynput is replaced by the benchmark stand-ins before
+# anything from baseclick is imported.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.headless import install  # noqa: E402
+
+install()
+
+from baseclick.config import AppConfig  # noqa: E402
+from baseclick.controller import AppController  # noqa: E402
+from baseclick.scheduler import ClickScheduler  # noqa: E402
+
+
+@pytest.fixture
+def scheduler():
+    s = ClickScheduler()
+    yield s
+    s.shutdown()
+    if s.quiet_gc:
+        gc.unfreeze()  # set_quiet_gc(True) froze everything alive
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    return os.path.join(tmp_path, "config.json")
+
+
+@pytest.fixture
+def make_controller(config_path):
+    # Writes a recording-backend config with the given fields and starts a
+    # controller on it; every controller made is shut down after the test.
+    made = []
+
+    def make(**fields):
+        fields.setdefault("backend", "recording")
+        fields.setdefault("hot_reload", False)
+        with open(config_path, "w", encoding="utf-8") as f:
+            f.write(AppConfig(**fields).to_json())
+        made.append(AppController(config_path))
+        return made[-1]
+
+    yield make
+    for controller in made:
+        controller.shutdown()
+
+
+@pytest.fixture
+def controller(make_controller):
+    return make_controller()
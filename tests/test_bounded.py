@@ -0,0 +1,37 @@
+import time
+
+from pynput.mouse import Button
+
+from baseclick.backends import RecordingBackend
+from baseclick.clicker import AutoClicker
+
+
+def _wait(clicker, timeout):
+    deadline = time.perf_counter() + timeout
+    while clicker.is_active() and time.perf_counter() < deadline:
+        time.sleep(0.005)
+
+
+def test_count_run_clicks_exactly_n(scheduler):
+    for count, cps in ((1, 50), (25, 200), (500, 0)):
+        backend = RecordingBackend()
+        clicker = AutoClicker(Button.left, cps=max(1, cps), jitter_ratio=0.25, scheduler=scheduler, backend=backend)
+        assert clicker.run_bounded(count=count, cps=cps) == count
+        _wait(clicker, 5.0)
+        assert not clicker.is_active()
+        assert len(backend.events) == count
+
+
+def test_duration_run_stops_within_its_bound(scheduler):
+    duration, cps = 0.25, 100
+    backend = RecordingBackend()
+    clicker = AutoClicker(Button.left, cps=cps, jitter_ratio=0.0, scheduler=scheduler, backend=backend)
+    t0 = time.perf_counter()
+    scheduled = clicker.run_bounded(duration=duration)
+    _wait(clicker, duration + 2.0)
+    stamps = [t for t, _ in backend.events]
+    # No click is scheduled at or past the bound; allow one late wakeup
+    assert stamps[-1] - t0 < duration + 0.02
+    assert len(stamps) == scheduled and abs(scheduled - duration * cps) <= 1
+    time.sleep(0.05)
+    assert len(backend.events) == len(stamps)
@@ -0,0 +1,46 @@
+import os
+import time
+from dataclasses import replace
+
+import pytest
+
+from baseclick.config import AppConfig, ConfigStore, load_config
+
+
+@pytest.fixture
+def path(config_path):
+    return config_path
+
+
+def test_store_coalesces_slider_drag(path):
+    cfg = AppConfig()
+    store = ConfigStore(cfg, path=path, delay=0.1, max_delay=0.5)
+    for step in range(100):
+        cfg = replace(cfg, cps=1 + step)
+        store.update(cfg)
+        time.sleep(0.002)
+    assert store.writes <= 1
+    store.close()
+    assert 1 <= store.writes <= 2
+    assert load_config(path).cps == 100
+    assert store.written[1] is cfg
+
+
+def test_store_writes_nothing_when_clean(path):
+    store = ConfigStore(AppConfig(), path=path)
+    store.update(AppConfig(cps=30), dirty=False)
+    store.close()
+    assert store.writes == 0
+    assert not os.path.exists(path)
+
+
+def test_controller_save_goes_through_store(controller, path):
+    cfg = replace(controller.cfg, cps=42)
+    controller.save_settings(cfg)
+    assert controller.store.writes == 1
+    assert controller.store.written[1] is cfg
+    assert load_config(path).cps == 42
+    assert controller.cfg.cps == 42
+    # Saving again writes even though nothing changed
+    controller.save_settings(cfg)
+    assert controller.store.writes == 2
@@ -0,0 +1,55 @@
+import json
+import os
+
+import pytest
+
+from baseclick.control import FRAME, ControlClient, ControlServer, encode
+
+
+@pytest.fixture
+def server(controller, tmp_path):
+    return ControlServer(controller, os.path.join(tmp_path, "control.sock"))
+
+
+def _call(server, **request):
+    return server.handle(json.dumps(request).encode())
+
+
+def test_commands(server):
+    assert _call(server, cmd="ping", id=3) == {"ok": True, "id": 3}
+    assert _call(server, cmd="set_rate", cps=40)["ok"]
+    assert server.controller.cfg.cps == 40
+    assert not _call(server, cmd="nope")["ok"]
+    assert not server.handle(b"[1]")["ok"]
+
+
+def test_unresponsive_engine_is_an_error_reply(server):
+    def stuck(request):
+        raise TimeoutError("click engine process is not responding")
+
+    server._handlers["start"] = stuck
+    response = _call(server, cmd="start", id=1)
+    assert response == {"ok": False, "error": "TimeoutError: click engine process is not responding", "id": 1}
+
+
+def test_bad_frames_dont_cost_pipelined_responses(server):
+    assert server.start()
+    overflow = b'{"cmd":"set_rate","cps":1e999,"id":3}'
+    frames = [
+        encode({"cmd": "ping", "id": 1}),
+        FRAME.pack(9) + b"{not json",
+        FRAME.pack(len(overflow)) + overflow,
+        encode({"cmd": "set_rate", "cps": 25, "id": 4}),
+        encode({"cmd": "ping", "id": 5}),
+    ]
+    try:
+        with ControlClient(server.path, timeout=5.0) as client:
+            client._sock.sendall(b"".join(frames))
+            responses = [client._read() for _ in frames]
+            assert client.call("ping", id=6) == {"ok": True, "id": 6}
+    finally:
+        server.stop()
+    assert [r["ok"] for r in responses] == [True, False, False, True, True]
+    assert [r.get("id") for r in responses] == [1, None, 3, 4, 5]
+    assert responses[2]["error"].startswith("OverflowError")
+    assert server.controller.cfg.cps == 25
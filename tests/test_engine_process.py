@@ -0,0 +1,57 @@
+import os
+import time
+from dataclasses import replace
+
+import pytest
+
+from baseclick import trace
+from baseclick.config import Profile
+from baseclick.control import ControlServer
+from baseclick.engine_process import RemoteEngine
+from benchmarks.bench_engine import stub_worker
+
+
+@pytest.fixture
+def engine_controller(make_controller, tmp_path, monkeypatch):
+    from baseclick import engine_process
+    monkeypatch.setattr(engine_process, "worker_main", stub_worker)
+    return make_controller(
+        engine_process=True, trace_path=os.path.join(tmp_path, "trace.bin"),
+        profiles={"fast": Profile(cps=60), "slow": Profile(cps=5)}, active_profile="slow",
+    )
+
+
+def test_worker_owns_the_trace(engine_controller):
+    assert isinstance(engine_controller.engine, RemoteEngine)
+    assert trace.current is None
+
+
+def test_switching_engines_moves_the_trace(engine_controller):
+    engine_controller.apply_settings(replace(engine_controller.cfg, engine_process=False), persist=False)
+    assert trace.current is not None
+    engine_controller.apply_settings(replace(engine_controller.cfg, engine_process=True), persist=False)
+    assert isinstance(engine_controller.engine, RemoteEngine)
+    assert trace.current is None
+
+
+def test_summary_gives_up_on_a_torn_publish(engine_controller):
+    engine = engine_controller.engine
+    fresh = engine.summary()
+    engine.block.set("stats_seq", engine.block.get("stats_seq") | 1)  # writer died mid-publish
+    t0 = time.monotonic()
+    assert engine.summary() == fresh
+    assert time.monotonic() - t0 < 0.5
+
+
+def test_remote_engine_leaves_the_local_side_idle(engine_controller):
+    # No local injection device, calibration or scheduler thread tuning
+    assert engine_controller.backend is None
+    assert engine_controller.scheduler._thread is None
+    engine_controller.apply_settings(replace(engine_controller.cfg, thread_policy="fifo"), persist=False)
+    assert engine_controller.scheduler._thread is None
+
+
+def test_stats_report_the_workers_profile(engine_controller, tmp_path):
+    server = ControlServer(engine_controller, os.path.join(tmp_path, "control.sock"))
+    assert engine_controller.engine.active == "slow"
+    assert server.handle(b'{"cmd":"stats"}')["profile"] == "slow"
@@ -0,0 +1,93 @@
+import gc
+import threading
+import time
+import tracemalloc
+
+from pynput.mouse import Button
+
+from baseclick.backends import InjectionBackend
+from baseclick.clicker import AutoClicker
+from baseclick.telemetry import Telemetry
+
+
+class NullBackend(InjectionBackend):
+    name = "null"
+
+    def click(self, button):
+        pass
+
+
+def _garbage(stop):
+    # A neighbour thread that keeps making reference cycles
+    keep = []
+    while not stop.is_set():
+        for _ in range(2000):
+            a = {}
+            a["self"] = a
+            keep.append([a] * 8)
+        if len(keep) > 50000:
+            keep.clear()
+        time.sleep(0.001)
+
+
+def _collections_while_clicking(scheduler, seconds=0.5):
+    telemetry = Telemetry()
+    clicker = AutoClicker(Button.left, cps=500, jitter_ratio=0.0, backend=NullBackend(), telemetry=telemetry, scheduler=scheduler)
+    passes = [0]
+
+    def counter(phase, info):
+        if phase == "stop":
+            passes[0] += 1
+
+    stop = threading.Event()
+    noise = threading.Thread(target=_garbage, args=(stop,), daemon=True)
+    noise.start()
+    try:
+        clicker.start()
+        while not telemetry.clicks:
+            time.sleep(0.001)
+        gc.callbacks.append(counter)
+        try:
+            time.sleep(seconds)
+        finally:
+            gc.callbacks.remove(counter)
+        clicker.stop()
+    finally:
+        stop.set()
+        noise.join()
+    return passes[0]
+
+
+def test_no_collections_while_clicking_in_low_jitter_mode(scheduler):
+    scheduler.set_quiet_gc(True)
+    assert _collections_while_clicking(scheduler) == 0
+
+
+def test_gc_back_on_when_idle(scheduler):
+    scheduler.set_quiet_gc(True)
+    _collections_while_clicking(scheduler, seconds=0.05)
+    deadline = time.perf_counter() + 1.0
+    while not gc.isenabled() and time.perf_counter() < deadline:
+        time.sleep(0.001)
+    assert gc.isenabled()
+
+
+def test_click_path_does_not_allocate(scheduler):
+    clicker = AutoClicker(Button.left, cps=1000, backend=NullBackend(), telemetry=Telemetry(), scheduler=scheduler)
+    clicker._active = True
+    deadline = time.perf_counter()
+    for _ in range(4096):  # interval blocks, rings and caches in place
+        deadline = clicker._fire(deadline)
+    gc.disable()
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        tracked = gc.get_count()[0]
+        for _ in range(20000):
+            deadline = clicker._fire(deadline)
+        current, _ = tracemalloc.get_traced_memory()
+        assert gc.get_count()[0] - tracked == 0
+        assert current - base < 1024
+    finally:
+        tracemalloc.stop()
+        gc.enable()
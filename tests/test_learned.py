@@ -0,0 +1,97 @@
+import random
+import statistics
+from array import array
+
+import pytest
+from pynput.mouse import Button
+
+from baseclick import learned
+from baseclick.learned import IntervalRecorder, TimingProfile
+from baseclick.timing import IntervalBuffer
+from baseclick.triggers import TriggerManager
+
+
+@pytest.fixture(autouse=True)
+def timing_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(learned, "TIMING_DIR", str(tmp_path))
+
+
+def _recording(n, seed=7):
+    # 70% quick clicks around 80 ms, 30% around 140 ms, and a pause between
+    # bursts every 200 clicks
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        if i % 200 == 199:
+            out.append(2.0)
+        elif rng.random() < 0.7:
+            out.append(max(0.02, rng.gauss(0.080, 0.008)))
+        else:
+            out.append(max(0.02, rng.gauss(0.140, 0.015)))
+    return out
+
+
+def test_alias_sampling_matches_histogram():
+    rng = random.Random(1)
+    counts = [rng.randint(0, 1000) for _ in range(64)]
+    profile = TimingProfile([0.5 + k / 64 for k in range(65)], counts, 0.1)
+    draws = profile.fill(array("d", bytes(8 * 200_000)), random.Random(2))
+    seen = [0] * 64
+    for v in draws:
+        seen[min(63, int((v - 0.5) * 64))] += 1
+    total = sum(counts)
+    for k in range(64):
+        assert seen[k] / len(draws) == pytest.approx(counts[k] / total, abs=0.003)
+    assert all(seen[k] == 0 for k in range(64) if counts[k] == 0)
+
+
+def test_profile_keeps_rhythm_and_drops_pauses():
+    intervals = _recording(5000)
+    kept = [v for v in intervals if v < 1.0]
+    profile = TimingProfile.from_intervals(intervals)
+    assert profile.samples == len(kept)
+    factors = profile.fill(array("d", bytes(8 * 100_000)), random.Random(3))
+    assert statistics.fmean(factors) == pytest.approx(1.0, abs=0.01)
+    sampled = [f * profile.mean_interval for f in factors]
+    assert sum(v < 0.110 for v in sampled) / len(sampled) == pytest.approx(0.7, abs=0.03)
+    assert statistics.pstdev(sampled) == pytest.approx(statistics.pstdev(kept), rel=0.05)
+
+
+def test_too_few_clicks():
+    with pytest.raises(ValueError):
+        TimingProfile.from_intervals([0.1] * (learned.MIN_SAMPLES - 1))
+
+
+def test_file_round_trip_and_cache():
+    profile = TimingProfile.from_intervals(_recording(2000))
+    profile.save("trip")
+    loaded = learned.load_profile("trip")
+    assert loaded.to_bytes() == profile.to_bytes()
+    assert learned.load_profile("trip") is loaded
+    assert learned.load_profile("missing") is None
+    with pytest.raises(ValueError):
+        learned.profile_path("../escape")
+
+
+def test_interval_buffer_scales_profile_to_rate():
+    TimingProfile.from_intervals(_recording(2000)).save("mine")
+    buffer = IntervalBuffer("learned:mine", 0.25)
+    values = []
+    for _ in range(50_000):
+        values.append(buffer.next())
+        buffer.refill()
+    assert statistics.fmean(values) == pytest.approx(1.0, abs=0.01)
+    assert IntervalBuffer("learned:missing", 0.25).next() > 0
+
+
+def test_recorder_through_trigger_manager():
+    tm = TriggerManager()
+    rec = IntervalRecorder("left")
+    tm.set_recorder(rec)
+    for _ in range(30):
+        tm._on_mouse_click(0, 0, Button.left, True)
+        tm._on_mouse_click(0, 0, Button.left, False)
+        tm._on_mouse_click(0, 0, Button.right, True)
+    tm.set_recorder(None)
+    tm.stop()
+    assert rec.count == 29
@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+
+import pytest
+from pynput import keyboard
+from pynput.mouse import Button
+
+from baseclick.backends import RecordingBackend, UinputBackend
+from baseclick.macro import (
+    HEADER, KEY_CHAR, MAGIC, MOUSE, MOVE, RECORD, VERSION, MacroPlayer, MacroRecorder, read_records,
+)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return os.path.join(tmp_path, "macro.bcm")
+
+
+def _record(path, events):
+    recorder = MacroRecorder(path, flush_every=16)
+    for i in range(events):
+        r = i % 3
+        if r == 0:
+            recorder.move(i, 2 * i)
+        elif r == 1:
+            recorder.mouse(i, 2 * i, Button.left, True)
+        else:
+            recorder.mouse(i, 2 * i, Button.left, False)
+        time.sleep(0.001)
+    recorder.close()
+    return recorder
+
+
+def test_round_trip(path):
+    recorder = _record(path, 120)
+    records = list(read_records(path))
+    assert len(records) == recorder.count == 120
+    assert os.path.getsize(path) == 12 + 120 * RECORD.size
+    assert [r[1] for r in records[:3]] == [MOVE, MOUSE, MOUSE]
+    assert all(b[0] >= a[0] for a, b in zip(records, records[1:]))
+
+
+def test_recorder_writes_off_hook_thread(path):
+    recorder = MacroRecorder(path, flush_every=4)
+    real = recorder._file
+    writers = []
+
+    class File:
+        closed = False
+
+        def write(self, data):
+            writers.append(threading.current_thread())
+            return real.write(data)
+
+        def close(self):
+            real.close()
+
+    recorder._file = File()
+    for i in range(40):
+        recorder.move(i, i)
+    recorder.close()
+    assert writers and threading.current_thread() not in writers
+    assert len(list(read_records(path))) == 40
+
+
+def test_replay_timing(path):
+    _record(path, 60)
+    backend = RecordingBackend()
+    player = MacroPlayer(backend, keyboard_controller=keyboard.Controller())
+    player.play(path)
+    assert player.events == 60
+    assert [a for _, a, _ in backend.inputs].count("move") == 60
+    assert player.stats()["p50"] < 0.001
+
+
+
+class _Keyboard(keyboard.Controller):
+    def __init__(self):
+        self.held = set()
+
+    def press(self, key):
+        self.held.add(key.char)
+
+    def release(self, key):
+        self.held.discard(key.char)
+
+
+def test_stop_is_prompt_and_releases_held_input(path):
+    # Left button and "a" go down, then nothing happens for 10 s
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+        f.write(RECORD.pack(0.0, MOUSE, 1, 0, 5, 5))
+        f.write(RECORD.pack(0.0, KEY_CHAR, 1, ord("a"), 0, 0))
+        f.write(RECORD.pack(10.0, MOVE, 0, 0, 6, 6))
+    backend = RecordingBackend()
+    kb = _Keyboard()
+    player = MacroPlayer(backend, keyboard_controller=kb)
+    player.start(path)
+    deadline = time.perf_counter() + 2.0
+    while player.events < 2 and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    assert kb.held == {"a"}
+    stopped = time.perf_counter()
+    player.stop()
+    player._thread.join(1.0)
+    assert not player._thread.is_alive()
+    assert time.perf_counter() - stopped < 0.1
+    assert player.events == 2
+    assert [a for _, a, _ in backend.inputs] == ["move", "press", "release"]
+    assert not kb.held
+
+def test_uinput_without_screen_rejects_pointer_macro(path, tmp_path):
+    _record(path, 6)
+    fd = os.open(os.path.join(tmp_path, "events"), os.O_WRONLY | os.O_CREAT)
+    backend = UinputBackend(fd=fd)
+    try:
+        player = MacroPlayer(backend)
+        with pytest.raises(ValueError):
+            player.start(path)
+        with pytest.raises(ValueError):
+            player.play(path)
+        assert player.events == 0
+    finally:
+        os.close(fd)
+
+
+def test_uinput_without_screen_plays_key_macro(path, tmp_path):
+    recorder = MacroRecorder(path)
+    recorder.key(keyboard.KeyCode.from_char("a"), True)
+    recorder.key(keyboard.KeyCode.from_char("a"), False)
+    recorder.close()
+    assert [r[1] for r in read_records(path)] == [KEY_CHAR, KEY_CHAR]
+    fd = os.open(os.path.join(tmp_path, "events"), os.O_WRONLY | os.O_CREAT)
+    try:
+        player = MacroPlayer(UinputBackend(fd=fd), keyboard_controller=keyboard.Controller())
+        player.play(path)
+        assert player.events == 2
+    finally:
+        os.close(fd)
@@ -0,0 +1,67 @@
+import os
+import time
+
+import pytest
+from pynput.mouse import Button
+
+from baseclick.backends import EV_ABS, INPUT_EVENT, RecordingBackend, UinputBackend
+from baseclick.bindings import BindingEngine
+from baseclick.clicker import AutoClicker
+from baseclick.config import AppConfig, Binding
+from baseclick.triggers import TriggerManager
+
+
+@pytest.fixture
+def events_fd(tmp_path):
+    fd = os.open(os.path.join(tmp_path, "events"), os.O_RDWR | os.O_CREAT)
+    yield fd
+    os.close(fd)
+
+
+def test_cycle_advances_once_per_click(scheduler):
+    backend = RecordingBackend()
+    clicker = AutoClicker(Button.left, scheduler=scheduler, backend=backend)
+    clicker.set_position("cycle", [(1, 2), (3, 4), (5, 6)])
+    clicker.run_bounded(count=7, cps=200)
+    deadline = time.perf_counter() + 2.0
+    while clicker.is_active() and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    moves = [arg for _, kind, arg in backend.inputs if kind == "move"]
+    assert moves == [(1, 2), (3, 4), (5, 6), (1, 2), (3, 4), (5, 6), (1, 2)]
+
+
+def test_uinput_with_screen_sends_move_and_click_in_one_write(events_fd):
+    backend = UinputBackend(fd=events_fd, screen=(1920, 1080))
+    backend.click_at(100, 200, Button.left)
+    data = os.pread(events_fd, 4096, 0)
+    events = list(INPUT_EVENT.iter_unpack(data))
+    assert [(e[2], e[4]) for e in events[:2]] == [(EV_ABS, 100), (EV_ABS, 200)]
+    assert len(events) == 6  # ABS_X, ABS_Y, press, SYN, release, SYN
+
+
+def test_aimed_binding_on_relative_uinput_fails_at_bind_time(scheduler, events_fd):
+    clicker = AutoClicker(Button.left, scheduler=scheduler, backend=UinputBackend(fd=events_fd))
+    clicker.set_position("cursor")
+    with pytest.raises(ValueError, match="screen_size"):
+        clicker.set_position("fixed", [(10, 10)])
+
+
+def test_unreachable_position_falls_back_to_cursor(scheduler, events_fd):
+    # Neither compiling nor a later edit may raise out of apply(): that would
+    # take down controller startup, the engine worker and hot reload
+    engine = BindingEngine(TriggerManager(), scheduler, UinputBackend(fd=events_fd))
+    aimed = Binding("key:f6", position="fixed", points=[[10, 10]])
+    engine.apply(AppConfig(bindings=[aimed]))
+    assert engine.actions[0].clicker._aim is None
+    [(profile, trigger, error)] = engine.errors
+    assert (profile, trigger) == ("", "key:f6") and "screen_size" in str(error)
+    engine.apply(AppConfig(bindings=[Binding("key:f6")]))
+    assert engine.errors == []
+    engine.apply(AppConfig(bindings=[aimed]))
+    assert engine.actions[0].clicker._aim is None and len(engine.errors) == 1
+    engine.stop_all()
+
+
+def test_screen_size_round_trips():
+    cfg = AppConfig(backend="uinput", screen_size=[2560, 1440], bindings=[Binding("key:f6", position="fixed", points=[[1, 1]])])
+    assert AppConfig.from_json(cfg.to_json()).screen_size == [2560, 1440]
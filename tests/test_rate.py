@@ -0,0 +1,85 @@
+import random
+import time
+
+import pytest
+from pynput.mouse import Button
+
+from baseclick.backends import RecordingBackend
+from baseclick.clicker import AutoClicker
+from baseclick.scheduler import ClickScheduler, spin_until
+from baseclick.timing import RateController
+
+PERIOD = 0.01
+
+
+def _simulate(rate, clicks, noise=0.0, stall=0.0, stall_every=0, jitter=0.0, seed=1):
+    # Absolute deadlines as AutoClicker keeps them; a stall pushes every
+    # later deadline back, as skipping to `now` does
+    rng = random.Random(seed)
+    target = 1.0
+    base = 0.0
+    for i in range(clicks):
+        done = target + rng.gauss(0.0, noise)
+        rate.observe(done, done, base)
+        base = PERIOD * rng.uniform(1 - jitter, 1 + jitter)
+        target += base * rate.scale
+        if stall_every and i % stall_every == stall_every - 1:
+            target += stall
+
+
+def test_timing_noise_leaves_scale_alone():
+    rate = RateController(enabled=True)
+    _simulate(rate, 2000, noise=0.0005, jitter=0.25)
+    assert rate.scale == pytest.approx(1.0, abs=0.002)
+    assert rate.converged
+
+
+def test_lost_time_is_made_up():
+    # 20 ms lost every 16 clicks is 12.5% of the time at 100 cps
+    rate = RateController(enabled=True)
+    _simulate(rate, 1600, noise=0.0005, stall=0.02, stall_every=16)
+    assert rate.scale == pytest.approx(0.875, abs=0.005)
+    assert rate.converged
+
+
+def test_disabled_only_measures():
+    rate = RateController(enabled=False)
+    _simulate(rate, 640, stall=0.02, stall_every=16)
+    assert rate.scale == 1.0
+    assert rate.error == pytest.approx(0.125, abs=0.005)
+
+
+class StallingBackend(RecordingBackend):
+    # Stalls for `stall` every `every` clicks, enough to make the clicker skip
+    def __init__(self, stall: float, every: int) -> None:
+        super().__init__()
+        self.stall = stall
+        self.every = every
+
+    def click(self, button):
+        if len(self.events) % self.every == self.every - 1:
+            spin_until(time.perf_counter() + self.stall)
+        super().click(button)
+
+
+def _tail_error(feedback: bool, cps: int = 100, seconds: float = 3.0) -> float:
+    scheduler = ClickScheduler()
+    backend = StallingBackend(0.03, 25)
+    try:
+        clicker = AutoClicker(Button.left, cps=cps, jitter_ratio=0.0, scheduler=scheduler, backend=backend, feedback=feedback)
+        clicker.start()
+        time.sleep(seconds)
+        clicker.stop()
+    finally:
+        scheduler.shutdown()
+    stamps = [t for t, _ in backend.events]
+    tail = stamps[len(stamps) // 2:]
+    return ((len(tail) - 1) / (tail[-1] - tail[0]) - cps) / cps
+
+
+def test_feedback_improves_rate_under_stalls():
+    off = _tail_error(False)
+    on = _tail_error(True)
+    assert off < -0.05
+    assert abs(on) < 0.02
+    assert abs(on) < abs(off) / 4
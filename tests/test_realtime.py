@@ -0,0 +1,33 @@
+import threading
+
+from baseclick import realtime
+from baseclick.config import AppConfig
+
+
+def _tune(**kwargs):
+    out = {}
+    thread = threading.Thread(target=lambda: out.update(realtime.tune_current_thread(**kwargs)))
+    thread.start()
+    thread.join()
+    return out
+
+
+def test_reports_every_setting():
+    report = _tune()
+    assert set(report) == {"policy", "affinity", "timer_slack"}
+    assert report["policy"][0]
+
+
+def test_unknown_policy_is_reported_not_raised():
+    assert _tune(policy="batch")["policy"] == (False, "unknown policy 'batch'")
+
+
+def test_timer_slack_skipped_off_linux(monkeypatch):
+    monkeypatch.setattr(realtime.sys, "platform", "win32")
+    assert realtime._set_timer_slack(0) == (True, "unsupported")
+    assert realtime._set_timer_slack(1000) == (False, "unsupported")
+
+
+def test_config_rejects_bad_thread_policy():
+    assert AppConfig.from_json('{"thread_policy": "fifo"}').thread_policy == "fifo"
+    assert AppConfig.from_json('{"thread_policy": "realtime"}').thread_policy == "normal"
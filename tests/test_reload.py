@@ -0,0 +1,115 @@
+import json
+import sys
+import time
+from dataclasses import replace
+
+import pytest
+
+
+@pytest.fixture
+def path(config_path):
+    return config_path
+
+
+@pytest.fixture
+def controller(make_controller):
+    controller = make_controller()
+    applied = []
+    real_apply = controller.engine.apply
+
+    def counting_apply(cfg):
+        applied.append(cfg)
+        real_apply(cfg)
+
+    controller.engine.apply = counting_apply
+    controller.applied = applied
+    return controller
+
+
+def _edit(path, **changes):
+    # An external editor rewriting the file in place
+    with open(path, "r", encoding="utf-8") as f:
+        obj = json.load(f)
+    obj.update(changes)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2)
+
+
+def test_applies_only_changed_fields(controller, path):
+    clicker = controller.engine.actions[0].clicker
+    listener = controller.triggers._mouse_listener
+    controller.apply_settings(replace(controller.cfg, jitter_ratio=0.1))  # unsaved window edit
+    _edit(path, cps=33)
+    assert controller.reload_config() == {"cps"}
+    assert controller.cfg.cps == 33
+    assert controller.cfg.jitter_ratio == 0.1
+    assert clicker._cps == 33
+    assert controller.engine.actions[0].clicker is clicker
+    assert controller.triggers._mouse_listener is listener
+    assert controller.reload_config() == set()  # same file again
+    assert len(controller.applied) == 2
+
+
+def test_own_writes_are_not_reapplied(controller):
+    controller.apply_settings(replace(controller.cfg, cps=44))
+    controller.store.flush()
+    before = len(controller.applied)
+    assert controller.reload_config() == set()
+    assert len(controller.applied) == before
+    assert controller.store.writes == 1
+
+
+def test_half_saved_file_is_ignored(controller, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"cps": 9')
+    assert controller.reload_config() == set()
+    assert controller.cfg.cps != 9
+
+
+def test_rebind_stops_running_clicker(controller, path):
+    clicker = controller.engine.actions[0].clicker
+    clicker.start()
+    _edit(path, left_trigger="key:ctrl+f6")
+    assert controller.reload_config() == {"left_trigger"}
+    assert not clicker.is_active()
+    assert "key:ctrl+f6" in controller.triggers._callbacks
+
+
+def test_watcher_picks_up_edits(controller, path):
+    controller.apply_settings(replace(controller.cfg, hot_reload=True), persist=False)
+    assert controller.watcher is not None
+    if sys.platform.startswith("linux"):
+        assert controller.watcher.mode == "inotify"
+    reloaded = []
+    controller.reload_listeners.append(lambda cfg: reloaded.append((time.perf_counter(), cfg)))
+    _edit(path, cps=27)
+    saved = time.perf_counter()
+    deadline = saved + 5.0
+    while not reloaded and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    assert reloaded and reloaded[0][1].cps == 27
+    assert controller.engine.actions[0].clicker._cps == 27
+    # inotify wakes the watcher on the write itself; polling would take up
+    # to POLL_INTERVAL (0.25 s)
+    if controller.watcher.mode == "inotify":
+        assert reloaded[0][0] - saved < 0.1
+
+
+def test_backend_edit_rebuilds_the_engine(controller, path):
+    backend = controller.backend
+    closed = []
+    backend.close = lambda: closed.append(backend)
+    clicker = controller.engine.actions[0].clicker
+    _edit(path, screen_size=[1920, 1080])
+    assert controller.reload_config() == {"screen_size"}
+    assert controller.backend is not backend
+    assert closed == [backend]
+    action = controller.engine.actions[0]
+    assert action.clicker is not clicker
+    assert action.clicker._backend is controller.backend
+    action.on_trigger(True)
+    deadline = time.perf_counter() + 2.0
+    while not controller.backend.events and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    action.on_trigger(False)
+    assert controller.backend.events
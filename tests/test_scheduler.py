@@ -0,0 +1,63 @@
+import threading
+import time
+
+import pytest
+from pynput.mouse import Button
+
+from baseclick.backends import RecordingBackend
+from baseclick.clicker import AutoClicker
+
+# Achieved rate must match set_rate() within this fraction
+RATE_TOLERANCE = 0.01
+
+
+def _achieved_cps(events):
+    times = [t for t, _ in events]
+    return (len(times) - 1) / (times[-1] - times[0])
+
+
+@pytest.mark.parametrize("cps", [15, 60, 100])
+def test_achieved_rate_matches_set_rate(scheduler, cps):
+    backend = RecordingBackend()
+    clicker = AutoClicker(Button.left, cps=cps, jitter_ratio=0.0, scheduler=scheduler, backend=backend, feedback=False)
+    clicker.start()
+    time.sleep(1.0)
+    clicker.stop()
+    assert len(backend.events) >= cps * 0.9
+    assert abs(_achieved_cps(backend.events) - cps) / cps < RATE_TOLERANCE
+
+
+def test_no_wakeups_while_idle(scheduler):
+    clicker = AutoClicker(Button.left, cps=50, jitter_ratio=0.0, scheduler=scheduler, backend=RecordingBackend())
+    clicker.start()
+    time.sleep(0.05)
+    clicker.stop()
+    time.sleep(0.05)  # the thread drops the stopped entry, then blocks
+    before = scheduler.wakeups
+    time.sleep(0.5)
+    assert scheduler.wakeups == before
+
+
+def test_start_to_first_click_latency(scheduler):
+    clicked = threading.Event()
+
+    class Backend(RecordingBackend):
+        def click(self, button):
+            super().click(button)
+            clicked.set()
+
+    backend = Backend()
+    clicker = AutoClicker(Button.left, cps=10, jitter_ratio=0.0, scheduler=scheduler, backend=backend)
+    latencies = []
+    for _ in range(20):
+        backend.events.clear()
+        clicked.clear()
+        t0 = time.perf_counter()
+        clicker.start()
+        # Block rather than spin, so the scheduler thread isn't waiting on the GIL
+        assert clicked.wait(1.0)
+        clicker.stop()
+        latencies.append(backend.events[0][0] - t0)
+        time.sleep(0.01)
+    latencies.sort()
+    assert latencies[len(latencies) // 2] < 0.001
@@ -0,0 +1,71 @@
+import threading
+import time
+
+from pynput.mouse import Button
+
+from baseclick.backends import RecordingBackend
+from baseclick.clicker import AutoClicker
+from baseclick.telemetry import RingBuffer, Telemetry, percentiles
+
+
+def test_percentiles_pick_nearest_rank():
+    out = percentiles([float(v) for v in range(100, 0, -1)])
+    assert out == {"count": 100.0, "p50": 51.0, "p90": 90.0, "p99": 99.0, "max": 100.0}
+    assert percentiles([]) == {"count": 0.0, "p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+    assert percentiles([3.0], qs=(0, 100)) == {"count": 1.0, "p0": 3.0, "p100": 3.0, "max": 3.0}
+
+
+def test_ring_keeps_the_newest_in_order():
+    ring = RingBuffer(5)  # rounded up to 8
+    for v in range(20):
+        ring.append(float(v))
+    assert ring.snapshot() == [float(v) for v in range(12, 20)]
+    ring.clear()
+    assert ring.snapshot() == []
+
+
+def test_summary():
+    t = Telemetry()
+    previous = 0.0
+    for i in range(1, 11):
+        now = 100.0 + i * 0.01
+        t.click(now, now - 0.001 * (i % 3), previous)
+        previous = now
+    t.first_click(100.02, 100.0)
+    summary = t.summary()
+    assert summary["clicks"] == 10
+    assert summary["interval"]["count"] == 9
+    assert abs(summary["interval"]["p50"] - 0.01) < 1e-9
+    assert abs(summary["interval_error"]["max"] - 0.002) < 1e-9
+    assert abs(summary["trigger_latency"]["p50"] - 0.02) < 1e-9
+
+
+def test_trigger_records_presses_per_token():
+    t = Telemetry()
+    t.trigger("key:f6", True)
+    t.trigger("key:f6", False)
+    t.trigger("mouse:x1", True)
+    assert t.trigger_events.count == 2
+    assert set(t.pressed_at) == {"key:f6", "mouse:x1"}
+    assert t.pressed_at["key:f6"] < t.pressed_at["mouse:x1"]
+
+
+def test_latency_is_charged_to_the_clickers_own_trigger(scheduler):
+    # A press on another token just before must not shorten the latency
+    t = Telemetry()
+    clicked = threading.Event()
+
+    class Backend(RecordingBackend):
+        def click(self, button):
+            super().click(button)
+            clicked.set()
+
+    clicker = AutoClicker(Button.left, cps=20, scheduler=scheduler, backend=Backend(), telemetry=t)
+    clicker.trigger = "key:f6"
+    t.trigger("key:f6", True)
+    time.sleep(0.05)
+    t.trigger("key:f7", True)
+    clicker.start()
+    assert clicked.wait(2.0)
+    clicker.stop()
+    assert t.trigger_latency.snapshot()[0] >= 0.05
@@ -0,0 +1,39 @@
+import math
+import random
+import statistics
+
+import pytest
+
+from baseclick.timing import DISTRIBUTIONS, IntervalBuffer, interval_factors
+
+DRAWS = 100_000
+
+
+@pytest.mark.parametrize("jitter", [0.1, 0.25, 0.6, 0.9])
+@pytest.mark.parametrize("distribution", DISTRIBUTIONS)
+def test_factor_mean_and_spread(distribution, jitter):
+    # Every distribution keeps mean 1 and the uniform's std, jitter / sqrt(3)
+    factors = interval_factors(distribution, jitter, DRAWS, random.Random(1))
+    assert statistics.fmean(factors) == pytest.approx(1.0, abs=0.01)
+    assert statistics.pstdev(factors) == pytest.approx(jitter / math.sqrt(3), rel=0.02)
+    assert min(factors) > 0
+
+
+def test_gaussian_stays_within_bounds():
+    factors = interval_factors("gaussian", 0.9, DRAWS, random.Random(2))
+    assert 0.05 <= min(factors) and max(factors) <= 1.95
+
+
+def test_zero_jitter_is_exact():
+    for distribution in DISTRIBUTIONS:
+        assert set(interval_factors(distribution, 0.0, 64)) == {1.0}
+
+
+def test_buffer_swaps_and_refills():
+    buffer = IntervalBuffer("uniform", 0.25, block_size=16)
+    values = []
+    for _ in range(100):
+        values.append(buffer.next())
+        buffer.refill()
+    assert all(0.75 <= v <= 1.25 for v in values)
+    assert len(set(values)) > 90
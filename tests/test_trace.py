@@ -0,0 +1,74 @@
+import os
+import threading
+
+import pytest
+
+from baseclick.trace import CLICK, EDGE, START, STOP, TraceFile, Tracer, analyze
+
+
+@pytest.fixture
+def path(tmp_path):
+    return os.path.join(tmp_path, "trace.bin")
+
+
+def test_round_trip_pairs_runs(path):
+    tracer = Tracer(path, capacity=64)
+    tracer.name_clicker(1, "left")
+    tracer.edge(1.000, "key:f6", True)
+    tracer.start(1.010, 1, 1)
+    for n, t in enumerate((1.020, 1.030, 1.045)):
+        tracer.click(t, 1, n, t - 0.001)
+    tracer.edge(1.050, "key:f6", False)
+    tracer.stop(1.050, 1, 1)
+    # Started long after the last press (e.g. from the control server)
+    tracer.start(3.000, 1, 2)
+    tracer.click(3.010, 1, 0, 3.010)
+    tracer.stop(3.020, 1, 2)
+    tracer.close()
+
+    trace = TraceFile(path)
+    try:
+        records = trace.records()
+        assert [r[1] for r in records] == [EDGE, START, CLICK, CLICK, CLICK, EDGE, STOP, START, CLICK, STOP]
+        assert trace.tokens == ["key:f6"] and trace.clickers == {1: "left"}
+        report = analyze(trace)
+    finally:
+        trace.close()
+    assert report["counts"] == {"edge": 2, "start": 2, "stop": 2, "click": 4}
+    assert report["dropped"] == 0
+    left = report["clickers"]["left"]
+    assert left["clicks"] == 4
+    # Intervals only within a run: 10 ms and 15 ms, none across runs
+    assert left["interval_us"]["count"] == 2
+    assert round(left["interval_us"]["max"]) == 15000
+    assert round(left["schedule_error_us"]["max"]) == 1000
+    # Only the first run follows a press
+    assert report["trigger_to_start_us"]["count"] == 1
+    assert round(report["trigger_to_start_us"]["p50"]) == 10000
+    assert round(report["trigger_to_click_us"]["p50"]) == 20000
+
+
+def test_wrapped_ring_keeps_the_newest(path):
+    tracer = Tracer(path, capacity=8)
+    for n in range(20):
+        tracer.click(float(n), 1, n, float(n))
+    tracer.close()
+    trace = TraceFile(path)
+    try:
+        records = trace.records()
+        report = analyze(trace)
+    finally:
+        trace.close()
+    # The flush slot is left empty, so 7 of the last 8 slots hold clicks
+    assert [r[4] for r in records] == list(range(13, 20))
+    assert report["written"] == 20 and report["dropped"] == 12
+
+
+def test_close_waits_for_a_writer_in_flight(path):
+    tracer = Tracer(path, capacity=8)
+    view = memoryview(tracer._map)  # what pack_into holds while packing
+    timer = threading.Timer(0.02, view.release)
+    timer.start()
+    tracer.close()
+    timer.join()
+    assert tracer._map.closed
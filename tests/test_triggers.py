@@ -0,0 +1,196 @@
+import threading
+import time
+
+import pytest
+from pynput import keyboard
+from pynput.mouse import Button
+
+from baseclick.triggers import TriggerManager, normalize_key
+
+Key = keyboard.Key
+
+
+@pytest.fixture
+def tm():
+    manager = TriggerManager()
+    yield manager
+    manager.stop()
+
+
+def test_slow_callback_does_not_block_hook(tm):
+    release = threading.Event()
+    tm.set_trigger("key:f6", lambda pressed: release.wait(1.0))
+    t0 = time.perf_counter()
+    for _ in range(50):
+        tm._on_key_press(Key.f6)
+        tm._on_key_release(Key.f6)
+    elapsed = time.perf_counter() - t0
+    release.set()
+    assert tm.drain(timeout=5.0)
+    assert elapsed < 0.05
+
+
+def test_edges_delivered_while_rebinding(tm):
+    # key:f6 stays bound while another thread rebinds other tokens, so every
+    # f6 edge must reach the callback in order
+    delivered = []
+    tm.set_trigger("key:f6", delivered.append)
+    stop = threading.Event()
+    rebinds = [0]
+
+    def rebinder():
+        while not stop.is_set():
+            for token in ("key:a", "key:b", "mouse:x2"):
+                tm.set_trigger(token, lambda pressed: None)
+                tm.clear_trigger(token)
+                rebinds[0] += 1
+
+    worker = threading.Thread(target=rebinder, daemon=True)
+    worker.start()
+    for _ in range(2000):
+        tm._on_key_press(Key.f6)
+        tm._on_key_release(Key.f6)
+    stop.set()
+    worker.join()
+    assert tm.drain(timeout=5.0)
+    assert rebinds[0] > 0
+    assert delivered == [True, False] * 2000
+
+
+def test_autorepeat_suppressed(tm):
+    delivered = []
+    tm.set_trigger("key:f7", delivered.append)
+    for _ in range(10):
+        for _ in range(30):
+            tm._on_key_press(Key.f7)
+        tm._on_key_release(Key.f7)
+    assert tm.drain(timeout=5.0)
+    assert delivered == [True, False] * 10
+    assert tm.suppressed_repeats == 10 * 29
+
+
+def test_set_trigger_replaces_previous_token_for_callback(tm):
+    class Owner:
+        def on(self, pressed):
+            pass
+
+    owner = Owner()
+    tm.set_trigger("key:f6", owner.on)
+    tm.set_trigger("key:f8", owner.on)  # a fresh bound method, equal not identical
+    assert set(tm._callbacks) == {"key:f8"}
+
+
+def _recorder(fired):
+    def counter(token):
+        def cb(pressed):
+            fired.append((token, pressed))
+        return cb
+    return counter
+
+
+def test_chords_and_shadowing(tm):
+    fired = []
+    counter = _recorder(fired)
+    for token in ("key:f6", "key:ctrl+f6", "key:shift+mouse:x1"):
+        tm.set_trigger(token, counter(token))
+    tm._on_key_press(Key.f6)
+    tm._on_key_release(Key.f6)
+    tm._on_key_press(Key.ctrl_r)
+    tm._on_key_press(Key.f6)  # ctrl+f6, f6 shadowed
+    tm._on_key_release(Key.f6)
+    tm._on_key_release(Key.ctrl_r)
+    tm._on_mouse_click(0, 0, Button.x1, True)  # shift not held
+    tm._on_mouse_click(0, 0, Button.x1, False)
+    tm._on_key_press(Key.shift)
+    tm._on_mouse_click(0, 0, Button.x1, True)
+    tm._on_mouse_click(0, 0, Button.x1, False)
+    tm._on_key_release(Key.shift)
+    assert tm.drain(timeout=5.0)
+    assert fired == [
+        ("key:f6", True), ("key:f6", False),
+        ("key:ctrl+f6", True), ("key:ctrl+f6", False),
+        ("key:shift+mouse:x1", True), ("key:shift+mouse:x1", False),
+    ]
+
+
+def test_release_during_capture_still_releases(tm):
+    delivered = []
+    captured = []
+    tm.set_trigger("key:f6", delivered.append)
+    tm._on_key_press(Key.f6)
+    tm.capture_once(captured.append)
+    tm._on_key_release(Key.f6)
+    tm._on_key_press(Key.f9)
+    assert tm.drain(timeout=5.0)
+    assert delivered == [True, False]
+    assert captured == ["key:f9"]
+
+
+def test_install_is_a_swap(tm):
+    tables = [tm.prepare({f"key:ctrl+alt+{i}": (lambda pressed: None) for i in range(n, n + 200)}) for n in (0, 200)]
+    assert tables[0].chords and tables[0].kinds == {"key"}
+    costs = []
+    for _ in range(50):
+        for table in tables:
+            t0 = time.perf_counter()
+            tm.install(table)
+            costs.append(time.perf_counter() - t0)
+            assert tm._callbacks is table
+    costs.sort()
+    assert costs[len(costs) // 2] < 50e-6
+
+
+def test_dropped_tables_give_back_slots_and_bits(tm):
+    for n in range(50):
+        tm.install(tm.prepare({f"key:{chr(97 + n % 26)}+mouse:x{1 + n % 2}": (lambda pressed: None)}))
+    tm.install(tm.prepare({}))
+    tm.prepare({})  # reclaims what the last swap dropped
+    assert len(tm._slots) == 0
+    assert set(tm._bits) == tm._permanent_atoms
+    assert len(tm._free_slots) <= 2
+    bits = len(tm._bits) + len(tm._free_bits)
+    for n in range(50):
+        tm.install(tm.prepare({f"key:{chr(97 + n % 26)}+mouse:x1": (lambda pressed: None)}))
+    assert len(tm._bits) + len(tm._free_bits) == bits
+
+
+def test_reused_bit_starts_released(tm):
+    delivered = []
+    tm.set_trigger("key:q", lambda pressed: None)
+    tm._on_key_press(keyboard.KeyCode.from_char("q"))  # held when its table goes
+    tm.install(tm.prepare({}))
+    tm.install(tm.prepare({"key:w": delivered.append}))
+    tm._on_key_press(keyboard.KeyCode.from_char("w"))
+    assert tm.drain(timeout=5.0)
+    assert delivered == [True]
+
+
+def test_reused_bit_is_cleared_by_the_hooks(tm):
+    delivered = []
+    tm.set_trigger("key:q", lambda pressed: None)
+    tm._on_key_press(keyboard.KeyCode.from_char("q"))  # held when its table goes
+    tm.install(tm.prepare({}))
+    held = tm._key_held
+    tm.install(tm.prepare({"key:w+mouse:x1": delivered.append}))
+    assert tm._key_held == held  # compiling never writes hook state
+    # Whichever atom got q's bit, the mouse hook must not see it held
+    tm._on_mouse_click(0, 0, Button.x1, True)
+    assert tm.drain(timeout=5.0)
+    assert delivered == []
+    tm._on_key_press(keyboard.KeyCode.from_char("w"))
+    assert tm.drain(timeout=5.0)
+    assert delivered == [True]
+
+
+def test_pressed_state_grows_in_place(tm):
+    pressed = tm._pressed
+    tm.install(tm.prepare({f"key:ctrl+{i}": (lambda p: None) for i in range(3 * len(pressed))}))
+    assert tm._pressed is pressed and len(pressed) >= 3 * 32
+
+
+def test_control_characters_name_their_key():
+    assert normalize_key(keyboard.KeyCode(vk=0x41, char="\x01")) == "a"  # Windows, ctrl+a
+    assert normalize_key(keyboard.KeyCode(vk=0x61, char="\x01")) == "a"  # X11
+    assert normalize_key(keyboard.KeyCode(char="\x13")) == "s"
+    assert normalize_key(keyboard.KeyCode(char="\x1b")) is None
+    assert normalize_key(keyboard.KeyCode(char="Q")) == "q"